@@ -0,0 +1 @@
+"""Benchmarks of the ecole_directe parsing and fetching paths."""
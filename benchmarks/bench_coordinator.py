@@ -0,0 +1,164 @@
+"""
+End-to-end load benchmark of the coordinator against a fake Ecole Directe.
+
+Starts benchmarks.fake_server on a local port, sets up a Home Assistant
+instance with a real config entry, API client and coordinator pointed at it,
+then runs update cycles and reports their latency, the requests sent to each
+endpoint and the peak memory allocated.
+
+By default every module is due on every cycle; with --cadence the module
+refresh intervals of the integration apply, so only the first cycle fetches
+everything.
+
+Usage:
+    python -m benchmarks.bench_coordinator [--children 3] [--cycles 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import timedelta
+from pathlib import Path
+from types import MappingProxyType
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from benchmarks.fake_server import FakeEcoleDirecte
+from custom_components.ecole_directe.api import (
+    EDApiClient,
+    async_acquire_connector,
+    async_release_connector,
+)
+from custom_components.ecole_directe.const import (
+    DEFAULT_MODULE_REFRESH_INTERVALS,
+    DOMAIN,
+    LOGGER,
+)
+from custom_components.ecole_directe.coordinator import EDDataUpdateCoordinator
+from custom_components.ecole_directe.data import EDData
+
+
+def _config_entry(options: dict) -> ConfigEntry:
+    """Return a config entry of the fake family."""
+    return ConfigEntry(
+        data={
+            CONF_USERNAME: "famille",
+            CONF_PASSWORD: "secret",
+            "qcm_filename": "ecole_directe_qcm.json",
+        },
+        discovery_keys=MappingProxyType({}),
+        domain=DOMAIN,
+        minor_version=1,
+        options=options,
+        source="user",
+        subentries_data=None,
+        title="Benchmark",
+        unique_id="benchmark",
+        version=1,
+    )
+
+
+async def _run(args: argparse.Namespace, config_dir: str) -> None:
+    """Run the update cycles and print the report."""
+    server = FakeEcoleDirecte(
+        children=args.children,
+        accounts=args.accounts,
+        notes=args.notes,
+        homework_days=args.homework_days,
+        classes=args.classes,
+        latency=args.latency,
+        error_rate=args.error_rate,
+    )
+    endpoint = await server.async_start()
+
+    hass = HomeAssistant(config_dir)
+    options = {"parallel_accounts": args.parallel_accounts}
+    if not args.cadence:
+        options |= {
+            f"refresh_interval_{module}": 0
+            for module in DEFAULT_MODULE_REFRESH_INTERVALS
+        }
+    entry = _config_entry(options)
+
+    client = EDApiClient(
+        user=entry.data[CONF_USERNAME],
+        pwd=entry.data[CONF_PASSWORD],
+        qcm_path=f"{config_dir}/{entry.data['qcm_filename']}",
+        hass=hass,
+        server_endpoint=endpoint,
+        connector=async_acquire_connector(hass),
+    )
+    coordinator = EDDataUpdateCoordinator(
+        hass=hass,
+        logger=LOGGER,
+        name=DOMAIN,
+        entry=entry,
+        update_interval=timedelta(hours=1),
+    )
+    entry.runtime_data = EDData(
+        client=client, coordinator=coordinator, integration=None
+    )
+
+    durations = []
+    tracemalloc.start()
+    try:
+        for _ in range(args.cycles):
+            start = time.perf_counter()
+            coordinator.data = await coordinator._async_update_data()  # noqa: SLF001
+            durations.append(time.perf_counter() - start)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        await client.close()
+        await async_release_connector(hass)
+        await server.async_stop()
+        await hass.async_stop(force=True)
+
+    print(  # noqa: T201
+        f"{args.children} children, {args.cycles} cycles, "
+        f"latency {args.latency * 1000:.0f} ms"
+    )
+    for cycle, duration in enumerate(durations, 1):
+        print(f"cycle {cycle}: {duration * 1000:.1f} ms")  # noqa: T201
+    if len(durations) > 1:
+        print(  # noqa: T201
+            f"median of the later cycles: "
+            f"{statistics.median(durations[1:]) * 1000:.1f} ms"
+        )
+    print(f"peak memory: {peak / 1024:.0f} KiB")  # noqa: T201
+    print(  # noqa: T201
+        f"requests: {server.requests.total()}, connections: {len(server.connections)}"
+    )
+    for route, count in server.requests.most_common():
+        errors = server.errors[route]
+        print(f"  {count:>5} {route}" + (f" ({errors} errors)" if errors else ""))  # noqa: T201
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--children", type=int, default=3)
+    parser.add_argument("--accounts", type=int, default=1)
+    parser.add_argument("--notes", type=int, default=300)
+    parser.add_argument("--homework-days", type=int, default=10)
+    parser.add_argument("--classes", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--cycles", type=int, default=5)
+    parser.add_argument("--cadence", action="store_true")
+    parser.add_argument("--parallel-accounts", action="store_true")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as config_dir:
+        Path(config_dir, "ecole_directe_qcm.json").write_text("{}", encoding="utf-8")
+        asyncio.run(_run(args, config_dir))
+
+
+if __name__ == "__main__":
+    main()
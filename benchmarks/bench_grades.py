@@ -0,0 +1,120 @@
+"""
+Benchmark of the grades parser on a synthetic school year.
+
+Builds a grades payload of 1,000 notes spread over three trimesters, with an
+LSUN block and competences on a third of the notes, then times the parsing
+for a few numbers of displayed grades, every note being already known by the
+grade history.
+
+Usage:
+    python -m benchmarks.bench_grades [--notes 1000] [--repeat 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import timeit
+from datetime import UTC, date, datetime, timedelta
+from typing import Any
+
+from custom_components.ecole_directe.api.client import parse_grades_evaluations
+from custom_components.ecole_directe.api.lsun import EDLsunIndex
+
+MATIERES = [f"MAT{index:02d}" for index in range(14)]
+PERIODES = [
+    ("A001", date(2025, 9, 1), date(2025, 11, 30)),
+    ("A002", date(2025, 12, 1), date(2026, 3, 8)),
+    ("A003", date(2026, 3, 9), date(2026, 7, 4)),
+]
+
+
+def synthetic_year(notes: int, seed: int = 0) -> dict[str, Any]:
+    """Return a grades payload with the given number of notes."""
+    rng = random.Random(seed)  # noqa: S311
+    start = datetime(2025, 9, 2, 8, tzinfo=UTC)
+    year_seconds = int((datetime(2026, 7, 4, tzinfo=UTC) - start).total_seconds())
+    notes_json = []
+    for index in range(notes):
+        saisie = start + timedelta(seconds=rng.randrange(year_seconds))
+        code_periode = next(code for code, _, fin in PERIODES if saisie.date() <= fin)
+        elements = [
+            {
+                "libelleCompetence": f"Compétence {element}",
+                "descriptif": f"Descriptif {element}",
+                "valeur": str(rng.randint(1, 4)),
+            }
+            for element in range(rng.randint(1, 4))
+        ]
+        notes_json.append(
+            {
+                "id": index,
+                "devoir": f"Devoir {index}",
+                "codePeriode": code_periode,
+                "codeMatiere": rng.choice(MATIERES),
+                "codeSousMatiere": rng.choice(["", "", "ORAL"]),
+                "libelleMatiere": "Matière",
+                "date": saisie.date().isoformat(),
+                "dateSaisie": saisie.strftime("%Y-%m-%d %H:%M:%S"),
+                "valeur": str(rng.randint(0, 20)),
+                "noteSur": rng.choice(["20", "20", "10", "0"]),
+                "coef": "1",
+                "moyenneClasse": "12.5",
+                "minClasse": "3",
+                "maxClasse": "19",
+                "nonSignificatif": False,
+                "elementsProgramme": elements if index % 3 == 0 else [],
+            }
+        )
+    return {
+        "periodes": [
+            {
+                "idPeriode": code,
+                "annuel": False,
+                "dateDebut": debut.isoformat(),
+                "dateFin": fin.isoformat(),
+                "ensembleMatieres": {"moyenneGenerale": "13,2", "disciplines": []},
+            }
+            for code, debut, fin in PERIODES
+        ],
+        "notes": notes_json,
+        "LSUN": {
+            code: [
+                {"codeMatiere": matiere, "libelleMatiere": f"{matiere} {code}"}
+                for matiere in MATIERES
+            ]
+            for code, _, _ in PERIODES
+        },
+    }
+
+
+def main() -> None:
+    """Time the parser and print the mean duration of a parse."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--notes", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    data = synthetic_year(args.notes)
+    today = date(2026, 2, 10)
+    lsun_index = EDLsunIndex(data["LSUN"])
+    # Steady state: the grade history already holds every note of the payload
+    known = parse_grades_evaluations(data, 0, today, lsun_index=lsun_index)[
+        "empreintes_notes"
+    ]
+    print(f"{args.notes} notes, {args.repeat} parses")  # noqa: T201
+    for grades_display in (5, 15, 50):
+        duration = timeit.timeit(
+            lambda grades_display=grades_display: parse_grades_evaluations(
+                data, grades_display, today, lsun_index=lsun_index, known=known
+            ),
+            number=args.repeat,
+        )
+        print(  # noqa: T201
+            f"notes_affichees={grades_display:>3}: "
+            f"{duration / args.repeat * 1000:.3f} ms/parse"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark of the JSON codec against the standard library path.
+
+Serializes and parses the payloads of a synthetic family (a school year of
+grades, the homeworks of a date, two weeks of lessons, a page of messages),
+a QCM file and the state attributes of the grades sensor, timing each
+operation with the json module as it was used before and with the codec.
+
+Usage:
+    python -m benchmarks.bench_json [--notes 1000] [--repeat 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.helpers.json import json_bytes
+
+from custom_components.ecole_directe.api.client import parse_grades_evaluations
+from custom_components.ecole_directe.api.codec import (
+    json_dumps,
+    json_loads,
+    json_size,
+)
+
+from .bench_grades import synthetic_year
+from .fake_server import FakeEcoleDirecte
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def synthetic_payloads(notes: int) -> dict[str, Any]:
+    """Return realistic payloads, by name."""
+    server = FakeEcoleDirecte(notes=notes)
+    eleve_id = server.eleve_ids()[0]
+    today = date(2026, 2, 10)
+    return {
+        "grades": synthetic_year(notes),
+        "homeworks": server.homeworks_by_date(eleve_id, today.isoformat()),
+        "lessons": server.lessons(
+            today.isoformat(), (today + timedelta(days=13)).isoformat()
+        ),
+        "messages": server.messages_data(),
+    }
+
+
+def synthetic_qcm(questions: int = 40) -> dict[str, Any]:
+    """Return a QCM file of answered questions."""
+    return {
+        f"Quelle est la date de naissance de l'élève n°{index} ?": [
+            f"{day:02d}/0{index % 9 + 1}/2012" for day in range(1, 5)
+        ]
+        for index in range(questions)
+    }
+
+
+def _time(operation: Callable[[], Any], repeat: int) -> float:
+    """Return the mean duration of an operation, in milliseconds."""
+    return timeit.timeit(operation, number=repeat) / repeat * 1000
+
+
+def _report(name: str, stdlib: float, codec: float) -> None:
+    """Print the durations of an operation and the speedup of the codec."""
+    print(  # noqa: T201
+        f"{name:<22} json {stdlib:8.3f} ms  codec {codec:8.3f} ms  "
+        f"x{stdlib / codec:5.1f}"
+    )
+
+
+def main() -> None:
+    """Time every operation with both paths and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--notes", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    payloads = synthetic_payloads(args.notes)
+    print(f"{args.notes} notes, {args.repeat} runs per operation")  # noqa: T201
+    for name, payload in payloads.items():
+        # Fingerprints, fixtures and dumps
+        _report(
+            f"dumps {name}",
+            _time(
+                lambda payload=payload: json.dumps(
+                    [payload, ()],
+                    ensure_ascii=False,
+                    separators=(",", ":"),
+                    default=str,
+                ).encode("utf-8"),
+                args.repeat,
+            ),
+            _time(lambda payload=payload: json_dumps([payload, ()]), args.repeat),
+        )
+        # Replayed fixtures and responses
+        content = json_dumps(payload)
+        text = content.decode("utf-8")
+        _report(
+            f"loads {name}",
+            _time(lambda text=text: json.loads(text), args.repeat),
+            _time(lambda content=content: json_loads(content), args.repeat),
+        )
+
+    qcm = synthetic_qcm()
+    _report(
+        "write qcm",
+        _time(
+            lambda: json.dumps(qcm, indent=4, ensure_ascii=False).encode("utf-8"),
+            args.repeat,
+        ),
+        _time(lambda: json_dumps(qcm, indent=True), args.repeat),
+    )
+
+    grades = parse_grades_evaluations(payloads["grades"], 50, date(2026, 2, 10))
+    attributes = {"notes": [grade.as_attributes() for grade in grades["notes"]]}
+    _report(
+        "attributes size",
+        _time(lambda: len(json_bytes(attributes)), args.repeat),
+        _time(lambda: json_size(attributes), args.repeat),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,538 @@
+"""
+Local stand-in for the Ecole Directe API.
+
+Serves the endpoints used by ``ecoledirecte_api.EDClient`` for a synthetic
+family: login (with the GTK cookie), account switching, cahier de textes
+(summary, per date and homework updates), grades, timetable, vie scolaire,
+messages, wallets and formulaires. Payload sizes, latency and error rate are
+tunable, and every request is counted by endpoint.
+
+Usage:
+    python -m benchmarks.fake_server --children 3 --latency 0.05
+
+Point the client at the printed endpoint with
+``EDApiClient(..., server_endpoint=endpoint)``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import contextlib
+import random
+import secrets
+from collections import Counter
+from datetime import UTC, date, datetime, timedelta
+from typing import Any
+
+from aiohttp import web
+
+from benchmarks.bench_grades import synthetic_year
+
+MODULES = [
+    "CAHIER_DE_TEXTES",
+    "NOTES",
+    "EDT",
+    "VIE_SCOLAIRE",
+    "MESSAGERIE",
+    "EDFORMS",
+]
+MATIERES = ["FRANCAIS", "MATHEMATIQUES", "HISTOIRE-GEOGRAPHIE", "ANGLAIS LV1"]
+LOREM = (
+    "Lire le chapitre et faire les exercices de la page indiquée. "
+    "Apporter le cahier de brouillon et la calculatrice. "
+)
+
+
+def _modules(codes: list[str]) -> list[dict[str, Any]]:
+    """Return the modules of an account or child, all enabled."""
+    return [{"code": code, "enable": True} for code in codes]
+
+
+class FakeEcoleDirecte:
+    """Synthetic Ecole Directe server for a family of N children."""
+
+    def __init__(
+        self,
+        *,
+        children: int = 2,
+        accounts: int = 1,
+        notes: int = 300,
+        homework_days: int = 10,
+        homeworks_per_day: int = 3,
+        homework_size: int = 800,
+        lessons_per_day: int = 7,
+        messages: int = 50,
+        classes: int = 0,
+        latency: float = 0.05,
+        jitter: float = 0.02,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        """
+        Initialize the server state.
+
+        Args:
+            children: The number of children of the family.
+            accounts: The number of linked accounts the children are spread on.
+            notes: The number of notes of each child for the year.
+            homework_days: The number of dates with homeworks, from today.
+            homeworks_per_day: The number of homeworks of each date.
+            homework_size: The approximate size of a homework content, in chars.
+            lessons_per_day: The number of lessons of each school day.
+            messages: The number of received messages of each mailbox.
+            classes: The number of classes of a professor account, played
+                instead of the family when above 0.
+            latency: The mean delay before each response, in seconds.
+            jitter: The maximum random deviation from the latency, in seconds.
+            error_rate: The share of requests answered by an HTTP 503.
+            seed: The seed of the random generator.
+
+        """
+        self.rng = random.Random(seed)  # noqa: S311
+        self.children = children
+        self.accounts = max(1, min(accounts, children))
+        self.notes = notes
+        self.homework_days = homework_days
+        self.homeworks_per_day = homeworks_per_day
+        self.homework_size = homework_size
+        self.lessons_per_day = lessons_per_day
+        self.messages = messages
+        self.classes = classes
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.requests: Counter[str] = Counter()
+        self.errors: Counter[str] = Counter()
+        # Client addresses, one for each connection opened
+        self.connections: set[Any] = set()
+        self.tokens: set[str] = set()
+        self._grades: dict[str, dict[str, Any]] = {}
+        self._effectues: set[int] = set()
+        self._runner: web.AppRunner | None = None
+        self.endpoint = ""
+
+    # Synthetic family
+
+    def eleve_ids(self) -> list[str]:
+        """Return the IDs of the children."""
+        return [str(1000 + index) for index in range(self.children)]
+
+    def _account(self, index: int) -> dict[str, Any]:
+        """Return a family account and the children linked to it."""
+        eleves = [
+            {
+                "id": int(eleve_id),
+                "prenom": f"Enfant{eleve_id}",
+                "nom": "Synthetique",
+                "classe": {"id": 500 + int(eleve_id) % 7, "libelle": "5EME A"},
+                "modules": _modules(MODULES),
+            }
+            for position, eleve_id in enumerate(self.eleve_ids())
+            if position % self.accounts == index
+        ]
+        return {
+            "id": 900 + index,
+            "idLogin": 9000 + index,
+            "identifiant": f"famille{index}",
+            "main": index == 0,
+            "typeCompte": "1",
+            "nomEtablissement": f"Collège {index}",
+            "modules": _modules(["MESSAGERIE", "EDFORMS"]),
+            "profile": {"eleves": eleves},
+        }
+
+    def _professor_account(self) -> dict[str, Any]:
+        """Return a professor account and its classes."""
+        return {
+            "id": 800,
+            "idLogin": 8000,
+            "identifiant": "professeur",
+            "main": True,
+            "typeCompte": "P",
+            "nomEtablissement": "Collège 0",
+            "modules": _modules(["MESSAGERIE"]),
+            "profile": {
+                "classes": [
+                    {
+                        "id": 600 + index,
+                        "code": f"C{index}",
+                        "libelle": f"CLASSE {index}",
+                    }
+                    for index in range(self.classes)
+                ]
+            },
+        }
+
+    def login_data(self) -> dict[str, Any]:
+        """Return the login payload of the family, or of the professor."""
+        if self.classes:
+            return {"accounts": [self._professor_account()]}
+        return {"accounts": [self._account(index) for index in range(self.accounts)]}
+
+    def classe(self, classe_id: str) -> dict[str, Any]:
+        """
+        Return the vie de la classe of a class.
+
+        Its shape is not documented: the integration only keeps the names of
+        its sections, so the payload only has to be of a plausible size.
+        """
+        return {
+            "classe": {"id": int(classe_id)},
+            "contenu": [f"Contenu {index}" for index in range(25 + int(classe_id) % 5)],
+        }
+
+    def homework_dates(self) -> list[str]:
+        """Return the dates with homeworks, school days from today."""
+        dates = []
+        day = datetime.now(UTC).date()
+        while len(dates) < self.homework_days:
+            if day.weekday() < 5:  # noqa: PLR2004
+                dates.append(day.isoformat())
+            day += timedelta(days=1)
+        return dates
+
+    def _devoir_id(self, eleve_id: str, pour_le: str, index: int) -> int:
+        """Return a stable homework ID."""
+        return (
+            int(eleve_id) * 100000
+            + date.fromisoformat(pour_le).toordinal() % 10000 * 10
+            + index
+        )
+
+    def homeworks(self, eleve_id: str) -> dict[str, Any]:
+        """Return the cahier de textes summary of a child."""
+        return {
+            pour_le: [
+                {
+                    "idDevoir": self._devoir_id(eleve_id, pour_le, index),
+                    "matiere": MATIERES[index % len(MATIERES)],
+                    "effectue": self._devoir_id(eleve_id, pour_le, index)
+                    in self._effectues,
+                    "interrogation": False,
+                }
+                for index in range(self.homeworks_per_day)
+            ]
+            for pour_le in self.homework_dates()
+        }
+
+    def homeworks_by_date(self, eleve_id: str, pour_le: str) -> dict[str, Any]:
+        """Return the homework details of a child for a date."""
+        repeat = max(1, self.homework_size // len(LOREM))
+        matieres = []
+        for index in range(self.homeworks_per_day):
+            devoir_id = self._devoir_id(eleve_id, pour_le, index)
+            contenu = f"<p>{LOREM * repeat}</p><ul><li>Exercice {index}</li></ul>"
+            matieres.append(
+                {
+                    "id": devoir_id,
+                    "matiere": MATIERES[index % len(MATIERES)],
+                    "interrogation": False,
+                    "aFaire": {
+                        "contenu": base64.b64encode(contenu.encode()).decode(),
+                        "effectue": devoir_id in self._effectues,
+                    },
+                }
+            )
+        return {"date": pour_le, "matieres": matieres}
+
+    def grades(self, eleve_id: str) -> dict[str, Any]:
+        """Return the grades of a child for the year."""
+        if eleve_id not in self._grades:
+            self._grades[eleve_id] = synthetic_year(self.notes, int(eleve_id))
+        return self._grades[eleve_id]
+
+    def lessons(self, date_debut: str, date_fin: str) -> list[dict[str, Any]]:
+        """Return the lessons between two dates."""
+        lessons = []
+        day = date.fromisoformat(date_debut)
+        while day <= date.fromisoformat(date_fin):
+            if day.weekday() < 5:  # noqa: PLR2004
+                for hour in range(8, 8 + self.lessons_per_day + 1):
+                    if hour == 12:  # noqa: PLR2004
+                        continue
+                    lessons.append(
+                        {
+                            "start_date": f"{day.isoformat()} {hour:02d}:00",
+                            "end_date": f"{day.isoformat()} {hour:02d}:55",
+                            "text": MATIERES[hour % len(MATIERES)],
+                            "salle": f"B{hour}",
+                            "isAnnule": hour == 15 and day.weekday() == 2,  # noqa: PLR2004
+                            "color": "#91b2bc",
+                            "prof": "M. PROF",
+                            "dispense": 0,
+                        }
+                    )
+            day += timedelta(days=1)
+        return lessons
+
+    def vie_scolaire(self) -> dict[str, Any]:
+        """Return the vie scolaire of a child."""
+
+        def element(index: int, type_element: str) -> dict[str, Any]:
+            return {
+                "date": f"2025-{9 + index % 4:02d}-{1 + index % 28:02d}",
+                "typeElement": type_element,
+                "displayDate": f"le {1 + index % 28} du mois",
+                "justifie": index % 2 == 0,
+                "motif": "Maladie",
+                "libelle": type_element,
+                "commentaire": "",
+            }
+
+        return {
+            "absencesRetards": [
+                element(index, "Absence" if index % 3 else "Retard")
+                for index in range(30)
+            ],
+            "sanctionsEncouragements": [
+                element(index, "Punition" if index % 2 else "Encouragement")
+                for index in range(10)
+            ],
+        }
+
+    def messages_data(self, page: int = 0, items_per_page: int = 100) -> dict[str, Any]:
+        """Return a page of a mailbox, the most recent messages first."""
+        newest = self.messages - page * items_per_page
+        return {
+            "messages": {
+                "received": [
+                    {
+                        "id": index,
+                        "subject": f"Message {index}",
+                        "from": {"name": "M. PROF"},
+                        "read": index <= self.messages - 4,
+                        "date": "2025-10-01 08:00:00",
+                    }
+                    for index in range(newest, max(newest - items_per_page, 0), -1)
+                ]
+            },
+            "pagination": {
+                "messagesRecusCount": self.messages,
+                "messagesEnvoyesCount": 0,
+                "messagesArchivesCount": 0,
+                "messagesRecusNotReadCount": min(self.messages, 4),
+                "messagesDraftCount": 0,
+            },
+        }
+
+    def wallets(self) -> dict[str, Any]:
+        """Return the wallet balances of the family and of each child."""
+        comptes = [{"id": 900, "solde": 12.5, "libelle": "Cantine famille"}]
+        comptes.extend(
+            {"id": int(eleve_id), "solde": 4.2, "libelle": "Cantine"}
+            for eleve_id in self.eleve_ids()
+        )
+        return {"comptes": comptes}
+
+    # HTTP layer
+
+    def _app(self) -> web.Application:
+        """Return the application with the Ecole Directe routes."""
+        app = web.Application(middlewares=[self._middleware])
+        app.add_routes(
+            [
+                web.get("/v3/login.awp", self._gtk),
+                web.post("/v3/login.awp", self._login),
+                web.post("/v3/renewtoken.awp", self._renew_token),
+                web.post(
+                    "/v3/Eleves/{eleve_id}/cahierdetexte/{pour_le}.awp",
+                    self._homeworks_by_date,
+                ),
+                web.post("/v3/Eleves/{eleve_id}/cahierdetexte.awp", self._homeworks),
+                web.post("/v3/eleves/{eleve_id}/notes.awp", self._grades_route),
+                web.post("/v3/eleves/{eleve_id}/viescolaire.awp", self._vie_scolaire),
+                web.post("/v3/E/{eleve_id}/emploidutemps.awp", self._lessons),
+                web.post("/v3/eleves/{eleve_id}/messages.awp", self._messages),
+                web.post("/v3/familles/{famille_id}/messages.awp", self._messages),
+                web.post("/v3/comptes/sansdetails.awp", self._wallets),
+                web.post("/v3/edforms.awp", self._formulaires),
+                web.post("/v3/Classes/{classe_id}/viedelaclasse.awp", self._classe),
+                web.post("/v3/R/{classe_id}/viedelaclasse.awp", self._classe),
+            ]
+        )
+        return app
+
+    @web.middleware
+    async def _middleware(
+        self, request: web.Request, handler: Any
+    ) -> web.StreamResponse:
+        """Count the request, wait for the latency and inject errors."""
+        route = request.match_info.route.resource
+        name = route.canonical if route is not None else request.path
+        self.requests[name] += 1
+        self.connections.add(
+            request.transport and request.transport.get_extra_info("peername")
+        )
+        delay = self.latency + self.rng.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.error_rate and self.rng.random() < self.error_rate:
+            self.errors[name] += 1
+            return web.Response(status=503, text="Service Unavailable")
+        if name not in {"/v3/login.awp", "/v3/renewtoken.awp"} and (
+            request.headers.get("x-token") not in self.tokens
+        ):
+            return self._json(None, code=520)
+        return await handler(request)
+
+    def _new_token(self) -> str:
+        """Issue a token accepted by the other endpoints."""
+        token = secrets.token_hex(16)
+        self.tokens.add(token)
+        return token
+
+    @staticmethod
+    def _json(data: Any, code: int = 200, token: str | None = None) -> web.Response:
+        """Return an Ecole Directe JSON envelope."""
+        headers = {"x-token": token} if token is not None else None
+        return web.json_response(
+            {"code": code, "message": "", "data": data}, headers=headers
+        )
+
+    async def _gtk(self, request: web.Request) -> web.Response:  # noqa: ARG002
+        """Set the GTK cookie asked for before login."""
+        response = web.json_response({"code": 200})
+        response.set_cookie("GTK", secrets.token_hex(8))
+        return response
+
+    async def _login(self, request: web.Request) -> web.Response:  # noqa: ARG002
+        """Log the family in, without second factor."""
+        return self._json(self.login_data(), token=self._new_token())
+
+    async def _renew_token(self, request: web.Request) -> web.Response:  # noqa: ARG002
+        """Switch the session to a linked account."""
+        return self._json({}, token=self._new_token())
+
+    async def _homeworks(self, request: web.Request) -> web.Response:
+        """Return the cahier de textes summary, or mark homeworks as done."""
+        eleve_id = request.match_info["eleve_id"]
+        if request.query.get("verbe") == "put":
+            body = await request.text()
+            for devoir_id in _ids_after(body, "idDevoirsEffectues"):
+                self._effectues.add(devoir_id)
+            for devoir_id in _ids_after(body, "idDevoirsNonEffectues"):
+                self._effectues.discard(devoir_id)
+            return self._json({})
+        return self._json(self.homeworks(eleve_id))
+
+    async def _homeworks_by_date(self, request: web.Request) -> web.Response:
+        """Return the homework details of a date."""
+        return self._json(
+            self.homeworks_by_date(
+                request.match_info["eleve_id"], request.match_info["pour_le"]
+            )
+        )
+
+    async def _grades_route(self, request: web.Request) -> web.Response:
+        """Return the grades of the year."""
+        return self._json(self.grades(request.match_info["eleve_id"]))
+
+    async def _vie_scolaire(self, request: web.Request) -> web.Response:  # noqa: ARG002
+        """Return the vie scolaire."""
+        return self._json(self.vie_scolaire())
+
+    async def _lessons(self, request: web.Request) -> web.Response:
+        """Return the lessons of the requested dates."""
+        body = await request.text()
+        dates = [part for part in body.split("'") if _is_date(part)]
+        date_debut, date_fin = (dates + [datetime.now(UTC).date().isoformat()] * 2)[:2]
+        return self._json(self.lessons(date_debut, date_fin))
+
+    async def _messages(self, request: web.Request) -> web.Response:
+        """Return a page of a mailbox."""
+        return self._json(
+            self.messages_data(
+                int(request.query.get("page", "0")),
+                int(request.query.get("itemsPerPage", "100")),
+            )
+        )
+
+    async def _wallets(self, request: web.Request) -> web.Response:  # noqa: ARG002
+        """Return the wallet balances."""
+        return self._json(self.wallets())
+
+    async def _formulaires(self, request: web.Request) -> web.Response:  # noqa: ARG002
+        """Return the forms of the family."""
+        return self._json(
+            [
+                {"titre": f"Formulaire {index}", "created": "2025-09-01 08:00:00"}
+                for index in range(5)
+            ]
+        )
+
+    async def _classe(self, request: web.Request) -> web.Response:
+        """Return the vie de la classe of a class."""
+        return self._json(self.classe(request.match_info["classe_id"]))
+
+    async def async_start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the API root to give to the client."""
+        self._runner = web.AppRunner(self._app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        sockets = site._server.sockets  # noqa: SLF001
+        self.endpoint = f"http://{host}:{sockets[0].getsockname()[1]}/v3"
+        return self.endpoint
+
+    async def async_stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+def _is_date(value: str) -> bool:
+    """Return True if value is an ISO date."""
+    try:
+        date.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _ids_after(body: str, name: str) -> list[int]:
+    """Return the IDs of the JSON list following name in a request body."""
+    start = body.find(name)
+    if start < 0:
+        return []
+    values = body[body.find("[", start) + 1 : body.find("]", start)]
+    return [int(value) for value in values.split(",") if value.strip()]
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    """Serve until interrupted."""
+    server = FakeEcoleDirecte(
+        children=args.children,
+        accounts=args.accounts,
+        notes=args.notes,
+        classes=args.classes,
+        latency=args.latency,
+        error_rate=args.error_rate,
+    )
+    endpoint = await server.async_start(port=args.port)
+    print(f"Fake Ecole Directe listening on {endpoint}")  # noqa: T201
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.async_stop()
+
+
+def main() -> None:
+    """Run the fake server from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--children", type=int, default=2)
+    parser.add_argument("--accounts", type=int, default=1)
+    parser.add_argument("--notes", type=int, default=300)
+    parser.add_argument("--classes", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_serve(args))
+
+
+if __name__ == "__main__":
+    main()
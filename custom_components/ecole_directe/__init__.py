@@ -25,15 +25,26 @@
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.loader import async_get_loaded_integration
 
-from .api import EDApiClient
+from .api import (
+    EDApiClient,
+    EDDumpWriter,
+    async_acquire_connector,
+    async_create_transport,
+    async_release_connector,
+)
 from .const import (
+    DEFAULT_ENABLE_DEBUGGING,
     DEFAULT_REFRESH_INTERVAL,
     DOMAIN,
+    INTEGRATION_PATH,
     INTEGRATION_VERSION,
     LOGGER,
     PLATFORMS,
+    TRANSPORT_MODE,
+    TRANSPORT_REPLAY_LATENCY,
 )
 from .coordinator import EDDataUpdateCoordinator
+from .coordinator.grade_history import EDGradeHistory
 from .data import EDConfigEntry, EDData
 from .frontend import JSModuleRegistration
 from .service_actions import async_setup_services
@@ -150,6 +161,21 @@ async def async_setup_entry(
     """
     LOGGER.debug("async_setup_entry")
     hass.data.setdefault(DOMAIN, {})
+    # Responses are only dumped to the logs folder when debugging is enabled
+    dump_writer = None
+    if entry.options.get("enable_debugging", DEFAULT_ENABLE_DEBUGGING):
+        dump_writer = EDDumpWriter(
+            hass, hass.config.config_dir + INTEGRATION_PATH + "logs/"
+        )
+        await dump_writer.async_start()
+
+    transport = await async_create_transport(
+        hass,
+        TRANSPORT_MODE,
+        hass.config.config_dir + INTEGRATION_PATH + "test/",
+        TRANSPORT_REPLAY_LATENCY,
+    )
+
     # Initialize client first
     client = EDApiClient(
         user=entry.data[CONF_USERNAME],  # From config flow setup
@@ -158,6 +184,9 @@ async def async_setup_entry(
         + "/"
         + entry.data["qcm_filename"],  # From config flow setup
         hass=hass,
+        dump_writer=dump_writer,
+        transport=transport,
+        connector=async_acquire_connector(hass),
     )
 
     # Initialize coordinator with config_entry
@@ -179,9 +208,14 @@ async def async_setup_entry(
     )
 
     # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
-    await coordinator.async_config_entry_first_refresh()
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        await _async_close_client(client)
+        raise
 
     if not coordinator.last_update_success:
+        await _async_close_client(client)
         raise ConfigEntryNotReady
 
     hass.data[DOMAIN][entry.entry_id] = {
@@ -206,6 +240,9 @@ async def async_unload_entry(
     - All platform entities
     - Registered services
     - Update listeners
+    - The Ecole Directe session kept open by the API client
+    - The shared HTTP connector, once no other entry uses it
+    - The background writer of the debug dumps
 
     Args:
         hass: The Home Assistant instance.
@@ -220,10 +257,38 @@ async def async_unload_entry(
     """
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
+        await _async_close_client(entry.runtime_data.client)
 
     return unload_ok
 
 
+async def async_remove_entry(
+    hass: HomeAssistant,
+    entry: EDConfigEntry,
+) -> None:
+    """
+    Remove a config entry.
+
+    This is called once the integration is deleted, after it was unloaded.
+    The grade history kept for its children is deleted with it.
+
+    Args:
+        hass: The Home Assistant instance.
+        entry: The config entry being removed.
+
+    """
+    await EDGradeHistory(hass, entry.entry_id).async_remove()
+
+
+async def _async_close_client(client: EDApiClient) -> None:
+    """Close the Ecole Directe session and flush the debug dumps."""
+    await client.close()
+    await async_release_connector(client.hass)
+    await client.transport.async_close()
+    if client.dump_writer is not None:
+        await client.dump_writer.async_stop()
+
+
 async def async_reload_entry(
     hass: HomeAssistant,
     entry: EDConfigEntry,
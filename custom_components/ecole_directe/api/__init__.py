@@ -8,12 +8,52 @@
     EDEleve,
     check_ecoledirecte_session,
 )
+from .dump import EDDumpWriter
+from .limiter import EDConcurrencyLimiter
+from .records import (
+    EDClasse,
+    EDEvaluation,
+    EDGrade,
+    EDHomework,
+    EDLesson,
+    EDRecord,
+    EDVieScolaireElement,
+)
+from .session import (
+    EDConnectorPool,
+    EDSessionClient,
+    async_acquire_connector,
+    async_release_connector,
+)
+from .transport import (
+    EDRecordTransport,
+    EDReplayTransport,
+    EDTransport,
+    async_create_transport,
+)
 
 __all__ = [
     "EDApiClient",
     "EDApiClientAuthenticationError",
     "EDApiClientCommunicationError",
     "EDApiClientError",
+    "EDClasse",
+    "EDConcurrencyLimiter",
+    "EDConnectorPool",
+    "EDDumpWriter",
     "EDEleve",
+    "EDEvaluation",
+    "EDGrade",
+    "EDHomework",
+    "EDLesson",
+    "EDRecord",
+    "EDRecordTransport",
+    "EDReplayTransport",
+    "EDSessionClient",
+    "EDTransport",
+    "EDVieScolaireElement",
+    "async_acquire_connector",
+    "async_create_transport",
+    "async_release_connector",
     "check_ecoledirecte_session",
 ]
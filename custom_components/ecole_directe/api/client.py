@@ -10,37 +10,53 @@
 
 from __future__ import annotations
 
-import base64
-import json
+import asyncio
+import contextlib
+import functools
+import heapq
 import operator
-import re
-from datetime import datetime, time
-from pathlib import Path
+from datetime import UTC, date, datetime, time
 from typing import TYPE_CHECKING, Any, Self
 
-import anyio
-from ecoledirecte_api.client import EDClient, QCMException
+from ecoledirecte_api.client import QCMException
 from ecoledirecte_api.const import ED_OK
 
 from custom_components.ecole_directe.helpers import get_unique_id
 
 from ..const import (
     EVENT_TYPE,
-    FAKE_ON,
     GRADES_TO_DISPLAY,
-    HOMEWORK_DESC_MAX_LENGTH,
-    INTEGRATION_PATH,
+    HOMEWORKS_MAX_CONCURRENT_DATES,
     LOGGER,
+    MESSAGES_COUNTS_PAGE_SIZE,
+    MESSAGES_MAX_PAGES,
     VIE_SCOLAIRE_TO_DISPLAY,
 )
+from .fingerprint import EDPayloadCache, item_fingerprint
+from .homeworks import HOMEWORK_CONTENT_CACHE, EDHomeworkSync
+from .limiter import EDConcurrencyLimiter
+from .lsun import EDLsunIndex
+from .messagerie import EDMailboxMirrors, EDMessagerieSync, mailbox_counts
+from .qcm import get_qcm_store
+from .records import (
+    EDClasse,
+    EDEvaluation,
+    EDGrade,
+    EDHomework,
+    EDLesson,
+    EDVieScolaireElement,
+)
+from .session import SENT_TOKEN, EDSessionClient
+from .transport import EDTransport
 
 if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Coroutine, Mapping
     from types import TracebackType
 
+    from aiohttp import BaseConnector
     from homeassistant.core import HomeAssistant
 
-# as per recommendation from @freylis, compile once only
-CLEANR = re.compile("<.*?>")
+    from .dump import EDDumpWriter
 
 
 class EDApiClientError(Exception):
@@ -111,7 +127,13 @@ def get_fullname(self) -> str:
 
 
 class EDApiClient:
-    """Ecole Directe client with Token and cookie."""
+    """
+    Ecole Directe client with Token and cookie.
+
+    The client is owned by the config entry and outlives refresh cycles: the
+    token and cookie jar obtained at login are reused until Ecole Directe
+    rejects them, at which point the session logs in again.
+    """
 
     def __init__(
         self,
@@ -119,15 +141,36 @@ def __init__(
         pwd: str,
         qcm_path: str,
         hass: HomeAssistant,
+        *,
+        dump_writer: EDDumpWriter | None = None,
+        transport: EDTransport | None = None,
+        server_endpoint: str | None = None,
+        connector: BaseConnector | None = None,
+        limiter: EDConcurrencyLimiter | None = None,
     ) -> None:
         """Save some information needed to login the client."""
         self.hass = hass
         self.username = user
         self.password = pwd
         self.qcm_path = qcm_path
-        self.log_folder = self.hass.config.config_dir + INTEGRATION_PATH + "logs/"
-        self.test_folder = self.hass.config.config_dir + INTEGRATION_PATH + "test/"
-        Path(self.log_folder).mkdir(parents=True, exist_ok=True)
+        self.qcm_store = get_qcm_store(qcm_path)
+        self.dump_writer = dump_writer
+        self.transport = transport if transport is not None else EDTransport()
+        # Another Ecole Directe API root, such as a local fake server
+        self.server_endpoint = server_endpoint
+        # Connection pool shared with the other sessions
+        self.connector = connector
+        # Shared with the sessions of the linked accounts
+        self.limiter = limiter if limiter is not None else EDConcurrencyLimiter()
+        self.data: Any = None
+        self.ed_client: EDSessionClient | None = None
+        self.homework_sync = EDHomeworkSync()
+        self.messagerie_sync = EDMessagerieSync()
+        self.mailbox_mirrors = EDMailboxMirrors()
+        self._in_flight: dict[str, asyncio.Task[Any]] = {}
+        self.payload_cache = EDPayloadCache()
+        self._account_clients: dict[int, EDApiClient] = {}
+        self._login_lock = asyncio.Lock()
 
     async def __aenter__(self) -> Self:
         """Enter the client context."""
@@ -144,12 +187,90 @@ async def __aexit__(
 
     async def close(self) -> None:
         """Close the client."""
+        for account_client in self._account_clients.values():
+            await account_client.close()
+        self._account_clients.clear()
         if self.ed_client is not None:
             await self.ed_client.close()
+            self.ed_client = None
+
+    @property
+    def is_logged_in(self) -> bool:
+        """Return True if the session holds a token from a previous login."""
+        if self.transport.offline:
+            return self.data is not None
+        return self.ed_client is not None and self.ed_client.token is not None
+
+    @property
+    def _session_client(self) -> EDSessionClient:
+        """Return the session of the client, which must have logged in."""
+        if self.ed_client is None:
+            msg = "Not logged in to Ecole Directe"
+            raise EDApiClientError(msg)
+        return self.ed_client
+
+    async def async_ensure_logged_in(self) -> None:
+        """Login only if the session has no token yet."""
+        async with self._login_lock:
+            if not self.is_logged_in:
+                await self.login()
+
+    async def _async_relogin(self) -> None:
+        """
+        Renew the token once Ecole Directe has rejected it.
+
+        Called from the backoff handlers of the library, so nothing awaited
+        under the lock may call them again: the session is switched back to
+        its account without retry.
+        """
+        if self.ed_client is None:
+            return
+        # The token of the failed request, not the one of the session now
+        rejected_token = SENT_TOKEN.get() or self.ed_client.token
+        async with self._login_lock:
+            if self.ed_client is None:
+                return
+            if self.ed_client.token == rejected_token:
+                LOGGER.debug("Token rejected by Ecole Directe, logging in again")
+                self.ed_client.qcm_json = await self.qcm_store.async_get_answers(
+                    self.hass
+                )
+                await self._async_login_session(self.ed_client)
+                target_id_login = self.current_account_id_login
+                self.current_account_id_login = self.id_login
+                if target_id_login != self.id_login:
+                    await self.ed_client.renew_token(target_id_login)
+                    self.current_account_id_login = target_id_login
+            # Else another request already renewed the token
+            SENT_TOKEN.set(self.ed_client.token)
+
+    def _dump(self, name: str, json_resp: Any) -> None:
+        """Hand a response over to the debug dump writer, if debugging is on."""
+        if self.dump_writer is not None:
+            self.dump_writer.dump(name, json_resp)
+
+    async def _request(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Send a request through the transport and dump its response."""
+
+        async def send() -> Any:
+            # Read once the request holds its slot, just before it is sent
+            SENT_TOKEN.set(None if self.ed_client is None else self.ed_client.token)
+            return await fetch()
+
+        json_resp = await self.transport.call(
+            key, functools.partial(self.limiter.run, send)
+        )
+        self._dump(key, json_resp)
+        return json_resp
 
     async def save_question(self, qcm_json: Any) -> None:
-        """Save questions to file."""
-        await save_json_file(qcm_json, self.qcm_path)
+        """Keep new questions, written to the QCM file once the login ends."""
+        self.qcm_store.add_questions(qcm_json)
+
+    async def _async_save_questions(self) -> None:
+        """Write the questions seen during the login to the QCM file."""
+        if not await self.qcm_store.async_flush(self.hass):
+            return
         event_data = {
             "child_name": None,
             "type": "new_qcm",
@@ -159,34 +280,20 @@ async def save_question(self, qcm_json: Any) -> None:
 
     async def login(self) -> Any:
         """Login to Ecole Directe."""
-        LOGGER.debug("loading QCM file")
-        self.qcm = await load_json_file(self.qcm_path)
-        self.ed_client: EDClient = EDClient(
-            username=self.username,
-            password=self.password,
-            qcm_json=self.qcm,
-        )
-        self.ed_client.on_new_question(self.save_question)
-        login = await self.ed_client.login()
+        login = await self.transport.call("login", self._async_session_login)
         LOGGER.debug(login)
         LOGGER.info(
             "Connection OK - identifiant: [%s]",
             login["data"]["accounts"][0]["identifiant"],
         )
-        LOGGER.debug(
-            "token: [%s] - cookies: [%s]",
-            self.ed_client.token,
-            self.ed_client.cookie_jar,
-        )
+        if self.ed_client is not None:
+            LOGGER.debug(
+                "token: [%s] - cookies: [%s]",
+                self.ed_client.token,
+                self.ed_client.cookie_jar,
+            )
 
         self.data = login["data"]
-        if FAKE_ON:
-            self.data["accounts"][0]["profile"]["eleves"][0]["id"] = "2232"
-            self.data["accounts"][0]["profile"]["eleves"][0]["prenom"] = "Benjamin"
-            self.data["accounts"][0]["profile"]["eleves"][0]["nom"] = "No Name"
-            self.data["accounts"][0]["profile"]["eleves"][1]["id"] = "2233"
-            self.data["accounts"][0]["profile"]["eleves"][1]["prenom"] = "Arthur"
-            self.data["accounts"][0]["profile"]["eleves"][1]["nom"] = "No Name"
 
         main_account = next(
             (a for a in self.data["accounts"] if a.get("main", False)),
@@ -229,134 +336,289 @@ async def login(self) -> Any:
                         )
                     )
 
+    async def _async_session_login(self) -> Any:
+        """Open a new Ecole Directe session and login."""
+        self.qcm = await self.qcm_store.async_get_answers(self.hass)
+        if self.ed_client is not None:
+            await self.ed_client.close()
+        self.ed_client = EDSessionClient(
+            username=self.username,
+            password=self.password,
+            qcm_json=self.qcm,
+            on_token_rejected=self._async_relogin,
+            connector=self.connector,
+            **(
+                {"server_endpoint": self.server_endpoint}
+                if self.server_endpoint is not None
+                else {}
+            ),
+        )
+        self.ed_client.on_new_question(self.save_question)
+        return await self._async_login_session(self.ed_client)
+
+    async def _async_login_session(self, session: EDSessionClient) -> Any:
+        """Login a session, then write the questions met to the QCM file."""
+        try:
+            return await session.login()
+        finally:
+            await self._async_save_questions()
+
     async def switch_account(self, target_id_login: int) -> None:
         """Switch the API session context to a different account."""
         if target_id_login == self.current_account_id_login:
             return
-        await self.ed_client.switch_account(target_id_login)
+        if not self.transport.offline:
+            await self._session_client.switch_account(target_id_login)
         self.current_account_id_login = target_id_login
 
+    async def async_get_account_client(self, id_login: int) -> EDApiClient:
+        """
+        Return a session dedicated to an account.
+
+        The main account uses this session. Every other linked account gets its
+        own session, logged in on first use and kept switched to that account,
+        so that linked accounts can be fetched in parallel.
+        """
+        if id_login == self.id_login:
+            await self.switch_account(id_login)
+            return self
+        account_client = self._account_clients.get(id_login)
+        if account_client is None:
+            account_client = EDApiClient(
+                self.username,
+                self.password,
+                self.qcm_path,
+                self.hass,
+                dump_writer=self.dump_writer,
+                transport=self.transport,
+                server_endpoint=self.server_endpoint,
+                connector=self.connector,
+                limiter=self.limiter,
+            )
+            self._account_clients[id_login] = account_client
+        await account_client.async_ensure_logged_in()
+        await account_client.switch_account(id_login)
+        return account_client
+
     async def get_messages(
         self,
         family_id: str | None,
         eleve: EDEleve | None,
         annee_scolaire: str,
     ) -> Any | None:
-        """Get messages from Ecole Directe."""
-        if FAKE_ON:
-            if eleve is None:
-                json_resp = await load_json_file(
-                    self.test_folder + "get_messages_famille.json"
-                )
-            else:
-                json_resp = await load_json_file(
-                    self.test_folder + f"{eleve.eleve_id}_get_messages_eleve.json"
-                )
-
-        elif eleve is None:
-            json_resp = await self.ed_client.get_messages(
-                family_id, None, annee_scolaire
-            )
-            await save_json_file(
-                json_resp, self.log_folder + "get_messages_famille.json"
-            )
+        """
+        Get the messagerie counters, and the messages received since last time.
+
+        Only the first pages of received messages are read, down to the last
+        message seen in the previous cycle. The new messages are returned under
+        new_messages, none on the first sync of a mailbox.
+        """
+        if eleve is None:
+            mailbox, key, eleve_id = "famille", "get_messages_famille", None
         else:
-            json_resp = await self.ed_client.get_messages(
-                None, eleve.eleve_id, annee_scolaire
+            mailbox = eleve.eleve_id
+            key = f"{eleve.eleve_id}_get_messages_eleve"
+            eleve_id = eleve.eleve_id
+        items_per_page = self.messagerie_sync.page_size(mailbox)
+
+        pagination: dict[str, Any] = {}
+        received: list[dict[str, Any]] = []
+        for page in range(MESSAGES_MAX_PAGES):
+            json_resp = await self._request(
+                key if page == 0 else f"{key}_{page}",
+                lambda page=page: self._session_client.get_received_messages(
+                    family_id, eleve_id, annee_scolaire, page, items_per_page
+                ),
             )
-            await save_json_file(
-                json_resp, self.log_folder + f"{eleve.eleve_id}_get_messages_eleve.json"
+            if "data" not in json_resp:
+                LOGGER.warning("get_messages: [%s]", json_resp)
+                return None
+            data = json_resp["data"]
+            if page == 0:
+                pagination = data["pagination"]
+            messages = data.get("messages", {}).get("received", [])
+            received.extend(messages)
+            if not self.messagerie_sync.needs_next_page(mailbox, messages):
+                break
+
+        return {
+            **pagination,
+            "new_messages": self.messagerie_sync.update(mailbox, received),
+        }
+
+    async def get_message_counts(
+        self,
+        family_id: str | None,
+        eleve: EDEleve | None,
+        annee_scolaire: str,
+    ) -> dict[str, Any] | None:
+        """
+        Get only the messagerie counters, from the smallest page of a mailbox.
+
+        A child mailbox found identical to the family mailbox is skipped while
+        the family one does not change, the family counters being returned.
+        """
+        family_key = "get_messages_famille"
+        if eleve is None:
+            result = await self._single_flight(
+                family_key,
+                lambda: self._fetch_mailbox_counts(
+                    family_key, family_id, None, annee_scolaire
+                ),
             )
+            if result is None:
+                return None
+            self.mailbox_mirrors.set_family(*result)
+            return dict(result[1])
+
+        family = self._in_flight.get(family_key)
+        if family is not None:
+            # Compare with the family mailbox of this cycle
+            with contextlib.suppress(Exception):
+                await asyncio.shield(family)
+        counts = self.mailbox_mirrors.mirrored(eleve.eleve_id)
+        if counts is not None:
+            return dict(counts)
+
+        key = f"{eleve.eleve_id}_get_messages_eleve"
+        result = await self._single_flight(
+            key,
+            lambda: self._fetch_mailbox_counts(
+                key, None, eleve.eleve_id, annee_scolaire
+            ),
+        )
+        if result is None:
+            return None
+        self.mailbox_mirrors.set_child(eleve.eleve_id, result[0])
+        return dict(result[1])
 
+    async def _fetch_mailbox_counts(
+        self,
+        key: str,
+        family_id: str | None,
+        eleve_id: str | None,
+        annee_scolaire: str,
+    ) -> tuple[str, dict[str, Any]] | None:
+        """Get the fingerprint and counters of a mailbox."""
+        json_resp = await self._request(
+            key,
+            lambda: self._session_client.get_received_messages(
+                family_id, eleve_id, annee_scolaire, 0, MESSAGES_COUNTS_PAGE_SIZE
+            ),
+        )
         if "data" not in json_resp:
-            LOGGER.warning("get_messages: [%s]", json_resp)
+            LOGGER.warning("get_message_counts: [%s]", json_resp)
             return None
-
-        return json_resp["data"]["pagination"]
+        return mailbox_counts(json_resp["data"])
+
+    async def _single_flight[T](
+        self, key: str, fetch: Callable[[], Coroutine[Any, Any, T]]
+    ) -> T:
+        """Share the request in flight for a key instead of sending it twice."""
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(fetch())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        # A cancelled caller leaves the request to the other ones
+        return await asyncio.shield(task)
 
     async def get_homeworks_by_date(self, eleve: EDEleve, date: str) -> dict:
         """Get homeworks by date."""
-        if FAKE_ON:
-            json_resp = await load_json_file(
-                self.test_folder
-                + f"{eleve.eleve_id}_get_homeworks_by_date_"
-                + date
-                + ".json"
-            )
-            return json_resp["data"]
-
-        json_resp = await self.ed_client.get_homeworks_by_date(
-            eleve.eleve_id,
-            date,
-        )
-        await save_json_file(
-            json_resp,
-            self.log_folder + f"{eleve.eleve_id}_get_homeworks_by_date_{date}.json",
+        json_resp = await self._request(
+            f"{eleve.eleve_id}_get_homeworks_by_date_{date}",
+            lambda: self._session_client.get_homeworks_by_date(eleve.eleve_id, date),
         )
         if "data" in json_resp:
             return json_resp["data"]
         LOGGER.warning("get_homeworks_by_date: [%s]", json_resp)
         return {}
 
-    async def get_homeworks(self, eleve: EDEleve, decode_html: bool) -> list[Any]:
+    async def get_homeworks(
+        self, eleve: EDEleve, decode_html: bool
+    ) -> list[EDHomework]:
         """Get homeworks."""
-        if FAKE_ON:
-            json_resp = await load_json_file(
-                self.test_folder + f"{eleve.eleve_id}_get_homeworks.json"
-            )
-        else:
-            json_resp = await self.ed_client.get_homeworks(eleve_id=eleve.eleve_id)
-            await save_json_file(
-                json_resp,
-                self.log_folder + f"{eleve.eleve_id}_get_homeworks.json",
-            )
+        json_resp = await self._request(
+            f"{eleve.eleve_id}_get_homeworks",
+            lambda: self._session_client.get_homeworks(eleve_id=eleve.eleve_id),
+        )
 
         homeworks = []
         if "data" not in json_resp:
             LOGGER.warning("get_homeworks: [%s]", json_resp)
         else:
             data = json_resp["data"]
-            for key in data.keys():
-                for homework_json in data[key]:
-                    homeworks_by_date_json = await self.get_homeworks_by_date(
-                        eleve, key
+            # Each date is fetched once, whatever the number of homeworks due,
+            # and only if its summary changed since the previous cycle
+            dates, homeworks_by_date = self.homework_sync.plan(
+                eleve.eleve_id, decode_html, data, datetime.now().date()
+            )
+            semaphore = asyncio.Semaphore(HOMEWORKS_MAX_CONCURRENT_DATES)
+
+            async def fetch_date(date: str) -> dict:
+                async with semaphore:
+                    return await self.get_homeworks_by_date(eleve, date)
+
+            # A failed date fails the whole fetch, nothing being remembered
+            fetched = await asyncio.gather(*(fetch_date(date) for date in dates))
+            incomplete = set()
+            for date, homeworks_by_date_json in zip(dates, fetched, strict=True):
+                matieres = {
+                    matiere["id"]: matiere
+                    for matiere in homeworks_by_date_json.get("matieres", [])
+                    if "aFaire" in matiere
+                }
+                homeworks_by_date[date] = [
+                    self.get_homework(
+                        matieres[homework_json["idDevoir"]], date, decode_html
                     )
-                    for matiere in homeworks_by_date_json["matieres"]:
-                        if (
-                            "aFaire" in matiere
-                            and matiere["id"] == homework_json["idDevoir"]
-                        ):
-                            hw = self.get_homework(matiere, key, decode_html)
-                            homeworks.append(hw)
+                    for homework_json in data[date]
+                    if homework_json["idDevoir"] in matieres
+                ]
+                if len(homeworks_by_date[date]) < len(data[date]):
+                    # Details missing, the date is fetched again next cycle
+                    incomplete.add(date)
+            self.homework_sync.update(
+                eleve.eleve_id,
+                decode_html,
+                data,
+                {
+                    date: date_homeworks
+                    for date, date_homeworks in homeworks_by_date.items()
+                    if date not in incomplete
+                },
+            )
+            for date in data:
+                homeworks.extend(homeworks_by_date.get(date, []))
             if homeworks is not None:
-                homeworks.sort(key=operator.itemgetter("date"))
+                homeworks.sort(key=operator.attrgetter("date"))
 
         return homeworks
 
-    def get_homework(self, data: dict, pour_le: str, clean_content: bool) -> dict:
+    def get_homework(self, data: dict, pour_le: str, clean_content: bool) -> EDHomework:
         """Get homework information."""
-        if "contenu" in data["aFaire"]:
-            contenu = base64.b64decode(data["aFaire"]["contenu"]).decode("utf-8")
-        else:
-            contenu = ""
-        if clean_content:
-            contenu = re.sub(CLEANR, "", contenu)
-        return {
-            "devoir_id": data.get("id"),
-            "date": datetime.strptime(pour_le, "%Y-%m-%d"),
-            "matiere": data.get("matiere"),
-            "short_description": contenu[0:HOMEWORK_DESC_MAX_LENGTH],
-            "description": contenu,
-            "effectue": data["aFaire"].get("effectue", False),
-            "interrogation": data.get("interrogation", False),
-        }
+        description, short_description = HOMEWORK_CONTENT_CACHE.get(
+            data.get("id"), data["aFaire"].get("contenu", ""), clean_content
+        )
+        return EDHomework(
+            devoir_id=data.get("id"),
+            date=datetime.fromisoformat(pour_le),
+            matiere=data.get("matiere"),
+            short_description=short_description,
+            description=description,
+            effectue=data["aFaire"].get("effectue", False),
+            interrogation=data.get("interrogation", False),
+        )
 
     async def post_homework(
         self, eleve_id: str, devoir_id: int, effectue: bool
     ) -> bool:
         """Post homework as done or not done."""
-        response = await self.ed_client.post_homework(
-            eleve_id=eleve_id, devoir_id=devoir_id, effectue=effectue
+        response = await self._request(
+            "post_homework",
+            lambda: self._session_client.post_homework(
+                eleve_id=eleve_id, devoir_id=devoir_id, effectue=effectue
+            ),
         )
         LOGGER.debug("post_homework response: %s", response)
         return response["code"] == ED_OK
@@ -366,201 +628,84 @@ async def get_grades_evaluations(
         eleve: EDEleve,
         annee_scolaire: str,
         grades_display: int = GRADES_TO_DISPLAY,
+        known: Mapping[int, int] | None = None,
     ) -> dict:
-        """Get grades."""
-        if FAKE_ON:
-            json_resp = await load_json_file(
-                self.test_folder + f"{eleve.eleve_id}_get_grades_evaluations.json"
-            )
-        else:
-            json_resp = await self.ed_client.get_grades_evaluations(
+        """Get grades, with the notes changed since the known fingerprints."""
+        json_resp = await self._request(
+            f"{eleve.eleve_id}_get_grades_evaluations",
+            lambda: self._session_client.get_grades_evaluations(
                 eleve_id=eleve.eleve_id,
                 annee_scolaire=annee_scolaire,
-            )
-            await save_json_file(
-                json_resp,
-                self.log_folder + f"{eleve.eleve_id}_get_grades_evaluations.json",
-            )
+            ),
+        )
 
         if "data" not in json_resp:
             LOGGER.warning("get_grades_evaluations: [%s]", json_resp)
             return {}
 
-        response = {}
-        response["notes"] = []
-        response["moyenne_generale"] = {}
-        response["evaluations"] = []
-        response["disciplines"] = []
-        data = json_resp["data"]
-        index1 = 0
-        index2 = 0
-        if "periodes" in data:
-            data["periodes"].sort(key=operator.itemgetter("dateDebut"))
-            for periode_json in data["periodes"]:
-                if periode_json["annuel"] is True:
-                    continue
-                if datetime.now() < datetime.strptime(
-                    periode_json["dateDebut"], "%Y-%m-%d"
-                ):
-                    continue
-                if datetime.now() > datetime.strptime(
-                    periode_json["dateFin"] + " 23:59:59", "%Y-%m-%d %H:%M:%S"
-                ):
-                    continue
-                response["disciplines"] = get_disciplines_periode(periode_json)
-                if "ensembleMatieres" in periode_json:
-                    response["moyenne_generale"] = {
-                        "moyenneGenerale": (
-                            periode_json["ensembleMatieres"].get("moyenneGenerale")
-                            or ""
-                        ).replace(",", "."),
-                        "moyenneClasse": (
-                            periode_json["ensembleMatieres"].get("moyenneClasse") or ""
-                        ).replace(",", "."),
-                        "moyenneMin": (
-                            periode_json["ensembleMatieres"].get("moyenneMin") or ""
-                        ).replace(",", "."),
-                        "moyenneMax": (
-                            periode_json["ensembleMatieres"].get("moyenneMax") or ""
-                        ).replace(",", "."),
-                        "dateCalcul": (
-                            periode_json["ensembleMatieres"].get("dateCalcul") or ""
-                        ),
-                    }
-                break
-
-        if "notes" in data:
-            data["notes"].sort(key=operator.itemgetter("dateSaisie"))
-            data["notes"].reverse()
-            for grade_json in data["notes"]:
-                fallback_matiere = get_lsun_libelle_matiere(
-                    data.get("LSUN"),
-                    grade_json.get("codeMatiere"),
-                    grade_json.get("codePeriode"),
-                )
-                if grade_json["noteSur"] == "0":
-                    index1 += 1
-                    if index1 > grades_display:
-                        continue
-                else:
-                    index2 += 1
-                    if index2 > grades_display:
-                        continue
-                    grade = get_grade(grade_json, fallback_matiere)
-                    response["notes"].append(grade)
-                evaluation = get_evaluation(grade_json, fallback_matiere)
-                if len(evaluation) > 0:
-                    response["evaluations"].append(evaluation)
-        return response
+        # The LSUN block rarely changes when new grades are added
+        lsun_index = self.payload_cache.parse(
+            f"{eleve.eleve_id}_lsun", json_resp["data"].get("LSUN"), EDLsunIndex
+        )
+        # The known fingerprints are left out of the payload one: the changes
+        # of an unchanged payload are already in the history
+        return self.payload_cache.parse(
+            f"{eleve.eleve_id}_get_grades_evaluations",
+            json_resp["data"],
+            functools.partial(
+                parse_grades_evaluations, lsun_index=lsun_index, known=known
+            ),
+            grades_display,
+            datetime.now().date(),
+        )
 
     async def get_vie_scolaire(self, eleve: EDEleve) -> dict:
         """Get vie scolaire (absences, retards, etc.)."""
-        if FAKE_ON:
-            json_resp = await load_json_file(
-                self.test_folder + f"{eleve.eleve_id}_get_vie_scolaire.json"
-            )
-        else:
-            json_resp = await self.ed_client.get_vie_scolaire(
-                eleve_id=eleve.eleve_id,
-            )
-            await save_json_file(
-                json_resp,
-                self.log_folder + f"{eleve.eleve_id}_get_vie_scolaire.json",
-            )
+        json_resp = await self._request(
+            f"{eleve.eleve_id}_get_vie_scolaire",
+            lambda: self._session_client.get_vie_scolaire(eleve_id=eleve.eleve_id),
+        )
 
         if "data" not in json_resp:
             LOGGER.warning("get_vie_scolaire: [%s]", json_resp)
             return {}
 
-        response = {}
-        response["absences"] = []
-        response["retards"] = []
-        response["sanctions"] = []
-        response["encouragements"] = []
-        data = json_resp["data"]
-        index1 = 0
-        index2 = 0
-        if "absencesRetards" in data:
-            data["absencesRetards"].sort(key=operator.itemgetter("date"))
-            data["absencesRetards"].reverse()
-            for data_json in data["absencesRetards"]:
-                if data_json["typeElement"] == "Absence":
-                    index1 += 1
-                    if index1 > VIE_SCOLAIRE_TO_DISPLAY:
-                        continue
-                    absence = get_vie_scolaire_element(data_json)
-                    response["absences"].append(absence)
-                else:
-                    index2 += 1
-                    if index2 > VIE_SCOLAIRE_TO_DISPLAY:
-                        continue
-                    retard = get_vie_scolaire_element(data_json)
-                    response["retards"].append(retard)
-
-        index1 = 0
-        index2 = 0
-        if "sanctionsEncouragements" in data:
-            data["sanctionsEncouragements"].sort(key=operator.itemgetter("date"))
-            data["sanctionsEncouragements"].reverse()
-            for data_json in data["sanctionsEncouragements"]:
-                if data_json["typeElement"] == "Punition":
-                    index1 += 1
-                    if index1 > VIE_SCOLAIRE_TO_DISPLAY:
-                        continue
-                    sanction = get_vie_scolaire_element(data_json)
-                    response["sanctions"].append(sanction)
-                else:
-                    index2 += 1
-                    if index2 > VIE_SCOLAIRE_TO_DISPLAY:
-                        continue
-                    encouragement = get_vie_scolaire_element(data_json)
-                    response["encouragements"].append(encouragement)
-
-        return response
+        return self.payload_cache.parse(
+            f"{eleve.eleve_id}_get_vie_scolaire",
+            json_resp["data"],
+            parse_vie_scolaire,
+        )
 
     async def get_lessons(
         self, eleve: EDEleve, date_debut: str, date_fin: str, lunch_break_time: time
-    ) -> list[Any]:
+    ) -> list[EDLesson]:
         """Get lessons."""
-        if FAKE_ON:
-            json_resp = await load_json_file(
-                self.test_folder + f"{eleve.eleve_id}_get_lessons.json"
-            )
-        else:
-            json_resp = await self.ed_client.get_lessons(
+        json_resp = await self._request(
+            f"{eleve.eleve_id}_get_lessons",
+            lambda: self._session_client.get_lessons(
                 eleve_id=eleve.eleve_id,
                 date_debut=date_debut,
                 date_fin=date_fin,
-            )
-            await save_json_file(
-                json_resp,
-                self.log_folder + f"{eleve.eleve_id}_get_lessons.json",
-            )
+            ),
+        )
 
-        response = []
         if "data" not in json_resp:
             LOGGER.warning("get_lessons: [%s]", json_resp)
-        else:
-            data = json_resp["data"]
-            for lesson_json in data:
-                response.append(get_lesson(lesson_json, lunch_break_time))
-            if response is not None:
-                response.sort(key=operator.itemgetter("start"))
+            return []
 
-        return response
+        return self.payload_cache.parse(
+            f"{eleve.eleve_id}_get_lessons",
+            json_resp["data"],
+            parse_lessons,
+            lunch_break_time,
+        )
 
     async def get_all_wallet_balances(self) -> dict | None:
         """Get all wallet balances from Ecole Directe."""
-        if FAKE_ON:
-            json_resp = await load_json_file(
-                self.test_folder + "get_all_wallet_balances.json"
-            )
-        else:
-            json_resp = await self.ed_client.get_all_wallet_balances()
-
-        await save_json_file(
-            json_resp,
-            self.log_folder + "get_all_wallet_balances.json",
+        # Looked up in the lambda, the session only exists in live mode
+        json_resp = await self._request(
+            "get_all_wallet_balances",
+            lambda: self._session_client.get_all_wallet_balances(),  # noqa: PLW0108
         )
 
         balances = {}
@@ -585,46 +730,45 @@ async def get_all_wallet_balances(self) -> dict | None:
 
     async def get_sondages(self) -> dict:
         """Get sondages."""
-        json_resp = await self.ed_client.get_sondages()
-        await save_json_file(
-            json_resp,
-            self.log_folder + "get_sondages.json",
+        return await self._request(
+            "get_sondages",
+            lambda: self._session_client.get_sondages(),  # noqa: PLW0108
         )
-        return json_resp
 
     async def get_formulaires(self, account_type: str, id_entity: str) -> list[Any]:
         """Get formulaires."""
-        json_resp = await self.ed_client.get_formulaires(account_type, id_entity)
-        await save_json_file(
-            json_resp,
-            self.log_folder + "get_formulaires.json",
+        json_resp = await self._request(
+            "get_formulaires",
+            lambda: self._session_client.get_formulaires(account_type, id_entity),
         )
 
-        response = []
         if "data" not in json_resp:
             LOGGER.warning("get_formulaires: [%s]", json_resp)
-        else:
-            data = json_resp["data"]
-            for form_json in data:
-                response.append(get_formulaire(form_json))
-
-        return response
+            return []
 
-    async def get_classe(self, classe_id: str) -> None:
-        """Get classe."""
-        await self.ed_client.get_classe(classe_id=classe_id)
-
-
-async def load_json_file(file_path: str) -> dict:
-    """Load JSON file."""
-    async with await anyio.open_file(file_path, "r") as f:
-        return json.loads(await f.read())
+        return self.payload_cache.parse(
+            f"{id_entity}_get_formulaires", json_resp["data"], parse_formulaires
+        )
 
+    async def get_classe(self, classe: dict) -> EDClasse:
+        """Get a class of a professor account, with its vie de la classe."""
+        classe_id = str(classe["id"])
+        json_resp = await self._request(
+            f"{classe_id}_get_classe",
+            lambda: self._session_client.get_classe(classe_id=classe_id),
+        )
 
-async def save_json_file(json_content: Any, file_path: str) -> None:
-    """Save JSON file."""
-    async with await anyio.open_file(file_path, "w", encoding="utf-8") as f:
-        await f.write(json.dumps(json_content, indent=4, ensure_ascii=False))
+        if "data" not in json_resp:
+            LOGGER.warning("get_classe: [%s]", json_resp)
+            json_resp = {"data": {}}
+
+        # Left out of the fingerprint: the time the page was found changed
+        return self.payload_cache.parse(
+            f"{classe_id}_get_classe",
+            json_resp["data"],
+            functools.partial(parse_classe, modifie_le=datetime.now(UTC)),
+            classe,
+        )
 
 
 async def check_ecoledirecte_session(
@@ -641,38 +785,236 @@ async def check_ecoledirecte_session(
     return client is not None
 
 
-def get_lsun_libelle_matiere(
-    lsun: Any | None,
-    code_matiere: str | None,
-    code_periode: str | None,
-) -> str | None:
-    """Find the matching libelleMatiere in LSUN by codeMatiere and codePeriode."""
-    if not code_matiere or not isinstance(lsun, dict):
-        return None
+def parse_grades_evaluations(
+    data: Any,
+    grades_display: int,
+    today: date,
+    lsun_index: EDLsunIndex | None = None,
+    known: Mapping[int, int] | None = None,
+) -> dict:
+    """
+    Parse grades, evaluations and averages of the current period.
+
+    Only the latest grades_display notes with a scale and the latest
+    grades_display notes without one are kept, selected in a single pass with
+    bounded heaps instead of sorting the whole year.
+
+    For the grade history, the fingerprint of every note of the year with a
+    scale is returned by note id. Only the notes whose fingerprint is not
+    known yet, new or changed since, are parsed into grades.
+
+    Args:
+        data: The grades payload.
+        grades_display: The maximum number of notes kept of each kind.
+        today: The current date, used to find the current period.
+        lsun_index: The compiled LSUN block of the payload, if already built.
+        known: The fingerprints of the notes already in the history, by note
+            id. Every note is new without them.
+
+    Returns:
+        The grades, evaluations, averages and disciplines to display, the
+        fingerprints of the notes of the year and the new or changed grades.
+
+    """
+    response = {}
+    response["notes"] = []
+    response["moyenne_generale"] = {}
+    response["evaluations"] = []
+    response["disciplines"] = []
+    periode_json = get_current_periode(data.get("periodes", []), today)
+    if periode_json is not None:
+        response["disciplines"] = get_disciplines_periode(periode_json)
+        if "ensembleMatieres" in periode_json:
+            response["moyenne_generale"] = {
+                "moyenneGenerale": (
+                    periode_json["ensembleMatieres"].get("moyenneGenerale") or ""
+                ).replace(",", "."),
+                "moyenneClasse": (
+                    periode_json["ensembleMatieres"].get("moyenneClasse") or ""
+                ).replace(",", "."),
+                "moyenneMin": (
+                    periode_json["ensembleMatieres"].get("moyenneMin") or ""
+                ).replace(",", "."),
+                "moyenneMax": (
+                    periode_json["ensembleMatieres"].get("moyenneMax") or ""
+                ).replace(",", "."),
+                "dateCalcul": (
+                    periode_json["ensembleMatieres"].get("dateCalcul") or ""
+                ),
+            }
+
+    if "notes" not in data:
+        return response
+    if lsun_index is None:
+        lsun_index = EDLsunIndex(data.get("LSUN"))
+
+    # Min-heaps of the latest notes, the index breaks dateSaisie ties so the
+    # last entered of two notes of the same time comes first. The notes new or
+    # changed since the last sync of the history are found in the same pass.
+    notes = data["notes"]
+    latest: dict[bool, list[tuple[str, int]]] = {True: [], False: []}
+    fingerprints: dict[int, int] = {}
+    changed: list[int] = []
+    for index, grade_json in enumerate(notes):
+        with_scale = grade_json["noteSur"] != "0"
+        if grades_display > 0:
+            heap = latest[with_scale]
+            item = (grade_json["dateSaisie"], index)
+            if len(heap) < grades_display:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+        note_id = grade_json.get("id")
+        if (
+            not with_scale
+            or note_id is None
+            or not grade_json["dateSaisie"]
+            or grade_json.get("valeur") is None
+        ):
+            continue
+        fingerprint = item_fingerprint(grade_json)
+        fingerprints[note_id] = fingerprint
+        if known is None or known.get(note_id) != fingerprint:
+            changed.append(index)
+
+    parsed: dict[int, EDGrade] = {}
+    for _, index in sorted(latest[True] + latest[False], reverse=True):
+        grade_json = notes[index]
+        fallback_matiere = lsun_index.libelle_matiere(
+            grade_json.get("codeMatiere"),
+            grade_json.get("codePeriode"),
+        )
+        grade, evaluation = get_grade_evaluation(
+            grade_json, fallback_matiere, with_grade=grade_json["noteSur"] != "0"
+        )
+        if grade is not None:
+            response["notes"].append(grade)
+            parsed[index] = grade
+        if evaluation is not None:
+            response["evaluations"].append(evaluation)
+
+    # Only the changed notes become grades, the latest already parsed above
+    response["empreintes_notes"] = fingerprints
+    response["notes_modifiees"] = []
+    for index in changed:
+        grade = parsed.get(index)
+        if grade is None:
+            grade_json = notes[index]
+            grade, _ = get_grade_evaluation(
+                grade_json,
+                lsun_index.libelle_matiere(
+                    grade_json.get("codeMatiere"), grade_json.get("codePeriode")
+                ),
+                with_grade=True,
+            )
+        if grade is not None:
+            response["notes_modifiees"].append(grade)
+    return response
 
-    if code_periode and code_periode in lsun:
-        period_items = lsun.get(code_periode)
-        if isinstance(period_items, list):
-            for item in period_items:
-                if (
-                    isinstance(item, dict)
-                    and item.get("codeMatiere") == code_matiere
-                    and item.get("libelleMatiere")
-                ):
-                    return item["libelleMatiere"]
 
-    for period_items in lsun.values():
-        if not isinstance(period_items, list):
+@functools.lru_cache(maxsize=32)
+def get_periode_bounds(date_debut: str, date_fin: str) -> tuple[date, date]:
+    """Get the first and last days of a period."""
+    return date.fromisoformat(date_debut), date.fromisoformat(date_fin)
+
+
+def get_current_periode(periodes: list[dict], today: date) -> dict | None:
+    """Get the earliest starting non-annual period including today."""
+    current = None
+    for periode_json in periodes:
+        if periode_json["annuel"] is True:
             continue
-        for item in period_items:
-            if (
-                isinstance(item, dict)
-                and item.get("codeMatiere") == code_matiere
-                and item.get("libelleMatiere")
-            ):
-                return item["libelleMatiere"]
+        date_debut, date_fin = get_periode_bounds(
+            periode_json["dateDebut"], periode_json["dateFin"]
+        )
+        if date_debut <= today <= date_fin and (
+            current is None or periode_json["dateDebut"] < current["dateDebut"]
+        ):
+            current = periode_json
+    return current
+
+
+def parse_vie_scolaire(data: Any) -> dict:
+    """Parse absences, retards, sanctions and encouragements."""
+    response = {}
+    response["absences"] = []
+    response["retards"] = []
+    response["sanctions"] = []
+    response["encouragements"] = []
+    index1 = 0
+    index2 = 0
+    if "absencesRetards" in data:
+        data["absencesRetards"].sort(key=operator.itemgetter("date"))
+        data["absencesRetards"].reverse()
+        for data_json in data["absencesRetards"]:
+            if data_json["typeElement"] == "Absence":
+                index1 += 1
+                if index1 > VIE_SCOLAIRE_TO_DISPLAY:
+                    continue
+                absence = get_vie_scolaire_element(data_json)
+                if absence is not None:
+                    response["absences"].append(absence)
+            else:
+                index2 += 1
+                if index2 > VIE_SCOLAIRE_TO_DISPLAY:
+                    continue
+                retard = get_vie_scolaire_element(data_json)
+                if retard is not None:
+                    response["retards"].append(retard)
+
+    index1 = 0
+    index2 = 0
+    if "sanctionsEncouragements" in data:
+        data["sanctionsEncouragements"].sort(key=operator.itemgetter("date"))
+        data["sanctionsEncouragements"].reverse()
+        for data_json in data["sanctionsEncouragements"]:
+            if data_json["typeElement"] == "Punition":
+                index1 += 1
+                if index1 > VIE_SCOLAIRE_TO_DISPLAY:
+                    continue
+                sanction = get_vie_scolaire_element(data_json)
+                if sanction is not None:
+                    response["sanctions"].append(sanction)
+            else:
+                index2 += 1
+                if index2 > VIE_SCOLAIRE_TO_DISPLAY:
+                    continue
+                encouragement = get_vie_scolaire_element(data_json)
+                if encouragement is not None:
+                    response["encouragements"].append(encouragement)
+
+    return response
+
 
-    return None
+def parse_lessons(data: Any, lunch_break_time: time) -> list[EDLesson]:
+    """Parse lessons, sorted by start date."""
+    response = [get_lesson(lesson_json, lunch_break_time) for lesson_json in data]
+    response.sort(key=operator.attrgetter("start"))
+    return response
+
+
+def parse_classe(data: Any, classe: dict, modifie_le: datetime) -> EDClasse:
+    """
+    Parse the vie de la classe of a class.
+
+    The code and the name of the class come from the login profile. The shape
+    of the payload is neither documented nor recorded: only the names of its
+    non-empty sections are kept.
+    """
+    return EDClasse(
+        classe_id=str(classe["id"]),
+        code=classe.get("code", ""),
+        libelle=classe.get("libelle", ""),
+        rubriques=sorted(key for key, value in data.items() if value)
+        if isinstance(data, dict)
+        else [],
+        modifie_le=modifie_le,
+    )
+
+
+def parse_formulaires(data: Any) -> list[dict]:
+    """Parse formulaires."""
+    return [get_formulaire(form_json) for form_json in data]
 
 
 def get_matiere(data: Any, fallback_matiere: str | None = None) -> str | None:
@@ -682,28 +1024,52 @@ def get_matiere(data: Any, fallback_matiere: str | None = None) -> str | None:
     return data.get("libelleMatiere")
 
 
-def get_grade(data: Any, fallback_matiere: str | None = None) -> dict:
-    """Get grade information."""
-    elements_programme = []
-    if "elementsProgramme" in data:
-        for element in data["elementsProgramme"]:
-            elements_programme.append(get_competence(element))
+def get_grade_evaluation(
+    data: Any, fallback_matiere: str | None = None, *, with_grade: bool
+) -> tuple[EDGrade | None, EDEvaluation | None]:
+    """Get grade and evaluation information, building competences once."""
+    matiere = get_matiere(data, fallback_matiere)
+    competences = [
+        get_competence(element) for element in data.get("elementsProgramme") or []
+    ]
+
+    grade = None
+    # No valeur on the notes of absences, exemptions or ungraded assessments
+    if with_grade and data.get("valeur") is not None:
+        grade = EDGrade(
+            note_id=data.get("id"),
+            date=data.get("date"),
+            matiere=matiere,
+            commentaire=data.get("devoir"),
+            note=data.get("valeur"),
+            sur=data.get("noteSur").replace(".", ","),
+            note_sur=data.get("valeur") + "/" + data.get("noteSur"),
+            coefficient=(data.get("coef") or "").replace(".", ","),
+            moyenne_classe=(data.get("moyenneClasse") or "").replace(".", ","),
+            max=str(data.get("maxClasse") or "").replace(".", ","),
+            min=str(data.get("minClasse") or "").replace(".", ","),
+            non_significatif=data.get("nonSignificatif"),
+            date_saisie=data.get("dateSaisie"),
+            elements_programme=competences,
+        )
 
-    return {
-        "date": data.get("date"),
-        "matiere": get_matiere(data, fallback_matiere),
-        "commentaire": data.get("devoir"),
-        "note": data.get("valeur"),
-        "sur": data.get("noteSur").replace(".", ","),
-        "note_sur": data.get("valeur") + "/" + data.get("noteSur"),
-        "coefficient": (data.get("coef") or "").replace(".", ","),
-        "moyenne_classe": (data.get("moyenneClasse") or "").replace(".", ","),
-        "max": str(data.get("maxClasse") or "").replace(".", ","),
-        "min": str(data.get("minClasse") or "").replace(".", ","),
-        "non_significatif": data.get("nonSignificatif"),
-        "date_saisie": data.get("dateSaisie"),
-        "elements_programme": elements_programme,
-    }
+    evaluation = None
+    if competences:
+        evaluation = EDEvaluation(
+            devoir=data.get("devoir"),
+            date=data.get("date"),
+            date_saisie=data.get("dateSaisie"),
+            matiere=matiere,
+            elements_programme=[
+                {
+                    "competence": competence["competence"],
+                    "descriptif": competence["descriptif"],
+                    "valeur": competence["valeur"],
+                }
+                for competence in competences
+            ],
+        )
+    return grade, evaluation
 
 
 def get_disciplines_periode(data: Any) -> list:
@@ -744,36 +1110,6 @@ def get_disciplines_periode(data: Any) -> list:
     return disciplines
 
 
-def get_evaluation(data: Any, fallback_matiere: str | None = None) -> dict:
-    """Get evaluation information."""
-    try:
-        elements_programme = []
-        if "elementsProgramme" in data:
-            for element in data["elementsProgramme"]:
-                elements_programme.append(element)
-
-        if len(elements_programme) == 0:
-            return {}
-
-        return {
-            "devoir": data.get("devoir"),
-            "date": data.get("date"),
-            "date_saisie": data.get("dateSaisie"),
-            "matiere": get_matiere(data, fallback_matiere),
-            "elements_programme": [
-                {
-                    "competence": competence.get("libelleCompetence"),
-                    "descriptif": competence.get("descriptif"),
-                    "valeur": competence.get("valeur"),
-                }
-                for competence in elements_programme
-            ],
-        }
-    except Exception:
-        LOGGER.exception("get_evaluation: %s", data)
-        raise
-
-
 def get_competence(data: Any) -> dict:
     """Get grade information."""
     valeur = data.get("valeur")
@@ -797,43 +1133,40 @@ def get_competence(data: Any) -> dict:
     }
 
 
-def get_vie_scolaire_element(viescolaire: Any) -> dict:
+def get_vie_scolaire_element(viescolaire: Any) -> EDVieScolaireElement | None:
     """Vie scolaire format."""
     try:
-        return {
-            "date": viescolaire["date"],
-            "type_element": viescolaire["typeElement"],
-            "display_date": viescolaire["displayDate"],
-            "justifie": viescolaire["justifie"],
-            "motif": viescolaire["motif"],
-            "libelle": viescolaire["libelle"],
-            "commentaire": viescolaire["commentaire"],
-        }
+        return EDVieScolaireElement(
+            date=viescolaire["date"],
+            type_element=viescolaire["typeElement"],
+            display_date=viescolaire["displayDate"],
+            justifie=viescolaire["justifie"],
+            motif=viescolaire["motif"],
+            libelle=viescolaire["libelle"],
+            commentaire=viescolaire["commentaire"],
+        )
     except Exception:
         LOGGER.exception("Error on format_viescolaire: %s", viescolaire)
-        return {}
+        return None
 
 
-def get_lesson(data: Any, lunch_break_time: time) -> dict:
+def get_lesson(data: Any, lunch_break_time: time) -> EDLesson:
     """Get lesson information."""
-    start_date = datetime.strptime(data["start_date"], "%Y-%m-%d %H:%M")
-    end_date = datetime.strptime(data["end_date"], "%Y-%m-%d %H:%M")
-    return {
-        "start": start_date,
-        "end": end_date,
-        "start_at": start_date.strftime("%Y-%m-%d %H:%M"),
-        "end_at": end_date.strftime("%Y-%m-%d %H:%M"),
-        "start_time": start_date.strftime("%H:%M"),
-        "end_time": end_date.strftime("%H:%M"),
-        "lesson": data["text"],
-        "salle": data["salle"],
-        "is_annule": data["isAnnule"],
-        "background_color": data["color"],
-        "prof": data["prof"],
-        "dispense": data["dispense"],
-        "is_morning": start_date.time() < lunch_break_time,
-        "is_afternoon": start_date.time() >= lunch_break_time,
-    }
+    # Timestamps are YYYY-MM-DD HH:MM, read by the fast ISO 8601 parser
+    start_date = datetime.fromisoformat(data["start_date"])
+    end_date = datetime.fromisoformat(data["end_date"])
+    return EDLesson(
+        start=start_date,
+        end=end_date,
+        lesson=data["text"],
+        salle=data["salle"],
+        is_annule=data["isAnnule"],
+        background_color=data["color"],
+        prof=data["prof"],
+        dispense=data["dispense"],
+        is_morning=start_date.time() < lunch_break_time,
+        is_afternoon=start_date.time() >= lunch_break_time,
+    )
 
 
 def get_formulaire(data: Any) -> dict:
@@ -0,0 +1,44 @@
+"""
+JSON codec for ecole_directe.
+
+Every payload of Ecole Directe is serialized at least once per cycle, to
+fingerprint it, and again when it is recorded or dumped; state attributes are
+serialized to measure them. All of them go through orjson, which Home
+Assistant already ships, rather than the json module of the standard library.
+
+orjson always writes UTF-8, as json with ensure_ascii=False, and only indents
+by two spaces. Values it does not know are written as by Home Assistant:
+sets as lists and any other object as its str().
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+
+# Keys of every dict are written as str, as json.dumps does
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    """Return a serializable value for an object orjson does not know."""
+    if isinstance(obj, set | frozenset):
+        return list(obj)
+    return str(obj)
+
+
+def json_dumps(obj: Any, *, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON, indented for files edited by hand."""
+    options = _OPTIONS | orjson.OPT_INDENT_2 if indent else _OPTIONS
+    return orjson.dumps(obj, default=_default, option=options)
+
+
+def json_loads(content: bytes | str) -> Any:
+    """Parse JSON content, raising a ValueError if it is invalid."""
+    return orjson.loads(content)
+
+
+def json_size(obj: Any) -> int:
+    """Return the size of obj serialized to JSON, in bytes."""
+    return len(json_dumps(obj))
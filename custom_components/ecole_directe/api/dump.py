@@ -0,0 +1,123 @@
+"""
+Debug dumps of the Ecole Directe responses for ecole_directe.
+
+When the enable_debugging option is on, every API response is written to the
+integration logs folder to help diagnose parsing issues. Responses are queued
+and written by a background task so the fetch path never waits on the disk.
+Dump names include dates, so the dumps older than the retention are deleted
+by the same task when it starts, then at most hourly between two writes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from ..const import (
+    DUMP_COMPRESS,
+    DUMP_PURGE_INTERVAL,
+    DUMP_QUEUE_SIZE,
+    DUMP_RETENTION_DAYS,
+    DUMP_ROTATE_COUNT,
+    LOGGER,
+)
+from .codec import json_dumps
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+
+class EDDumpWriter:
+    """Write API responses to the logs folder from a bounded background queue."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        folder: str,
+        compress: bool = DUMP_COMPRESS,
+        rotate_count: int = DUMP_ROTATE_COUNT,
+        retention_days: int = DUMP_RETENTION_DAYS,
+    ) -> None:
+        """Initialize the writer, call async_start to begin writing."""
+        self.hass = hass
+        self.folder = Path(folder)
+        self.compress = compress
+        self.rotate_count = rotate_count
+        self.retention_days = retention_days
+        self._queue: asyncio.Queue[tuple[str, bytes]] = asyncio.Queue(
+            maxsize=DUMP_QUEUE_SIZE
+        )
+        self._task: asyncio.Task | None = None
+        self._purged_at = 0.0
+
+    async def async_start(self) -> None:
+        """Prepare the logs folder and start the background writer."""
+        await self.hass.async_add_executor_job(self._prepare_folder)
+        self._purged_at = time.monotonic()
+        self._task = self.hass.async_create_background_task(
+            self._async_run(), name="ecole_directe dump writer"
+        )
+
+    async def async_stop(self) -> None:
+        """Write the queued dumps and stop the background writer."""
+        if self._task is None:
+            return
+        await self._queue.join()
+        self._task.cancel()
+        self._task = None
+
+    def dump(self, name: str, json_content: Any) -> None:
+        """Queue a response for writing, dropping it if the queue is full."""
+        if self._task is None:
+            return
+        # Serialized right away: the API client sorts some payloads in place
+        content = json_dumps(json_content)
+        try:
+            self._queue.put_nowait((name, content))
+        except asyncio.QueueFull:
+            LOGGER.debug("Dump queue full, dropping %s", name)
+
+    async def _async_run(self) -> None:
+        """Write queued dumps one after the other."""
+        while True:
+            name, content = await self._queue.get()
+            try:
+                await self.hass.async_add_executor_job(self._write, name, content)
+                if time.monotonic() - self._purged_at >= DUMP_PURGE_INTERVAL:
+                    self._purged_at = time.monotonic()
+                    await self.hass.async_add_executor_job(self._purge)
+            except OSError:
+                LOGGER.exception("Unable to write dump %s", name)
+            finally:
+                self._queue.task_done()
+
+    def _prepare_folder(self) -> None:
+        """Create the logs folder and delete dumps older than the retention."""
+        self.folder.mkdir(parents=True, exist_ok=True)
+        self._purge()
+
+    def _purge(self) -> None:
+        """Delete the dumps older than the retention."""
+        expiry = time.time() - self.retention_days * 86400
+        for path in self.folder.glob("*.json*"):
+            if path.stat().st_mtime < expiry:
+                path.unlink(missing_ok=True)
+
+    def _path(self, name: str, generation: int) -> Path:
+        """Return the path of a generation of a dump, 0 being the latest."""
+        suffix = "" if generation == 0 else f".{generation}"
+        extension = ".json.gz" if self.compress else ".json"
+        return self.folder / f"{name}{suffix}{extension}"
+
+    def _write(self, name: str, content: bytes) -> None:
+        """Rotate the previous generations of a dump and write the new one."""
+        for generation in range(self.rotate_count - 1, 0, -1):
+            previous = self._path(name, generation - 1)
+            if previous.exists():
+                previous.replace(self._path(name, generation))
+        if self.compress:
+            content = gzip.compress(content)
+        self._path(name, 0).write_bytes(content)
@@ -0,0 +1,75 @@
+"""
+Payload fingerprints for ecole_directe.
+
+Most refresh cycles get byte-identical responses from Ecole Directe. Hashing a
+payload is much cheaper than parsing it again, so the parsed result of the
+last payload is kept per endpoint and child and reused while the fingerprint
+does not change.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import zlib
+from typing import TYPE_CHECKING, Any
+
+from .codec import json_dumps
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def payload_fingerprint(payload: Any, args: tuple[Any, ...] = ()) -> str:
+    """Return a digest of a payload and of the arguments used to parse it."""
+    serialized = json_dumps([payload, args])
+    return hashlib.blake2b(serialized, digest_size=16).hexdigest()
+
+
+def item_fingerprint(item: Any) -> int:
+    """
+    Return a checksum of an item of a payload, to tell when it changes.
+
+    Cheaper than a digest for the hundreds of notes of a year, a collision only
+    delaying the update of an item to its next change.
+    """
+    return zlib.crc32(json_dumps(item))
+
+
+class EDPayloadCache:
+    """Parsed result of the last payload seen, per endpoint and child."""
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._entries: dict[str, tuple[str, Any]] = {}
+
+    def parse[T](
+        self,
+        key: str,
+        payload: Any,
+        parser: Callable[..., T],
+        *args: Any,
+    ) -> T:
+        """
+        Parse a payload, or return the previous result if it did not change.
+
+        The same object is returned on a match, so callers can compare results
+        by identity to skip work on unchanged data.
+
+        Args:
+            key: The endpoint and child the payload was fetched for.
+            payload: The raw payload, left untouched if already seen.
+            parser: The function building the result from the payload.
+            *args: Additional parser arguments, part of the fingerprint.
+
+        Returns:
+            The parsed result.
+
+        """
+        # Computed before parsing: parsers may sort the payload in place
+        fingerprint = payload_fingerprint(payload, args)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == fingerprint:
+            return entry[1]
+        result = parser(payload, *args)
+        self._entries[key] = (fingerprint, result)
+        return result
@@ -0,0 +1,158 @@
+"""
+Incremental cahier de textes synchronisation for ecole_directe.
+
+The cahier de textes summary lists, for each date, the homework IDs and their
+flags. Details only need to be downloaded again for the dates whose summary
+changed since the previous cycle, for new dates and for the dates close to
+today, where teachers are most likely to edit the content.
+
+Decoding a homework content is the most expensive part of parsing, and the
+same homework is seen by every child of a class. Decoded contents are kept in
+a process-wide LRU cache keyed by homework and raw content digest.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+from collections import OrderedDict
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+from ..const import (
+    HOMEWORK_CONTENT_CACHE_MAX_BYTES,
+    HOMEWORK_DESC_MAX_LENGTH,
+    HOMEWORKS_ALWAYS_REFRESH_DAYS,
+    HOMEWORKS_ALWAYS_REFRESH_LOOKBACK_DAYS,
+)
+from .html_text import html_to_text
+
+if TYPE_CHECKING:
+    from datetime import date
+
+    from .records import EDHomework
+
+
+class EDHomeworkSync:
+    """Previous cahier de textes summaries and decoded homeworks, per child."""
+
+    def __init__(self) -> None:
+        """Initialize an empty synchronisation state."""
+        self._children: dict[
+            str, tuple[bool, dict[str, tuple[Any, list[EDHomework]]]]
+        ] = {}
+
+    def plan(
+        self,
+        eleve_id: str,
+        decode_html: bool,
+        summary: dict[str, Any],
+        today: date,
+    ) -> tuple[list[str], dict[str, list[EDHomework]]]:
+        """
+        Split the dates of a summary into dates to fetch and reusable homeworks.
+
+        Args:
+            eleve_id: The child the summary belongs to.
+            decode_html: Whether homework contents are stripped of HTML.
+            summary: The cahier de textes summary, homeworks listed by date.
+            today: The current date.
+
+        Returns:
+            The dates to fetch, and the cached homeworks of the other dates.
+
+        """
+        previous: dict[str, tuple[Any, list[EDHomework]]] = {}
+        if eleve_id in self._children and self._children[eleve_id][0] == decode_html:
+            previous = self._children[eleve_id][1]
+        # Dates refreshed even with an unchanged summary
+        lookback = (
+            today - timedelta(days=HOMEWORKS_ALWAYS_REFRESH_LOOKBACK_DAYS)
+        ).isoformat()
+        horizon = (today + timedelta(days=HOMEWORKS_ALWAYS_REFRESH_DAYS)).isoformat()
+
+        dates = []
+        cached_homeworks = {}
+        for pour_le, entries in summary.items():
+            if not entries:
+                continue
+            cached = previous.get(pour_le)
+            if cached is None or cached[0] != entries or lookback <= pour_le <= horizon:
+                dates.append(pour_le)
+            else:
+                cached_homeworks[pour_le] = cached[1]
+        return dates, cached_homeworks
+
+    def update(
+        self,
+        eleve_id: str,
+        decode_html: bool,
+        summary: dict[str, Any],
+        homeworks_by_date: dict[str, list[EDHomework]],
+    ) -> None:
+        """
+        Remember the summary and decoded homeworks of the current cycle.
+
+        Only the dates given are reused in the next cycles: a date whose
+        details came back empty or incomplete is left out, to be fetched
+        again rather than kept missing until its summary changes.
+        """
+        self._children[eleve_id] = (
+            decode_html,
+            {
+                pour_le: (summary[pour_le], homeworks)
+                for pour_le, homeworks in homeworks_by_date.items()
+            },
+        )
+
+
+def decode_homework_content(contenu: str, clean_content: bool) -> tuple[str, str]:
+    """Return the description and short description of a base64 content."""
+    description = base64.b64decode(contenu).decode("utf-8") if contenu else ""
+    if clean_content:
+        return html_to_text(description, HOMEWORK_DESC_MAX_LENGTH)
+    return description, description[0:HOMEWORK_DESC_MAX_LENGTH]
+
+
+class EDHomeworkContentCache:
+    """Decoded homework contents, least recently used evicted past a size cap."""
+
+    def __init__(self, max_bytes: int = HOMEWORK_CONTENT_CACHE_MAX_BYTES) -> None:
+        """Initialize an empty cache holding up to max_bytes of text."""
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: OrderedDict[tuple[Any, bytes, bool], tuple[str, str]] = (
+            OrderedDict()
+        )
+
+    def get(self, devoir_id: Any, contenu: str, clean_content: bool) -> tuple[str, str]:
+        """
+        Return the decoded content of a homework, decoding it on a miss.
+
+        Args:
+            devoir_id: The homework ID.
+            contenu: The raw base64 content, only its digest is kept.
+            clean_content: Whether HTML tags are stripped from the content.
+
+        Returns:
+            The description and short description of the homework.
+
+        """
+        digest = hashlib.blake2b(contenu.encode("ascii"), digest_size=16).digest()
+        key = (devoir_id, digest, clean_content)
+        decoded = self._entries.get(key)
+        if decoded is not None:
+            self._entries.move_to_end(key)
+            return decoded
+
+        decoded = decode_homework_content(contenu, clean_content)
+        self._entries[key] = decoded
+        self.size += len(decoded[0])
+        while self.size > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted[0])
+        return decoded
+
+
+# Shared by all clients, so twins in the same class hit the same entries
+HOMEWORK_CONTENT_CACHE = EDHomeworkContentCache()
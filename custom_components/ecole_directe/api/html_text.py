@@ -0,0 +1,131 @@
+"""
+HTML to text conversion for ecole_directe.
+
+Homework contents are HTML written with the Ecole Directe editor. When the
+decode_html option is on they are converted to plain text in a single pass:
+entities are decoded, whitespace is collapsed, line breaks are kept for
+``<br>`` and block elements, and a size-bounded summary is built on the way.
+"""
+
+from __future__ import annotations
+
+from html.parser import HTMLParser
+
+# Elements starting on a new line
+BLOCK_TAGS = frozenset(
+    {
+        "address",
+        "blockquote",
+        "div",
+        "dd",
+        "dl",
+        "dt",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "hr",
+        "li",
+        "ol",
+        "p",
+        "pre",
+        "table",
+        "tr",
+        "ul",
+    }
+)
+# Elements whose content is not text
+SKIPPED_TAGS = frozenset({"head", "script", "style", "template", "title"})
+ELLIPSIS = "…"
+
+
+class _TextExtractor(HTMLParser):
+    """Collect the text of an HTML document and the summary of its start."""
+
+    def __init__(self, summary_length: int) -> None:
+        """Initialize the extractor for summaries of summary_length chars."""
+        super().__init__(convert_charrefs=True)
+        self.summary_length = summary_length
+        self.summary: str | None = None
+        self._chunks: list[str] = []
+        self._length = 0
+        self._skipped = 0
+        self._pending_space = False
+        self._pending_break = False
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:  # noqa: ARG002
+        """Break lines before blocks and skip non-text elements."""
+        if tag in SKIPPED_TAGS:
+            self._skipped += 1
+        elif tag == "br" or tag in BLOCK_TAGS:
+            self._pending_break = True
+            if tag == "li":
+                self._write("- ")
+
+    def handle_endtag(self, tag: str) -> None:
+        """Break lines after blocks and resume after non-text elements."""
+        if tag in SKIPPED_TAGS:
+            self._skipped = max(self._skipped - 1, 0)
+        elif tag in BLOCK_TAGS:
+            self._pending_break = True
+
+    def handle_data(self, data: str) -> None:
+        """Write text with its whitespace collapsed."""
+        if self._skipped:
+            return
+        if data[:1].isspace():
+            self._pending_space = True
+        text = " ".join(data.split())
+        if text:
+            self._write(text)
+            self._pending_space = data[-1].isspace()
+
+    def _write(self, text: str) -> None:
+        """Append text after the pending separator, if any."""
+        if self._chunks:
+            if self._pending_break:
+                text = "\n" + text
+            elif self._pending_space and not self._chunks[-1].endswith(" "):
+                text = " " + text
+        self._pending_break = False
+        self._pending_space = False
+        self._chunks.append(text)
+        self._length += len(text)
+        if self.summary is None and self._length > self.summary_length:
+            self.summary = self._summarize()
+
+    def _summarize(self) -> str:
+        """Return the start of the text cut on a word, within summary_length."""
+        text = "".join(self._chunks)[: self.summary_length - len(ELLIPSIS) + 1]
+        cut = max(text.rfind(" "), text.rfind("\n"))
+        text = text[:cut] if cut > 0 else text[:-1]
+        return text.rstrip() + ELLIPSIS
+
+    def text(self) -> str:
+        """Return the text collected so far."""
+        return "".join(self._chunks)
+
+
+def html_to_text(content: str, summary_length: int) -> tuple[str, str]:
+    r"""
+    Convert HTML to plain text and a summary of at most summary_length chars.
+
+    Args:
+        content: The HTML to convert.
+        summary_length: The maximum length of the summary.
+
+    Returns:
+        The text, and its summary ending with an ellipsis when shortened.
+
+    Example:
+        >>> html_to_text("<p>Lire&nbsp;p. 12</p><p>Exercice 3</p>", 125)
+        ('Lire p. 12\nExercice 3', 'Lire p. 12\nExercice 3')
+
+    """
+    extractor = _TextExtractor(summary_length)
+    extractor.feed(content)
+    extractor.close()
+    text = extractor.text()
+    return text, extractor.summary if extractor.summary is not None else text
@@ -0,0 +1,177 @@
+"""
+Adaptive concurrency limiter for ecole_directe.
+
+The modules of every child are fetched concurrently, which Ecole Directe may
+answer by throttling the session. Requests therefore go through a limiter
+whose window, the number of requests allowed in flight, follows AIMD:
+
+- additive increase: each fast response while the window is full grows it by
+  ``1 / window``, about one more request per round trip
+- multiplicative decrease: an overload error (HTTP 429 or 5xx, timeout or
+  connection error) or a response slower than LIMITER_SLOW_RESPONSE shrinks
+  it by LIMITER_DECREASE_FACTOR, once per congestion event
+
+Requests above the window wait in a FIFO queue.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+from ecoledirecte_api.exceptions import (
+    EcoleDirecteException,
+    ServiceUnavailableException,
+)
+
+from ..const import (
+    LIMITER_DECREASE_FACTOR,
+    LIMITER_INITIAL_WINDOW,
+    LIMITER_MAX_WINDOW,
+    LIMITER_MIN_WINDOW,
+    LIMITER_SLOW_RESPONSE,
+    LOGGER,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """Return True if an error means Ecole Directe is throttling or overloaded."""
+    if isinstance(
+        error, ServiceUnavailableException | TimeoutError | aiohttp.ClientError
+    ):
+        return True
+    # The library only reports the HTTP status of a non JSON response in its message
+    return isinstance(error, EcoleDirecteException) and "[429]" in getattr(
+        error, "message", ""
+    )
+
+
+class EDConcurrencyLimiter:
+    """AIMD limit on the Ecole Directe requests in flight for a session."""
+
+    def __init__(
+        self,
+        initial_window: float = LIMITER_INITIAL_WINDOW,
+        min_window: float = LIMITER_MIN_WINDOW,
+        max_window: float = LIMITER_MAX_WINDOW,
+        decrease_factor: float = LIMITER_DECREASE_FACTOR,
+        slow_response: float = LIMITER_SLOW_RESPONSE,
+    ) -> None:
+        """
+        Initialize the limiter.
+
+        Args:
+            initial_window: The requests allowed in flight at first.
+            min_window: The lowest window, at least one request.
+            max_window: The highest window.
+            decrease_factor: The factor applied to the window on overload.
+            slow_response: The latency above which a response means overload,
+                in seconds.
+
+        """
+        self.window = float(initial_window)
+        self.min_window = max(1.0, float(min_window))
+        self.max_window = float(max_window)
+        self.decrease_factor = decrease_factor
+        self.slow_response = slow_response
+        self.in_flight = 0
+        self.requests = 0
+        self.decreases = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._decreased_at = 0.0
+
+    @property
+    def limit(self) -> int:
+        """Return the requests allowed in flight."""
+        return max(1, int(self.window))
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the requests waiting for a slot."""
+        return len(self._waiters)
+
+    async def run[T](self, fetch: Callable[[], Awaitable[T]]) -> T:
+        """Send a request once a slot is free and adapt the window to its outcome."""
+        await self._acquire()
+        start = time.monotonic()
+        try:
+            result = await fetch()
+        except Exception as error:
+            if is_overload_error(error):
+                self._decrease(start, f"{type(error).__name__}")
+            raise
+        else:
+            latency = time.monotonic() - start
+            if latency > self.slow_response:
+                self._decrease(start, f"slow response ({latency:.1f} s)")
+            else:
+                self._increase()
+            return result
+        finally:
+            self.requests += 1
+            self._release()
+
+    def as_diagnostics(self) -> dict[str, Any]:
+        """Return the state of the limiter, for the diagnostics."""
+        return {
+            "window": round(self.window, 2),
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "requests": self.requests,
+            "decreases": self.decreases,
+        }
+
+    async def _acquire(self) -> None:
+        """Wait for a free slot, in arrival order."""
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before the cancellation
+                self.in_flight -= 1
+                self._wake_up()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def _release(self) -> None:
+        """Free the slot of a finished request."""
+        self.in_flight -= 1
+        self._wake_up()
+
+    def _wake_up(self) -> None:
+        """Hand the free slots over to the first waiting requests."""
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def _increase(self) -> None:
+        """Grow the window, only while it limits the requests in flight."""
+        if self.in_flight >= self.limit and self.window < self.max_window:
+            self.window = min(self.max_window, self.window + 1 / self.window)
+            self._wake_up()
+
+    def _decrease(self, start: float, reason: str) -> None:
+        """Shrink the window, once for the requests sent before the last decrease."""
+        if start < self._decreased_at:
+            return
+        self._decreased_at = time.monotonic()
+        self.window = max(self.min_window, self.window * self.decrease_factor)
+        self.decreases += 1
+        LOGGER.debug(
+            "Ecole Directe overloaded (%s), window down to %.2f", reason, self.window
+        )
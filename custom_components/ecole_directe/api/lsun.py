@@ -0,0 +1,49 @@
+"""
+LSUN subject index for ecole_directe.
+
+The LSUN block of the grades payload lists, per period, the subjects of the
+livret scolaire with their full label. Grades of a sub-subject are labelled
+with it, so the block is compiled once into lookup maps instead of being
+scanned for every grade.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+class EDLsunIndex:
+    """Subject labels of an LSUN block, by period and subject code."""
+
+    def __init__(self, lsun: Any | None) -> None:
+        """Compile the LSUN block, the first label found for a key wins."""
+        self.by_periode: dict[tuple[str, str], str] = {}
+        self.by_matiere: dict[str, str] = {}
+        if not isinstance(lsun, dict):
+            return
+        for code_periode, period_items in lsun.items():
+            if not isinstance(period_items, list):
+                continue
+            for item in period_items:
+                if not isinstance(item, dict) or not item.get("libelleMatiere"):
+                    continue
+                code_matiere = item.get("codeMatiere")
+                # Never looked up: grades without a code have no LSUN label
+                if not code_matiere:
+                    continue
+                self.by_periode.setdefault(
+                    (code_periode, code_matiere), item["libelleMatiere"]
+                )
+                self.by_matiere.setdefault(code_matiere, item["libelleMatiere"])
+
+    def libelle_matiere(
+        self, code_matiere: str | None, code_periode: str | None
+    ) -> str | None:
+        """Find the libelleMatiere of a subject, in its period first."""
+        if not code_matiere:
+            return None
+        if code_periode:
+            libelle = self.by_periode.get((code_periode, code_matiere))
+            if libelle is not None:
+                return libelle
+        return self.by_matiere.get(code_matiere)
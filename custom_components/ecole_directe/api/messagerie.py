@@ -0,0 +1,188 @@
+"""
+Incremental messagerie synchronisation for ecole_directe.
+
+Received messages are listed from the most recent one. The family mailbox and
+the mailbox of each child only need their first page to find the messages
+received since the previous cycle: the highest message ID seen so far is kept
+as a cursor for each mailbox.
+
+Ecole Directe has no filter on message IDs, so a mailbox with a cursor is read
+with small pages, a further page being asked for only while every message of
+the last one is newer than the cursor.
+
+In counts-only mode, just the counters shown by the sensors are read, from
+the smallest page the API allows. The mailbox of a child is often the family
+mailbox itself: once both gave the same fingerprint, the child mailbox is not
+asked for again while the family one does not change, for a few cycles.
+
+A message sent to the family is often in the mailbox of a child as well: its
+ID is remembered once notified, so that it is notified only once.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from ..const import (
+    MESSAGES_FIRST_PAGE_SIZE,
+    MESSAGES_MIRROR_MAX_SKIPS,
+    MESSAGES_NOTIFIED_MAX,
+    MESSAGES_PAGE_SIZE,
+)
+from .fingerprint import payload_fingerprint
+
+# Counters of a mailbox, read by the messagerie sensors
+MESSAGE_COUNT_KEYS = (
+    "messagesRecusCount",
+    "messagesEnvoyesCount",
+    "messagesArchivesCount",
+    "messagesRecusNotReadCount",
+    "messagesDraftCount",
+)
+
+
+@dataclass(slots=True)
+class EDMailboxCursor:
+    """Last seen message of a mailbox."""
+
+    highest_id: int
+
+
+class EDMessagerieSync:
+    """Cursors of the family mailbox and of the mailbox of each child."""
+
+    def __init__(self) -> None:
+        """Initialize without cursors, the first sync of a mailbox sets them."""
+        self._cursors: dict[str, EDMailboxCursor] = {}
+
+    def cursor(self, mailbox: str) -> EDMailboxCursor | None:
+        """Return the cursor of a mailbox, None before its first sync."""
+        return self._cursors.get(mailbox)
+
+    def page_size(self, mailbox: str) -> int:
+        """Return the number of messages to ask for in a page of a mailbox."""
+        if mailbox in self._cursors:
+            return MESSAGES_PAGE_SIZE
+        return MESSAGES_FIRST_PAGE_SIZE
+
+    def needs_next_page(self, mailbox: str, page: list[dict[str, Any]]) -> bool:
+        """Return True if messages newer than the cursor may be on the next page."""
+        cursor = self._cursors.get(mailbox)
+        if cursor is None or len(page) < MESSAGES_PAGE_SIZE:
+            return False
+        return all(_message_id(message) > cursor.highest_id for message in page)
+
+    def update(
+        self, mailbox: str, messages: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """
+        Move the cursor of a mailbox past the messages read from it.
+
+        Args:
+            mailbox: The family, or the child the mailbox belongs to.
+            messages: The received messages read in this cycle.
+
+        Returns:
+            The messages newer than the previous cursor, none on the first sync.
+
+        """
+        cursor = self._cursors.get(mailbox)
+        first_sync = cursor is None
+        if cursor is None:
+            cursor = self._cursors[mailbox] = EDMailboxCursor(highest_id=0)
+
+        new_messages = []
+        highest_id = cursor.highest_id
+        for message in messages:
+            message_id = _message_id(message)
+            if message_id > cursor.highest_id:
+                highest_id = max(highest_id, message_id)
+                if not first_sync:
+                    new_messages.append(message)
+        cursor.highest_id = highest_id
+        return new_messages
+
+
+class EDMailboxMirrors:
+    """Children mailboxes last found identical to the family mailbox."""
+
+    def __init__(self) -> None:
+        """Initialize without any family mailbox read yet."""
+        self._family: tuple[str, dict[str, Any]] | None = None
+        # Family fingerprint matched and cycles skipped since, per child
+        self._mirrors: dict[str, tuple[str, int]] = {}
+
+    def set_family(self, fingerprint: str, counts: dict[str, Any]) -> None:
+        """Remember the last family mailbox read."""
+        self._family = (fingerprint, counts)
+
+    def set_child(self, eleve_id: str, fingerprint: str) -> None:
+        """Remember whether a child mailbox matches the family mailbox."""
+        if self._family is not None and fingerprint == self._family[0]:
+            self._mirrors[eleve_id] = (fingerprint, 0)
+        else:
+            self._mirrors.pop(eleve_id, None)
+
+    def mirrored(self, eleve_id: str) -> dict[str, Any] | None:
+        """Return the family counters if the child mailbox can be skipped."""
+        mirror = self._mirrors.get(eleve_id)
+        if (
+            self._family is None
+            or mirror is None
+            or mirror[0] != self._family[0]
+            or mirror[1] >= MESSAGES_MIRROR_MAX_SKIPS
+        ):
+            return None
+        self._mirrors[eleve_id] = (mirror[0], mirror[1] + 1)
+        return self._family[1]
+
+
+class EDNotifiedMessages:
+    """IDs of the last messages notified, whatever their mailbox."""
+
+    def __init__(self) -> None:
+        """Initialize without any message notified yet."""
+        # Insertion ordered, the oldest IDs being dropped first
+        self._ids: dict[int, None] = {}
+
+    def claim(self, message: dict[str, Any]) -> bool:
+        """Return True if a message was not notified yet, remembering it."""
+        message_id = _message_id(message)
+        if message_id in self._ids:
+            return False
+        self._ids[message_id] = None
+        if len(self._ids) > MESSAGES_NOTIFIED_MAX:
+            del self._ids[next(iter(self._ids))]
+        return True
+
+
+def mailbox_counts(data: dict[str, Any]) -> tuple[str, dict[str, Any]]:
+    """Return the fingerprint and the counters of a page of a mailbox."""
+    pagination = data.get("pagination", {})
+    counts = {key: pagination.get(key, 0) for key in MESSAGE_COUNT_KEYS}
+    newest = [
+        _message_id(message)
+        for message in data.get("messages", {}).get("received", [])[:1]
+    ]
+    return payload_fingerprint(counts, tuple(newest)), counts
+
+
+def _message_id(message: dict[str, Any]) -> int:
+    """Return the ID of a message, 0 if it has none."""
+    try:
+        return int(str(message.get("id") or 0))
+    except ValueError:
+        return 0
+
+
+def message_event_data(message: dict[str, Any]) -> dict[str, Any]:
+    """Return the fields of a new message sent with its event."""
+    sender = message.get("from")
+    return {
+        "id": _message_id(message),
+        "subject": message.get("subject", ""),
+        "from": sender.get("name", "") if isinstance(sender, dict) else "",
+        "date": message.get("date", ""),
+        "read": message.get("read", False),
+    }
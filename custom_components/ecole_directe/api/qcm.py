@@ -0,0 +1,124 @@
+"""
+QCM answer store for ecole_directe.
+
+Ecole Directe asks a multiple choice question when logging in from a new
+device. The known answers are kept in a JSON file of the configuration
+folder, which the user edits to keep only the right proposition of each new
+question.
+
+Config flow validations, coordinator refreshes and account sessions all log
+in with the same file, so its answers are kept in memory once per process
+and per path. The file is read again only when its modification time
+changes, new questions are written once per login and every write goes
+through a temporary file renamed over the previous one, so that a login
+never reads a half written file.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.util.file import write_utf8_file_atomic
+
+from ..const import LOGGER
+from .codec import json_dumps, json_loads
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+
+class EDQcmStore:
+    """QCM answers of a file, shared by every client of the process."""
+
+    def __init__(self, path: str) -> None:
+        """Initialize the store, the file is read on first use."""
+        self.path = Path(path)
+        self.answers: dict[str, Any] = {}
+        self._mtime_ns: int | None = None
+        # Questions of the file, as last read or written
+        self._saved: set[str] = set()
+        # New questions waiting to be written
+        self._pending: set[str] = set()
+        self._lock = asyncio.Lock()
+
+    async def async_get_answers(self, hass: HomeAssistant) -> dict[str, Any]:
+        """Return the answers, read again if the file changed since."""
+        async with self._lock:
+            await self._async_refresh(hass)
+        return self.answers
+
+    def add_questions(self, qcm_json: dict[str, Any]) -> None:
+        """Keep the questions of qcm_json missing from the file, to write later."""
+        for question, propositions in qcm_json.items():
+            if question in self._saved or question in self._pending:
+                continue
+            self.answers.setdefault(question, propositions)
+            self._pending.add(question)
+
+    async def async_flush(self, hass: HomeAssistant) -> int:
+        """Write the new questions to the file, return how many were written."""
+        async with self._lock:
+            if not self._pending:
+                return 0
+            # Keep the answers edited in the file since it was read
+            await self._async_refresh(hass)
+            written = len(self._pending)
+            content = json_dumps(self.answers, indent=True)
+            self._mtime_ns = await hass.async_add_executor_job(self._write, content)
+            self._saved = set(self.answers)
+            self._pending.clear()
+        LOGGER.debug("Saved %s new questions to %s", written, self.path)
+        return written
+
+    async def _async_refresh(self, hass: HomeAssistant) -> None:
+        """Read the file again if its modification time changed."""
+        mtime_ns, content = await hass.async_add_executor_job(
+            self._read_if_changed, self._mtime_ns
+        )
+        if mtime_ns == self._mtime_ns:
+            return
+        self._mtime_ns = mtime_ns
+        if content is None:
+            answers: dict[str, Any] = {}
+        else:
+            try:
+                answers = json_loads(content)
+            except ValueError:
+                LOGGER.warning(
+                    "Invalid QCM file %s, keeping the answers read before", self.path
+                )
+                return
+        # New questions not written yet are added to the file content
+        for question in self._pending:
+            answers.setdefault(question, self.answers[question])
+        self.answers = answers
+        self._saved = set(answers) - self._pending
+
+    def _read_if_changed(self, mtime_ns: int | None) -> tuple[int | None, bytes | None]:
+        """Return the modification time and, if it changed, the file content."""
+        try:
+            current = self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None, None
+        if current == mtime_ns:
+            return current, None
+        return current, self.path.read_bytes()
+
+    def _write(self, content: bytes) -> int:
+        """Replace the file atomically, return its new modification time."""
+        write_utf8_file_atomic(str(self.path), content, mode="wb")
+        return self.path.stat().st_mtime_ns
+
+
+_STORES: dict[str, EDQcmStore] = {}
+
+
+def get_qcm_store(path: str) -> EDQcmStore:
+    """Return the store of a QCM file, created on first use."""
+    key = str(Path(path).absolute())
+    store = _STORES.get(key)
+    if store is None:
+        store = _STORES[key] = EDQcmStore(key)
+    return store
@@ -0,0 +1,167 @@
+"""
+Parsed item records for ecole_directe.
+
+Lessons, homeworks, grades, evaluations and vie scolaire elements are kept in
+coordinator.data for every child and copied into several filtered lists, the
+classes of a professor account in coordinator.data too. They are stored as
+slotted dataclasses rather than dicts to keep them compact, and turned into
+dicts only when exposed as state attributes or event data.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, ClassVar
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+
+class EDRecord:
+    """Base class of the parsed item records."""
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        """Return a field by name, like the dicts records used to be."""
+        return getattr(self, key)
+
+    def as_attributes(self) -> dict[str, Any]:
+        """Return the fields as a dict, for state attributes and events."""
+        names = getattr(self, "ATTRIBUTES", self.__slots__)
+        return {name: getattr(self, name) for name in names}
+
+
+@dataclass(frozen=True, slots=True)
+class EDHomework(EDRecord):
+    """Homework due for a given date."""
+
+    devoir_id: int | None
+    date: datetime
+    matiere: str | None
+    short_description: str
+    description: str
+    effectue: bool
+    interrogation: bool
+
+
+@dataclass(frozen=True, slots=True)
+class EDLesson(EDRecord):
+    """Lesson of the timetable, its formatted times computed on first use."""
+
+    ATTRIBUTES: ClassVar[tuple[str, ...]] = (
+        "start",
+        "end",
+        "start_at",
+        "end_at",
+        "start_time",
+        "end_time",
+        "lesson",
+        "salle",
+        "is_annule",
+        "background_color",
+        "prof",
+        "dispense",
+        "is_morning",
+        "is_afternoon",
+    )
+
+    start: datetime
+    end: datetime
+    lesson: str
+    salle: str
+    is_annule: bool
+    background_color: str
+    prof: str
+    dispense: Any
+    is_morning: bool
+    is_afternoon: bool
+    _formatted: tuple[str, str, str, str] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def _format(self) -> tuple[str, str, str, str]:
+        """Return the formatted start and end, computing them once."""
+        formatted = self._formatted
+        if formatted is None:
+            start_at = self.start.strftime("%Y-%m-%d %H:%M")
+            end_at = self.end.strftime("%Y-%m-%d %H:%M")
+            formatted = (start_at, end_at, start_at[11:], end_at[11:])
+            # Records are frozen, the cache is the only field set afterwards
+            object.__setattr__(self, "_formatted", formatted)
+        return formatted
+
+    @property
+    def start_at(self) -> str:
+        """Return the start as YYYY-MM-DD HH:MM."""
+        return self._format()[0]
+
+    @property
+    def end_at(self) -> str:
+        """Return the end as YYYY-MM-DD HH:MM."""
+        return self._format()[1]
+
+    @property
+    def start_time(self) -> str:
+        """Return the start time as HH:MM."""
+        return self._format()[2]
+
+    @property
+    def end_time(self) -> str:
+        """Return the end time as HH:MM."""
+        return self._format()[3]
+
+
+@dataclass(frozen=True, slots=True)
+class EDGrade(EDRecord):
+    """Grade with its class statistics."""
+
+    note_id: int | None
+    date: str | None
+    matiere: str | None
+    commentaire: str | None
+    note: str | None
+    sur: str
+    note_sur: str
+    coefficient: str
+    moyenne_classe: str
+    max: str
+    min: str
+    non_significatif: bool | None
+    date_saisie: str | None
+    elements_programme: list[dict[str, Any]]
+
+
+@dataclass(frozen=True, slots=True)
+class EDEvaluation(EDRecord):
+    """Competences evaluated by a devoir."""
+
+    devoir: str | None
+    date: str | None
+    date_saisie: str | None
+    matiere: str | None
+    elements_programme: list[dict[str, Any]]
+
+
+@dataclass(frozen=True, slots=True)
+class EDVieScolaireElement(EDRecord):
+    """Absence, retard, sanction or encouragement."""
+
+    date: str
+    type_element: str
+    display_date: str
+    justifie: bool
+    motif: str
+    libelle: str
+    commentaire: str
+
+
+@dataclass(frozen=True, slots=True)
+class EDClasse(EDRecord):
+    """Class of a professor account, with the sections of its vie de la classe."""
+
+    classe_id: str
+    code: str
+    libelle: str
+    rubriques: list[str]
+    modifie_le: datetime
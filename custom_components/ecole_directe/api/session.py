@@ -0,0 +1,270 @@
+"""
+Long-lived Ecole Directe session for ecole_directe.
+
+The ecoledirecte_api library retries a request once when Ecole Directe rejects
+the token, calling ``freshlogin()`` on the client before the retry. This module
+provides the client subclass implementing that hook so a single session can be
+kept alive across coordinator refresh cycles.
+
+The library also opens a new HTTP session, with its own connection pool, on
+every login. The sessions of all config entries rather share one pooled
+connector here, keeping connections alive and DNS lookups cached between
+cycles and logins. Each client still has its own HTTP session, as the token
+and cookies of an account are set on it.
+"""
+
+from __future__ import annotations
+
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import ClientSession, TCPConnector
+from ecoledirecte_api.client import EDClient
+from ecoledirecte_api.const import APIVERSION
+from ecoledirecte_api.exceptions import LoginException
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import callback
+from homeassistant.util.hass_dict import HassKey
+from homeassistant.util.ssl import client_context
+
+from ..const import (
+    DOMAIN,
+    HTTP_CONNECTOR_LIMIT,
+    HTTP_CONNECTOR_LIMIT_PER_HOST,
+    HTTP_DNS_CACHE_TTL,
+    HTTP_KEEPALIVE_TIMEOUT,
+    LOGGER,
+)
+from .codec import json_loads
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from aiohttp import BaseConnector
+    from homeassistant.core import Event, HomeAssistant
+
+# Headers sent by the library with its own HTTP sessions
+ED_SESSION_HEADERS: dict[str, str] = {
+    "accept": "application/json, text/plain, */*",
+    "accept-encoding": "gzip, deflate, br, zstd",
+    "accept-language": "fr-FR,fr;q=0.9",
+    "connection": "keep-alive",
+    "content-type": "application/x-www-form-urlencoded",
+    "dnt": "1",
+    "origin": "https://www.ecoledirecte.com",
+    "priority": "1",
+    "referer": "https://www.ecoledirecte.com/",
+    "sec-ch-ua": ('"Chromium";v="134", "Not:A-Brand";v="24", "Google Chrome";v="134"'),
+    "sec-ch-ua-mobile": "?0",
+    "sec-ch-ua-platform": '"Windows"',
+    "sec-fetch-dest": "",
+    "sec-fetch-mode": "cors",
+    "sec-fetch-site": "same-site",
+    "user-agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3"
+    ),
+}
+
+
+# Token sent with the request of the current task, to tell a rejected token
+# from one already renewed by another request since
+SENT_TOKEN: ContextVar[str | None] = ContextVar(
+    "ecole_directe_sent_token", default=None
+)
+
+
+class EDSessionClient(EDClient):
+    """EDClient re-authenticating through its owner when the token is rejected."""
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        qcm_json: dict,
+        on_token_rejected: Callable[[], Awaitable[None]],
+        connector: BaseConnector | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Initialize the client.
+
+        Args:
+            username: The Ecole Directe username.
+            password: The Ecole Directe password.
+            qcm_json: The known QCM answers.
+            on_token_rejected: The callback used to renew the token.
+            connector: The shared connection pool, the library creates one
+                per login without it.
+            **kwargs: The other arguments of EDClient.
+
+        """
+        super().__init__(username, password, qcm_json, **kwargs)
+        self._on_token_rejected = on_token_rejected
+        self._connector = connector
+
+    async def freshlogin(self) -> None:
+        """Renew the token, called by the library backoff handlers."""
+        await self._on_token_rejected()
+
+    async def get_received_messages(
+        self,
+        family_id: str | None,
+        eleve_id: str | None,
+        annee_scolaire: str,
+        page: int = 0,
+        items_per_page: int = 100,
+    ) -> Any:
+        """Get a page of received messages, the most recent first."""
+        path = (
+            f"/familles/{family_id}/messages.awp"
+            if eleve_id is None
+            else f"/eleves/{eleve_id}/messages.awp"
+        )
+        return await self._post(
+            path,
+            {
+                "force": "false",
+                "typeRecuperation": "received",
+                "idClasseur": "0",
+                "orderBy": "date",
+                "order": "desc",
+                "query": "",
+                "onlyRead": "",
+                "page": str(page),
+                "itemsPerPage": str(items_per_page),
+                "getAll": "0",
+                "verbe": "get",
+                "v": APIVERSION,
+            },
+            'data={"anneeMessages":"' + annee_scolaire + '"}',
+        )
+
+    async def get_classe(self, classe_id: str) -> Any:
+        """
+        Get the vie de la classe of a class.
+
+        The library method does not await its requests: it posts to the
+        /Classes/ route, then to the /R/ one, and only logs both answers.
+        The /R/ route is kept as a fallback, asked when /Classes/ has no data.
+        """
+        params = {"verbe": "get", "v": APIVERSION}
+        json_resp = await self._post(
+            f"/Classes/{classe_id}/viedelaclasse.awp", params, "data={}"
+        )
+        if isinstance(json_resp, dict) and json_resp.get("data"):
+            return json_resp
+        return await self._post(f"/R/{classe_id}/viedelaclasse.awp", params, "data={}")
+
+    async def renew_token(self, target_id_login: int) -> Any:
+        """
+        Switch the token to an account, without retry nor relogin.
+
+        Used while the token is renewed: the backoff handlers of the library
+        switch_account would renew it again from there.
+        """
+        response = await self._session.post(
+            url=f"{self.server_endpoint}/renewtoken.awp",
+            params={"verbe": "post", "v": APIVERSION},
+            data=f'data={{"idUser": {target_id_login}, "uuid": ""}}',
+        )
+        json_resp = await response.json(content_type=None, loads=json_loads)
+        if "x-token" in response.headers:
+            self.token = response.headers["x-token"]
+            self._session.headers.update({"x-token": self.token})
+        return json_resp
+
+    async def _post(self, path: str, params: dict[str, str], payload: str) -> Any:
+        """Post a request, renewing the token once if it is rejected."""
+        for attempt in range(2):
+            if self._session is None:
+                await self.login()
+            SENT_TOKEN.set(self.token)
+            response = await self._session.post(
+                url=f"{self.server_endpoint}{path}", params=params, data=payload
+            )
+            try:
+                await self.check_response(response, path, params, payload)
+            except LoginException:
+                if attempt:
+                    raise
+                # As the backoff handlers of the library methods do
+                await self.freshlogin()
+                continue
+            return await response.json(content_type=None, loads=json_loads)
+        return None
+
+    def __get_new_client__(self) -> None:
+        """Create the HTTP session of a login, on the shared connector."""
+        if self._connector is None or self._connector.closed:
+            super().__get_new_client__()
+            return
+        self._session = ClientSession(
+            headers=ED_SESSION_HEADERS,
+            cookie_jar=self.cookie_jar,
+            connector=self._connector,
+            # Closing the session leaves the shared pool open
+            connector_owner=False,
+            trust_env=False,
+        )
+        if self.token is not None:
+            self._session.headers.update({"x-token": self.token})
+
+
+class EDConnectorPool:
+    """TCP connector shared by the loaded config entries."""
+
+    def __init__(self) -> None:
+        """Initialize the pool, the connector is created on first use."""
+        self.connector: TCPConnector | None = None
+        self.users = 0
+
+    def acquire(self) -> TCPConnector:
+        """Return the connector, created if no entry uses it yet."""
+        if self.connector is None or self.connector.closed:
+            self.connector = TCPConnector(
+                limit=HTTP_CONNECTOR_LIMIT,
+                limit_per_host=HTTP_CONNECTOR_LIMIT_PER_HOST,
+                ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+                keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+                ssl=client_context(),
+            )
+        self.users += 1
+        return self.connector
+
+    async def async_release(self) -> None:
+        """Release the connector, closed once no entry uses it anymore."""
+        self.users = max(0, self.users - 1)
+        if self.users == 0:
+            await self.async_close()
+
+    async def async_close(self) -> None:
+        """Close the connector and its connections."""
+        if self.connector is not None:
+            await self.connector.close()
+            self.connector = None
+            LOGGER.debug("Closed the shared HTTP connector")
+
+
+DATA_CONNECTOR_POOL: HassKey[EDConnectorPool] = HassKey(f"{DOMAIN}_connector_pool")
+
+
+@callback
+def async_acquire_connector(hass: HomeAssistant) -> TCPConnector:
+    """Return the shared connector, to release when the entry unloads."""
+    pool = hass.data.get(DATA_CONNECTOR_POOL)
+    if pool is None:
+        pool = hass.data[DATA_CONNECTOR_POOL] = EDConnectorPool()
+
+        async def _async_close_pool(_event: Event) -> None:
+            await pool.async_close()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_pool)
+    return pool.acquire()
+
+
+async def async_release_connector(hass: HomeAssistant) -> None:
+    """Release the shared connector of an unloaded entry."""
+    pool = hass.data.get(DATA_CONNECTOR_POOL)
+    if pool is not None:
+        await pool.async_release()
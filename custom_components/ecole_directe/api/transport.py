@@ -0,0 +1,136 @@
+"""
+Transports carrying the Ecole Directe requests of ecole_directe.
+
+Every request of EDApiClient goes through a transport, under a key naming the
+endpoint and child (the debug dump names, such as ``1234_get_homeworks``):
+
+- live: requests are sent to Ecole Directe
+- record: requests are sent to Ecole Directe and the responses kept, to be
+  written as fixtures when the client is closed
+- replay: responses are served from fixtures loaded in memory, after an
+  optional artificial latency, without any network access
+
+Replaying the fixtures of a recorded session makes a whole coordinator cycle
+deterministic, to benchmark and profile it on a machine with no network.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from ..const import LOGGER, TRANSPORT_MODE_RECORD, TRANSPORT_MODE_REPLAY
+from .codec import json_dumps, json_loads
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from homeassistant.core import HomeAssistant
+
+
+class EDTransport:
+    """Live transport, sending every request to Ecole Directe."""
+
+    # True when no request reaches Ecole Directe
+    offline = False
+
+    async def call(
+        self,
+        key: str,  # noqa: ARG002
+        fetch: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Return the response of a request, fetch sending it to Ecole Directe."""
+        return await fetch()
+
+    async def async_close(self) -> None:
+        """Release the transport once the client is closed."""
+
+
+class EDRecordTransport(EDTransport):
+    """Live transport keeping the last response of every request."""
+
+    def __init__(self, hass: HomeAssistant, folder: str) -> None:
+        """Initialize the transport, fixtures are written to folder on close."""
+        self.hass = hass
+        self.folder = Path(folder)
+        self.responses: dict[str, bytes] = {}
+
+    async def call(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Send the request and record its response."""
+        response = await fetch()
+        # Serialized right away: the API client sorts some payloads in place
+        self.responses[key] = json_dumps(response)
+        return response
+
+    async def async_close(self) -> None:
+        """Write the recorded responses as fixtures."""
+        await self.hass.async_add_executor_job(self._write)
+        LOGGER.info("Recorded %s responses to %s", len(self.responses), self.folder)
+
+    def _write(self) -> None:
+        """Write one fixture file per request key."""
+        self.folder.mkdir(parents=True, exist_ok=True)
+        for key, response in self.responses.items():
+            (self.folder / f"{key}.json").write_bytes(response)
+
+
+class EDReplayTransport(EDTransport):
+    """Offline transport serving in-memory responses."""
+
+    offline = True
+
+    def __init__(self, responses: dict[str, Any], latency: float = 0.0) -> None:
+        """
+        Initialize the transport.
+
+        Args:
+            responses: The response of each request, by request key.
+            latency: The delay before each response, in seconds.
+
+        """
+        self.latency = latency
+        self.calls: dict[str, int] = {}
+        # Kept serialized so every call gets its own copy, as from the network
+        self._responses = {
+            key: response if isinstance(response, str | bytes) else json_dumps(response)
+            for key, response in responses.items()
+        }
+
+    @classmethod
+    async def async_from_folder(
+        cls, hass: HomeAssistant, folder: str, latency: float = 0.0
+    ) -> EDReplayTransport:
+        """Load the fixtures of a folder, as written by EDRecordTransport."""
+
+        def load() -> dict[str, Any]:
+            return {
+                path.stem: path.read_bytes() for path in Path(folder).glob("*.json")
+            }
+
+        return cls(await hass.async_add_executor_job(load), latency)
+
+    async def call(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],  # noqa: ARG002
+    ) -> Any:
+        """Return the fixture of the request, or an Ecole Directe error."""
+        self.calls[key] = self.calls.get(key, 0) + 1
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+        response = self._responses.get(key)
+        if response is None:
+            return {"code": 404, "message": f"No fixture for {key}"}
+        return json_loads(response)
+
+
+async def async_create_transport(
+    hass: HomeAssistant, mode: str, folder: str, latency: float = 0.0
+) -> EDTransport:
+    """Create the transport of a mode, fixtures being read from or written to folder."""
+    if mode == TRANSPORT_MODE_REPLAY:
+        return await EDReplayTransport.async_from_folder(hass, folder, latency)
+    if mode == TRANSPORT_MODE_RECORD:
+        return EDRecordTransport(hass, folder)
+    return EDTransport()
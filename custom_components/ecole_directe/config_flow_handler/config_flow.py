@@ -12,7 +12,6 @@
 
 from __future__ import annotations
 
-import json
 from typing import Any
 
 import anyio
@@ -21,6 +20,7 @@
 from homeassistant.exceptions import HomeAssistantError
 from slugify import slugify
 
+from custom_components.ecole_directe.api.codec import json_dumps
 from custom_components.ecole_directe.const import DOMAIN, LOGGER
 
 from .options_flow import (
@@ -84,8 +84,8 @@ async def async_step_user(
             try:
                 path = self.hass.config.config_dir + "/" + user_input["qcm_filename"]
                 if not await anyio.Path(path).is_file():
-                    async with await anyio.open_file(path, "w", encoding="utf-8") as f:
-                        await f.write(json.dumps({}, indent=4, ensure_ascii=False))
+                    async with await anyio.open_file(path, "wb") as f:
+                        await f.write(json_dumps({}, indent=True))
 
                 await validate_credentials(
                     self.hass,
@@ -20,6 +20,9 @@
 from custom_components.ecole_directe.const import (
     DEFAULT_ENABLE_DEBUGGING,
     DEFAULT_LUNCH_BREAK_TIME,
+    DEFAULT_MESSAGERIE_COUNTS_ONLY,
+    DEFAULT_MODULE_REFRESH_INTERVALS,
+    DEFAULT_PARALLEL_ACCOUNTS,
     DEFAULT_REFRESH_INTERVAL,
     GRADES_TO_DISPLAY,
 )
@@ -41,6 +44,22 @@ def get_options_schema(defaults: Mapping[str, Any] | None = None) -> vol.Schema:
     """
     defaults = defaults or {}
 
+    module_intervals = {
+        vol.Optional(
+            f"refresh_interval_{module}",
+            default=defaults.get(f"refresh_interval_{module}", minutes),
+        ): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=5,
+                max=10080,
+                step=5,
+                unit_of_measurement="minutes",
+                mode=selector.NumberSelectorMode.BOX,
+            ),
+        )
+        for module, minutes in DEFAULT_MODULE_REFRESH_INTERVALS.items()
+    }
+
     return vol.Schema(
         {
             vol.Optional(
@@ -55,6 +74,7 @@ def get_options_schema(defaults: Mapping[str, Any] | None = None) -> vol.Schema:
                     mode=selector.NumberSelectorMode.BOX,
                 ),
             ),
+            **module_intervals,
             vol.Optional(
                 "lunch_break_time",
                 default=defaults.get("lunch_break_time", DEFAULT_LUNCH_BREAK_TIME),
@@ -67,6 +87,16 @@ def get_options_schema(defaults: Mapping[str, Any] | None = None) -> vol.Schema:
                 "notes_affichees",
                 default=defaults.get("notes_affichees", GRADES_TO_DISPLAY),
             ): int,
+            vol.Optional(
+                "parallel_accounts",
+                default=defaults.get("parallel_accounts", DEFAULT_PARALLEL_ACCOUNTS),
+            ): bool,
+            vol.Optional(
+                "messagerie_counts_only",
+                default=defaults.get(
+                    "messagerie_counts_only", DEFAULT_MESSAGERIE_COUNTS_ONLY
+                ),
+            ): bool,
             vol.Optional(
                 "enable_debugging",
                 default=defaults.get("enable_debugging", DEFAULT_ENABLE_DEBUGGING),
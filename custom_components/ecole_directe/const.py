@@ -1,6 +1,7 @@
 """Constants for the Ecole Directe integration."""
 
 import json
+from datetime import timedelta
 from logging import Logger, getLogger
 from pathlib import Path
 from typing import Final
@@ -19,16 +20,79 @@
 
 # default values for options
 DEFAULT_REFRESH_INTERVAL: Final[int] = 30
+# refresh interval of each module, in minutes
+DEFAULT_MODULE_REFRESH_INTERVALS: Final[dict[str, int]] = {
+    "homeworks": 30,
+    "grades": 30,
+    "vie_scolaire": 60,
+    "messagerie": 30,
+    "lessons": 120,
+    "formulaires": 720,
+    "wallets": 360,
+    "classes": 1440,
+}
+CADENCE_TOLERANCE: Final[timedelta] = timedelta(minutes=1)
 GRADES_TO_DISPLAY: Final[int] = 15
+# grades of every child kept in a store, read by windows
+GRADE_HISTORY_STORAGE_VERSION: Final[int] = 1
+GRADE_HISTORY_SAVE_DELAY: Final[int] = 30
+GRADE_HISTORY_MAX_WINDOW: Final[int] = 200
 VIE_SCOLAIRE_TO_DISPLAY: Final[int] = 10
 HOMEWORK_DESC_MAX_LENGTH: Final[int] = 125
+HOMEWORKS_MAX_CONCURRENT_DATES: Final[int] = 4
+HOMEWORKS_ALWAYS_REFRESH_DAYS: Final[int] = 1
+HOMEWORKS_ALWAYS_REFRESH_LOOKBACK_DAYS: Final[int] = 1
+HOMEWORK_CONTENT_CACHE_MAX_BYTES: Final[int] = 4 * 1024 * 1024
+# received messages read per page, on the first sync of a mailbox and then
+MESSAGES_FIRST_PAGE_SIZE: Final[int] = 100
+MESSAGES_PAGE_SIZE: Final[int] = 10
+MESSAGES_MAX_PAGES: Final[int] = 5
+# counts-only mode: smallest page, child mailboxes matching the family skipped
+DEFAULT_MESSAGERIE_COUNTS_ONLY: Final[bool] = False
+MESSAGES_COUNTS_PAGE_SIZE: Final[int] = 1
+MESSAGES_MIRROR_MAX_SKIPS: Final[int] = 3
+# message IDs remembered, to notify a message once across the mailboxes
+MESSAGES_NOTIFIED_MAX: Final[int] = 500
 DEFAULT_ALLOW_NOTIFICATION: Final[bool] = False
 DEFAULT_LUNCH_BREAK_TIME: Final[str] = "13:00"
 MAX_STATE_ATTRS_BYTES: Final[int] = 16384
 AUGUST: Final[int] = 8
 
 DEFAULT_ENABLE_DEBUGGING: Final[bool] = False
-FAKE_ON: Final[bool] = False
+DUMP_COMPRESS: Final[bool] = True
+DUMP_QUEUE_SIZE: Final[int] = 100
+DUMP_ROTATE_COUNT: Final[int] = 3
+DUMP_RETENTION_DAYS: Final[int] = 7
+# seconds between two purges of the dumps older than the retention
+DUMP_PURGE_INTERVAL: Final[int] = 3600
+DEFAULT_PARALLEL_ACCOUNTS: Final[bool] = False
+# connection pool shared by the Ecole Directe sessions of every entry
+HTTP_CONNECTOR_LIMIT: Final[int] = 20
+HTTP_CONNECTOR_LIMIT_PER_HOST: Final[int] = 8
+HTTP_DNS_CACHE_TTL: Final[int] = 300
+HTTP_KEEPALIVE_TIMEOUT: Final[float] = 30.0
+# adaptive limit on the requests in flight of a session (AIMD)
+LIMITER_INITIAL_WINDOW: Final[float] = 4.0
+LIMITER_MIN_WINDOW: Final[float] = 1.0
+LIMITER_MAX_WINDOW: Final[float] = 16.0
+LIMITER_DECREASE_FACTOR: Final[float] = 0.5
+# seconds, a slower response is handled as an overload
+LIMITER_SLOW_RESPONSE: Final[float] = 5.0
+# retries of transient errors, with jittered exponential backoff (seconds)
+RETRY_MAX_ATTEMPTS: Final[int] = 3
+RETRY_BASE_DELAY: Final[float] = 1.0
+RETRY_MAX_DELAY: Final[float] = 10.0
+# circuit breaker of each endpoint
+CIRCUIT_FAILURE_THRESHOLD: Final[int] = 3
+CIRCUIT_RESET_TIMEOUT: Final[timedelta] = timedelta(minutes=10)
+CIRCUIT_MAX_RESET_TIMEOUT: Final[timedelta] = timedelta(hours=6)
+# live, record (responses written to the test folder on unload) or replay
+# (responses served from the test folder, without network access)
+TRANSPORT_MODE_LIVE: Final[str] = "live"
+TRANSPORT_MODE_RECORD: Final[str] = "record"
+TRANSPORT_MODE_REPLAY: Final[str] = "replay"
+TRANSPORT_MODE: Final[str] = TRANSPORT_MODE_LIVE
+TRANSPORT_REPLAY_LATENCY: Final[float] = 0.0
 
 # Lire la version depuis manifest.json
 MANIFEST_PATH: Final[Path] = Path(__file__).parent / "manifest.json"
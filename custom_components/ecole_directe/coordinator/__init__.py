@@ -8,6 +8,7 @@
 - base.py: Main coordinator class (EDDataUpdateCoordinator)
 - data_processing.py: Data validation, transformation, and caching utilities
 - error_handling.py: Error recovery strategies and retry logic
+- grade_history.py: Grades of every child kept across periods and years
 - listeners.py: Event listeners and entity callbacks
 
 For more information on coordinators:
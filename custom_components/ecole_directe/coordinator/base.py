@@ -11,10 +11,12 @@
 
 from __future__ import annotations
 
+import asyncio
 from datetime import date, datetime, timedelta, tzinfo
 from typing import TYPE_CHECKING, Any
 
 from ecoledirecte_api.client import QCMException
+from ecoledirecte_api.exceptions import LoginException
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.update_coordinator import (
     TimestampDataUpdateCoordinator,
@@ -25,26 +27,50 @@
 from custom_components.ecole_directe.api import (
     EDApiClientAuthenticationError,
     EDApiClientError,
+    EDRecord,
+)
+from custom_components.ecole_directe.api.messagerie import (
+    EDNotifiedMessages,
+    message_event_data,
 )
-from custom_components.ecole_directe.api.client import EDApiClient
 from custom_components.ecole_directe.const import (
     AUGUST,
     DEFAULT_LUNCH_BREAK_TIME,
+    DEFAULT_MESSAGERIE_COUNTS_ONLY,
+    DEFAULT_MODULE_REFRESH_INTERVALS,
+    DEFAULT_PARALLEL_ACCOUNTS,
     EVENT_TYPE,
-    FAKE_ON,
     GRADES_TO_DISPLAY,
     LOGGER,
 )
-from custom_components.ecole_directe.helpers import get_unique_id
+from custom_components.ecole_directe.helpers import get_unique_id, parse_time_of_day
+
+from .data_processing import EDRefreshWindow
+from .error_handling import (
+    EDCircuitBreaker,
+    EDCircuitOpenError,
+    async_call_with_retry,
+    handle_partial_data,
+)
+from .grade_history import EDGradeHistory
+from .scheduling import EDCadenceScheduler, plan_account_batches
 
 if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
     from logging import Logger
 
     from homeassistant.core import HomeAssistant
 
-    from custom_components.ecole_directe.api.client import EDEleve
+    from custom_components.ecole_directe.api.client import EDApiClient, EDEleve
     from custom_components.ecole_directe.data import EDConfigEntry
 
+# Errors of the session or of the cycle, not counted against the endpoint
+NOT_ENDPOINT_ERRORS = (
+    EDApiClientAuthenticationError,
+    LoginException,
+    asyncio.CancelledError,
+)
+
 
 class EDDataUpdateCoordinator(TimestampDataUpdateCoordinator):
     """
@@ -87,6 +113,21 @@ def __init__(
             always_update=False,
         )
         self.timezone = dt_util.get_default_time_zone()
+        self.cadence = EDCadenceScheduler(
+            {
+                module: timedelta(
+                    minutes=entry.options.get(f"refresh_interval_{module}", minutes)
+                )
+                for module, minutes in DEFAULT_MODULE_REFRESH_INTERVALS.items()
+            }
+        )
+        # Circuit breaker of each scope, an endpoint called for a child
+        self.circuits: dict[str, EDCircuitBreaker] = {}
+        self.grade_history = EDGradeHistory(hass, entry.entry_id)
+        # Errors of the scopes failed during the current cycle
+        self.cycle_errors: list[Exception] = []
+        # Shared by the family mailbox and the mailboxes of the children
+        self.notified_messages = EDNotifiedMessages()
         LOGGER.debug("timezone: %s", self.timezone)
 
     async def _async_setup(self) -> None:
@@ -106,6 +147,7 @@ async def _async_setup(self) -> None:
         device_info = await self.config_entry.runtime_data.client.get_device_info()
         self._device_id = device_info["id"]
         """
+        await self.grade_history.async_load()
         LOGGER.debug("Coordinator setup complete for %s", self.config_entry.entry_id)
 
     async def _async_update_data(self) -> Any:
@@ -120,9 +162,19 @@ async def _async_update_data(self) -> Any:
         This allows optimizing API calls to only fetch data that's actually needed.
         For example, if only sensor entities are enabled, we can skip fetching switch data.
 
-        The API client uses the credentials from config_entry to authenticate:
-        - username: from config_entry.data["username"]
-        - password: from config_entry.data["password"]
+        The API client is the long-lived session stored in runtime_data. It only
+        logs in when it holds no token yet; once logged in, its token and cookie
+        jar are reused across cycles and renewed when Ecole Directe rejects them.
+
+        The cycle runs as a task graph: children are grouped by account and the
+        modules of every child of an account are fetched concurrently, together
+        with the family-level requests for the main account. Each account is
+        switched to at most once, or gets its own session with the
+        parallel_accounts option so that accounts are fetched concurrently.
+
+        Each module has its own refresh interval: a module that is not due
+        reuses the result of its last fetch, which is then distributed to the
+        sensors as if it had just been fetched.
 
         Expected API response structure (example):
         {
@@ -145,440 +197,91 @@ async def _async_update_data(self) -> Any:
 
         """
         try:
-            if FAKE_ON:
-                LOGGER.info("DEBUG MODE ON")
-
             previous_data = None if self.data is None else self.data.copy()
 
-            async with EDApiClient(
-                self.config_entry.data["username"],
-                self.config_entry.data["password"],
-                self.hass.config.config_dir
-                + "/"
-                + self.config_entry.data["qcm_filename"],
-                self.hass,
-            ) as client:
-                try:
-                    await client.login()
-                except QCMException:
-                    LOGGER.exception("Unable to init ecole directe client")
-                    return None
-                except Exception:
-                    LOGGER.critical("Unknow error on login")
-                    return None
-
-                self.data = {}
-                self.data["session"] = client
-
-                current_year = datetime.now(self.timezone).year
-                if datetime.now(self.timezone).month >= AUGUST:
-                    year_data = f"{current_year!s}-{(current_year + 1)!s}"
-                else:
-                    year_data = f"{(current_year - 1)!s}-{current_year!s}"
-
-                # EDT BODY
-                today = datetime.now(self.timezone).date()
-                tomorrow = datetime.now(self.timezone).date() + timedelta(days=1)
-
-                current_week_begin = datetime.now(self.timezone).date() - timedelta(
-                    days=datetime.now(self.timezone).weekday()
-                )
-
-                current_week_plus_21 = current_week_begin + timedelta(days=21)
-                current_week_end = current_week_begin + timedelta(days=6)
-                next_week_begin = current_week_end + timedelta(days=1)
-                next_week_end = next_week_begin + timedelta(days=6)
-                after_next_week_begin = next_week_end + timedelta(days=1)
-
-                if client.account_type == "P":  # professor ???
-                    try:
-                        for classe in client.data["accounts"][0]["profile"]["classes"]:
-                            await client.get_classe(
-                                classe["id"],
-                            )
-                    except Exception:
-                        LOGGER.exception("Error getting classes")
-
-                if client.account_type == "1":  # famille
-                    if "MESSAGERIE" in client.modules:
-                        try:
-                            self.data["messagerie"] = await client.get_messages(
-                                client.id,
-                                None,
-                                year_data,
-                            )
-
-                        except Exception:
-                            LOGGER.exception(
-                                "Error getting messages for family from ecole directe"
-                            )
-
-                    if FAKE_ON or "EDFORMS" in client.modules:
-                        try:
-                            self.data["formulaires"] = await client.get_formulaires(
-                                client.account_type,
-                                client.id,
-                            )
-                            self.compare_data(
-                                previous_data,
-                                "formulaires",
-                                ["created", "titre"],
-                                "new_formulaire",
-                                None,
-                            )
-                        except Exception:
-                            LOGGER.exception(
-                                "Error getting formulaires from ecole directe"
-                            )
+            client = self.config_entry.runtime_data.client
+            try:
+                await client.async_ensure_logged_in()
+            except QCMException:
+                LOGGER.exception("Unable to init ecole directe client")
+                return None
+            except Exception:
+                LOGGER.critical("Unknow error on login")
+                return None
+
+            self.data = {}
+            self.data["session"] = client
+            self.cycle_errors = []
+
+            current_year = datetime.now(self.timezone).year
+            if datetime.now(self.timezone).month >= AUGUST:
+                year_data = f"{current_year!s}-{(current_year + 1)!s}"
+            else:
+                year_data = f"{(current_year - 1)!s}-{current_year!s}"
+
+            window = EDRefreshWindow.from_today(datetime.now(self.timezone).date())
+
+            # Each account is switched to at most once per cycle. With
+            # parallel_accounts, every linked account gets its own session
+            # and the accounts are fetched concurrently instead.
+            batches = plan_account_batches(
+                client.eleves, client.id_login, client.current_account_id_login
+            )
+            parallel = self.config_entry.options.get(
+                "parallel_accounts", DEFAULT_PARALLEL_ACCOUNTS
+            )
+            all_balances: dict | None = None
 
-                # START: MODIFIED FOR WALLET BALANCE (SINGLE CALL)
-                all_balances = None
+            async def fetch_account(
+                account_id_login: int, eleves: list[EDEleve]
+            ) -> None:
+                nonlocal all_balances
                 try:
-                    all_balances = await client.get_all_wallet_balances()
-                    if all_balances and f"{client.id}" in all_balances:
-                        self.data["wallets"] = all_balances[f"{client.id}"]
-                except Exception:
+                    if parallel:
+                        session = await client.async_get_account_client(
+                            account_id_login
+                        )
+                    else:
+                        await client.switch_account(account_id_login)
+                        session = client
+                except Exception as exception:
+                    self.cycle_errors.append(exception)
                     LOGGER.exception(
-                        "Error getting all wallet balances from ecole directe"
+                        "Error switching account for %s",
+                        ", ".join(eleve.get_fullname() for eleve in eleves),
                     )
-                # END: MODIFIED FOR WALLET BALANCE (SINGLE CALL)
-
+                    return
+
+                wallets = None
+                async with asyncio.TaskGroup() as tg:
+                    if account_id_login == client.id_login:
+                        wallets = tg.create_task(self._async_fetch_wallets(client))
+                        self._create_family_tasks(tg, client, year_data, previous_data)
+                    for eleve in eleves:
+                        tg.create_task(
+                            self._async_fetch_eleve(
+                                session, eleve, year_data, window, previous_data
+                            )
+                        )
+                if wallets is not None:
+                    all_balances = wallets.result()
+
+            if parallel:
+                async with asyncio.TaskGroup() as tg:
+                    for account_id_login, eleves in batches.items():
+                        tg.create_task(fetch_account(account_id_login, eleves))
+            else:
+                for account_id_login, eleves in batches.items():
+                    await fetch_account(account_id_login, eleves)
+
+            # START: DISTRIBUTE WALLET BALANCE DATA
+            if all_balances:
                 for eleve in client.eleves:
-                    # Switch account context if this child belongs to a different account
-                    if eleve.account_id_login is not None:
-                        try:
-                            await client.switch_account(eleve.account_id_login)
-                        except Exception:
-                            LOGGER.exception(
-                                "Error switching account for %s",
-                                eleve.get_fullname(),
-                            )
-                            continue
-
-                    # START: DISTRIBUTE WALLET BALANCE DATA
-                    if all_balances and eleve.eleve_id in all_balances:
+                    if eleve.eleve_id in all_balances:
                         wallets_key = f"{eleve.get_fullname_lower()}_wallets"
                         self.data[wallets_key] = all_balances[eleve.eleve_id]
-                    # END: DISTRIBUTE WALLET BALANCE DATA
-
-                    if FAKE_ON or "CAHIER_DE_TEXTES" in eleve.modules:
-                        try:
-                            homeworks = await client.get_homeworks(
-                                eleve,
-                                self.config_entry.options.get("decode_html", False),
-                            )
-
-                            self.data[f"{eleve.get_fullname_lower()}_homeworks"] = (
-                                homeworks
-                            )
-
-                            self.compare_data(
-                                previous_data,
-                                f"{eleve.get_fullname_lower()}_homeworks",
-                                ["date", "matiere", "short_description"],
-                                "new_devoir",
-                                eleve,
-                            )
-
-                            self.data[
-                                f"{eleve.get_fullname_lower()}_homeworks_today"
-                            ] = list(
-                                filter(
-                                    lambda homework: (
-                                        homework["date"]
-                                        .astimezone(self.timezone)
-                                        .date()
-                                        == today
-                                    ),
-                                    homeworks,
-                                )
-                            )
-                            homeworks_tomorrow = list(
-                                filter(
-                                    lambda homework: (
-                                        homework["date"]
-                                        .astimezone(self.timezone)
-                                        .date()
-                                        == tomorrow
-                                    ),
-                                    homeworks,
-                                )
-                            )
-                            self.data[
-                                f"{eleve.get_fullname_lower()}_homeworks_tomorrow"
-                            ] = homeworks_tomorrow
-                            self.data[
-                                f"{eleve.get_fullname_lower()}_homeworks_next_day"
-                            ] = get_next_day_list(
-                                homeworks,
-                                homeworks_tomorrow,
-                                tomorrow,
-                                "date",
-                            )
-
-                            self.data[f"{eleve.get_fullname_lower()}_homeworks_1"] = (
-                                list(
-                                    filter(
-                                        lambda homework: (
-                                            homework["date"]
-                                            .astimezone(self.timezone)
-                                            .date()
-                                            >= current_week_begin
-                                            and homework["date"]
-                                            .astimezone(self.timezone)
-                                            .date()
-                                            <= current_week_end
-                                        ),
-                                        homeworks,
-                                    )
-                                )
-                            )
-                            self.data[f"{eleve.get_fullname_lower()}_homeworks_2"] = (
-                                list(
-                                    filter(
-                                        lambda homework: (
-                                            homework["date"]
-                                            .astimezone(self.timezone)
-                                            .date()
-                                            >= next_week_begin
-                                            and homework["date"]
-                                            .astimezone(self.timezone)
-                                            .date()
-                                            <= next_week_end
-                                        ),
-                                        homeworks,
-                                    )
-                                )
-                            )
-                            self.data[f"{eleve.get_fullname_lower()}_homeworks_3"] = (
-                                list(
-                                    filter(
-                                        lambda homework: (
-                                            homework["date"]
-                                            .astimezone(self.timezone)
-                                            .date()
-                                            >= after_next_week_begin
-                                        ),
-                                        homeworks,
-                                    )
-                                )
-                            )
-
-                        except Exception:
-                            LOGGER.exception(
-                                "Error getting homeworks from ecole directe"
-                            )
-                    if FAKE_ON or "NOTES" in eleve.modules:
-                        try:
-                            grades_evaluations = await client.get_grades_evaluations(
-                                eleve,
-                                year_data,
-                                self.config_entry.options.get(
-                                    "notes_affichees", GRADES_TO_DISPLAY
-                                ),
-                            )
-                            if "disciplines" in grades_evaluations:
-                                disciplines = grades_evaluations["disciplines"]
-                                self.data[
-                                    f"{eleve.get_fullname_lower()}_disciplines"
-                                ] = disciplines
-                                for discipline in disciplines:
-                                    self.data[
-                                        f"{eleve.get_fullname_lower()}_{get_unique_id(discipline['nom'])}"
-                                    ] = discipline
-
-                            if "moyenne_generale" in grades_evaluations:
-                                self.data[
-                                    f"{eleve.get_fullname_lower()}_moyenne_generale"
-                                ] = grades_evaluations["moyenne_generale"]
-
-                            self.data[f"{eleve.get_fullname_lower()}_notes"] = (
-                                grades_evaluations["notes"]
-                            )
-                            self.compare_data(
-                                previous_data,
-                                f"{eleve.get_fullname_lower()}_notes",
-                                ["date", "matiere", "commentaire"],
-                                "new_note",
-                                eleve,
-                            )
-
-                            self.data[f"{eleve.get_fullname_lower()}_evaluations"] = (
-                                grades_evaluations["evaluations"]
-                            )
-                            self.compare_data(
-                                previous_data,
-                                f"{eleve.get_fullname_lower()}_evaluations",
-                                ["date", "matiere", "devoir"],
-                                "new_evaluation",
-                                eleve,
-                            )
-                        except Exception:
-                            LOGGER.exception("Error getting grades from ecole directe")
-
-                    if FAKE_ON or "EDT" in eleve.modules:
-                        try:
-                            break_time = self.config_entry.options.get(
-                                "lunch_break_time", DEFAULT_LUNCH_BREAK_TIME
-                            )
-                            lunch_break_time = datetime.strptime(
-                                break_time,
-                                "%H:%M",
-                            ).time()
-
-                            lessons = await client.get_lessons(
-                                eleve,
-                                today.strftime("%Y-%m-%d"),
-                                current_week_plus_21.strftime("%Y-%m-%d"),
-                                lunch_break_time,
-                            )
-                            self.data[
-                                f"{eleve.get_fullname_lower()}_timetable_today"
-                            ] = list(
-                                filter(
-                                    lambda lesson: (
-                                        lesson["start"].astimezone(self.timezone).date()
-                                        == today
-                                    ),
-                                    lessons,
-                                )
-                            )
-                            lessons_tomorrow = list(
-                                filter(
-                                    lambda lesson: (
-                                        lesson["start"].astimezone(self.timezone).date()
-                                        == tomorrow
-                                    ),
-                                    lessons,
-                                )
-                            )
-                            self.data[
-                                f"{eleve.get_fullname_lower()}_timetable_tomorrow"
-                            ] = lessons_tomorrow
-                            self.data[
-                                f"{eleve.get_fullname_lower()}_timetable_next_day"
-                            ] = get_next_day_list(
-                                lessons,
-                                lessons_tomorrow,
-                                tomorrow,
-                                "start",
-                            )
-                            self.data[f"{eleve.get_fullname_lower()}_timetable_1"] = (
-                                list(
-                                    filter(
-                                        lambda lesson: (
-                                            lesson["start"]
-                                            .astimezone(self.timezone)
-                                            .date()
-                                            >= today
-                                            and lesson["start"]
-                                            .astimezone(self.timezone)
-                                            .date()
-                                            <= current_week_end
-                                        ),
-                                        lessons,
-                                    )
-                                )
-                            )
-                            self.data[f"{eleve.get_fullname_lower()}_timetable_2"] = (
-                                list(
-                                    filter(
-                                        lambda lesson: (
-                                            lesson["start"]
-                                            .astimezone(self.timezone)
-                                            .date()
-                                            >= next_week_begin
-                                            and lesson["start"]
-                                            .astimezone(self.timezone)
-                                            .date()
-                                            <= next_week_end
-                                        ),
-                                        lessons,
-                                    )
-                                )
-                            )
-                            self.data[f"{eleve.get_fullname_lower()}_timetable_3"] = (
-                                list(
-                                    filter(
-                                        lambda lesson: (
-                                            lesson["start"]
-                                            .astimezone(self.timezone)
-                                            .date()
-                                            >= after_next_week_begin
-                                        ),
-                                        lessons,
-                                    )
-                                )
-                            )
-
-                        except Exception:
-                            LOGGER.exception("Error getting Lessons from ecole directe")
-
-                    if FAKE_ON or "VIE_SCOLAIRE" in eleve.modules:
-                        try:
-                            vie_scolaire = await client.get_vie_scolaire(eleve)
-                            if "absences" in vie_scolaire:
-                                self.data[f"{eleve.get_fullname_lower()}_absences"] = (
-                                    vie_scolaire["absences"]
-                                )
-
-                                self.compare_data(
-                                    previous_data,
-                                    f"{eleve.get_fullname_lower()}_absences",
-                                    ["date", "type_element", "display_date"],
-                                    "new_absence",
-                                    eleve,
-                                )
-                            if "retards" in vie_scolaire:
-                                self.data[f"{eleve.get_fullname_lower()}_retards"] = (
-                                    vie_scolaire["retards"]
-                                )
-                                self.compare_data(
-                                    previous_data,
-                                    f"{eleve.get_fullname_lower()}_retards",
-                                    ["date", "type_element", "display_date"],
-                                    "new_retard",
-                                    eleve,
-                                )
-                            if "sanctions" in vie_scolaire:
-                                self.data[f"{eleve.get_fullname_lower()}_sanctions"] = (
-                                    vie_scolaire["sanctions"]
-                                )
-                                self.compare_data(
-                                    previous_data,
-                                    f"{eleve.get_fullname_lower()}_sanctions",
-                                    ["date", "type_element", "display_date"],
-                                    "new_sanction",
-                                    eleve,
-                                )
-                            if "encouragements" in vie_scolaire:
-                                self.data[
-                                    f"{eleve.get_fullname_lower()}_encouragements"
-                                ] = vie_scolaire["encouragements"]
-                                self.compare_data(
-                                    previous_data,
-                                    f"{eleve.get_fullname_lower()}_encouragements",
-                                    ["date", "type_element", "display_date"],
-                                    "new_encouragement",
-                                    eleve,
-                                )
-                        except Exception:
-                            LOGGER.exception(
-                                "Error getting vie scolaire from ecole directe"
-                            )
-                    if FAKE_ON or "MESSAGERIE" in eleve.modules:
-                        try:
-                            self.data[
-                                f"{eleve.get_fullname_lower()}_messagerie"
-                            ] = await client.get_messages(
-                                client.id,
-                                eleve,
-                                year_data,
-                            )
-                        except Exception:
-                            LOGGER.exception(
-                                "Error getting messages from ecole directe"
-                            )
+            # END: DISTRIBUTE WALLET BALANCE DATA
+            self.data = handle_partial_data(self.data, previous_data, self.cycle_errors)
         except EDApiClientAuthenticationError as exception:
             LOGGER.warning("Authentication error - %s", exception)
             raise ConfigEntryAuthFailed(
@@ -594,6 +297,471 @@ async def _async_update_data(self) -> Any:
 
         return self.data
 
+    def _create_family_tasks(
+        self,
+        tg: asyncio.TaskGroup,
+        client: EDApiClient,
+        year_data: str,
+        previous_data: dict | None,
+    ) -> None:
+        """Schedule the requests made on the main account itself."""
+        if client.account_type == "P":  # professor ???
+            tg.create_task(self._async_fetch_classes(client))
+        if client.account_type == "1":  # famille
+            if "MESSAGERIE" in client.modules:
+                tg.create_task(
+                    self._async_fetch_messagerie(client, None, year_data, previous_data)
+                )
+            if "EDFORMS" in client.modules:
+                tg.create_task(self._async_fetch_formulaires(client, previous_data))
+
+    async def _async_fetch_due[T](
+        self, module: str, scope: str, fetch: Callable[[], Awaitable[T]]
+    ) -> T:
+        """
+        Fetch a scope if its module is due, else return its last result.
+
+        Transient errors are retried with backoff. A scope failing again and
+        again gets its circuit opened: it is not fetched anymore, its last
+        result being kept, until a probe succeeds.
+
+        The scopes of a child are named after its ID rather than its name, as
+        they are listed in the diagnostics.
+        """
+        now = dt_util.utcnow()
+        if not self.cadence.is_due(module, scope, now):
+            return self.cadence.last(scope)
+        circuit = self.circuits.setdefault(scope, EDCircuitBreaker())
+        if not circuit.allow(now):
+            if self.cadence.has_result(scope):
+                return self.cadence.last(scope)
+            msg = f"{scope} skipped until {circuit.opened_until}"
+            error = EDCircuitOpenError(msg)
+            self.cycle_errors.append(error)
+            raise error
+        try:
+            result = await async_call_with_retry(fetch)
+        except NOT_ENDPOINT_ERRORS:
+            circuit.cancel_probe(dt_util.utcnow())
+            raise
+        except Exception as exception:
+            circuit.record_failure(dt_util.utcnow())
+            self.cycle_errors.append(exception)
+            raise
+        circuit.record_success()
+        self.cadence.store(module, scope, result, now)
+        return result
+
+    async def _async_fetch_classes(self, client: EDApiClient) -> None:
+        """
+        Fetch the classes of a professor account, concurrently.
+
+        The requests go through the limiter of the session like any other.
+        A roster hardly changes during the year: each class is cached for the
+        refresh interval of the classes module, a day by default.
+        """
+        try:
+            classes = client.data["accounts"][0]["profile"].get("classes", [])
+        except LookupError:
+            LOGGER.exception("Error getting classes")
+            return
+
+        async def fetch_classe(classe: dict) -> None:
+            scope = f"classe_{classe['id']}"
+            try:
+                self.data[scope] = await self._async_fetch_due(
+                    "classes", scope, lambda: client.get_classe(classe)
+                )
+            except Exception:
+                LOGGER.exception("Error getting classe %s", classe.get("libelle"))
+
+        async with asyncio.TaskGroup() as tg:
+            for classe in classes:
+                tg.create_task(fetch_classe(classe))
+        self.data["classes"] = [
+            self.data[f"classe_{classe['id']}"]
+            for classe in classes
+            if f"classe_{classe['id']}" in self.data
+        ]
+
+    async def _async_fetch_formulaires(
+        self, client: EDApiClient, previous_data: dict | None
+    ) -> None:
+        """Fetch the formulaires of the family account."""
+        try:
+            self.data["formulaires"] = await self._async_fetch_due(
+                "formulaires",
+                "formulaires",
+                lambda: client.get_formulaires(
+                    client.account_type,
+                    client.id,
+                ),
+            )
+            self.compare_data(
+                previous_data,
+                "formulaires",
+                ["created", "titre"],
+                "new_formulaire",
+                None,
+            )
+        except Exception:
+            LOGGER.exception("Error getting formulaires from ecole directe")
+
+    async def _async_fetch_wallets(self, client: EDApiClient) -> dict | None:
+        """Fetch all wallet balances in a single call."""
+        try:
+            all_balances = await self._async_fetch_due(
+                "wallets", "wallets", client.get_all_wallet_balances
+            )
+        except Exception:
+            LOGGER.exception("Error getting all wallet balances from ecole directe")
+            return None
+        if all_balances and f"{client.id}" in all_balances:
+            self.data["wallets"] = all_balances[f"{client.id}"]
+        return all_balances
+
+    async def _async_fetch_messagerie(
+        self,
+        client: EDApiClient,
+        eleve: EDEleve | None,
+        year_data: str,
+        previous_data: dict | None,
+    ) -> None:
+        """Fetch the messagerie counters of the family or of a child."""
+        get_messages = (
+            client.get_message_counts
+            if self.config_entry.options.get(
+                "messagerie_counts_only", DEFAULT_MESSAGERIE_COUNTS_ONLY
+            )
+            else client.get_messages
+        )
+        try:
+            messagerie = await self._async_fetch_due(
+                "messagerie",
+                "messagerie" if eleve is None else f"{eleve.eleve_id}_messagerie",
+                lambda: get_messages(
+                    client.id,
+                    eleve,
+                    year_data,
+                ),
+            )
+        except Exception:
+            if eleve is None:
+                LOGGER.exception("Error getting messages for family from ecole directe")
+            else:
+                LOGGER.exception("Error getting messages from ecole directe")
+            return
+        data_key = (
+            "messagerie"
+            if eleve is None
+            else f"{eleve.get_fullname_lower()}_messagerie"
+        )
+        self.data[data_key] = messagerie
+        if messagerie is None or (
+            previous_data is not None and previous_data.get(data_key) is messagerie
+        ):
+            # Result carried forward, its new messages were already notified
+            return
+        for message in messagerie.get("new_messages", []):
+            if self.notified_messages.claim(message):
+                self.trigger_event("new_message", eleve, message_event_data(message))
+
+    async def _async_fetch_eleve(
+        self,
+        client: EDApiClient,
+        eleve: EDEleve,
+        year_data: str,
+        window: EDRefreshWindow,
+        previous_data: dict | None,
+    ) -> None:
+        """Fetch the modules of a child concurrently."""
+        async with asyncio.TaskGroup() as tg:
+            if "CAHIER_DE_TEXTES" in eleve.modules:
+                tg.create_task(
+                    self._async_fetch_homeworks(client, eleve, window, previous_data)
+                )
+            if "NOTES" in eleve.modules:
+                tg.create_task(
+                    self._async_fetch_grades(client, eleve, year_data, previous_data)
+                )
+            if "EDT" in eleve.modules:
+                tg.create_task(self._async_fetch_lessons(client, eleve, window))
+            if "VIE_SCOLAIRE" in eleve.modules:
+                tg.create_task(
+                    self._async_fetch_vie_scolaire(client, eleve, previous_data)
+                )
+            if "MESSAGERIE" in eleve.modules:
+                tg.create_task(
+                    self._async_fetch_messagerie(
+                        client, eleve, year_data, previous_data
+                    )
+                )
+
+    async def _async_fetch_homeworks(
+        self,
+        client: EDApiClient,
+        eleve: EDEleve,
+        window: EDRefreshWindow,
+        previous_data: dict | None,
+    ) -> None:
+        """Fetch the homeworks of a child and split them by period."""
+        prefix = eleve.get_fullname_lower()
+        try:
+            homeworks = await self._async_fetch_due(
+                "homeworks",
+                f"{eleve.eleve_id}_homeworks",
+                lambda: client.get_homeworks(
+                    eleve,
+                    self.config_entry.options.get("decode_html", False),
+                ),
+            )
+
+            self.data[f"{prefix}_homeworks"] = homeworks
+
+            self.compare_data(
+                previous_data,
+                f"{prefix}_homeworks",
+                ["date", "matiere", "short_description"],
+                "new_devoir",
+                eleve,
+            )
+
+            self.data[f"{prefix}_homeworks_today"] = list(
+                filter(
+                    lambda homework: (
+                        homework.date.astimezone(self.timezone).date() == window.today
+                    ),
+                    homeworks,
+                )
+            )
+            homeworks_tomorrow = list(
+                filter(
+                    lambda homework: (
+                        homework.date.astimezone(self.timezone).date()
+                        == window.tomorrow
+                    ),
+                    homeworks,
+                )
+            )
+            self.data[f"{prefix}_homeworks_tomorrow"] = homeworks_tomorrow
+            self.data[f"{prefix}_homeworks_next_day"] = get_next_day_list(
+                homeworks,
+                homeworks_tomorrow,
+                window.tomorrow,
+                "date",
+            )
+
+            self.data[f"{prefix}_homeworks_1"] = list(
+                filter(
+                    lambda homework: (
+                        homework.date.astimezone(self.timezone).date()
+                        >= window.current_week_begin
+                        and homework.date.astimezone(self.timezone).date()
+                        <= window.current_week_end
+                    ),
+                    homeworks,
+                )
+            )
+            self.data[f"{prefix}_homeworks_2"] = list(
+                filter(
+                    lambda homework: (
+                        homework.date.astimezone(self.timezone).date()
+                        >= window.next_week_begin
+                        and homework.date.astimezone(self.timezone).date()
+                        <= window.next_week_end
+                    ),
+                    homeworks,
+                )
+            )
+            self.data[f"{prefix}_homeworks_3"] = list(
+                filter(
+                    lambda homework: (
+                        homework.date.astimezone(self.timezone).date()
+                        >= window.after_next_week_begin
+                    ),
+                    homeworks,
+                )
+            )
+
+        except Exception:
+            LOGGER.exception("Error getting homeworks from ecole directe")
+
+    async def _async_fetch_grades(
+        self,
+        client: EDApiClient,
+        eleve: EDEleve,
+        year_data: str,
+        previous_data: dict | None,
+    ) -> None:
+        """Fetch the grades, evaluations and averages of a child."""
+        prefix = eleve.get_fullname_lower()
+        # Kept as str, the IDs of the children being the keys of a JSON store
+        eleve_id = str(eleve.eleve_id)
+        grades_display = self.config_entry.options.get(
+            "notes_affichees", GRADES_TO_DISPLAY
+        )
+        try:
+            grades_evaluations = await self._async_fetch_due(
+                "grades",
+                f"{eleve.eleve_id}_grades",
+                lambda: client.get_grades_evaluations(
+                    eleve,
+                    year_data,
+                    grades_display,
+                    self.grade_history.fingerprints(eleve_id, year_data),
+                ),
+            )
+            if "disciplines" in grades_evaluations:
+                disciplines = grades_evaluations["disciplines"]
+                self.data[f"{prefix}_disciplines"] = disciplines
+                for discipline in disciplines:
+                    self.data[f"{prefix}_{get_unique_id(discipline['nom'])}"] = (
+                        discipline
+                    )
+
+            if "moyenne_generale" in grades_evaluations:
+                self.data[f"{prefix}_moyenne_generale"] = grades_evaluations[
+                    "moyenne_generale"
+                ]
+
+            if "empreintes_notes" in grades_evaluations:
+                self.grade_history.sync(
+                    eleve_id,
+                    year_data,
+                    grades_evaluations["empreintes_notes"],
+                    grades_evaluations["notes_modifiees"],
+                )
+            # Read from the history, kept in sync with the payload of the year
+            self.data[f"{prefix}_notes"] = self.grade_history.latest(
+                eleve_id, grades_display
+            )
+            self.compare_data(
+                previous_data,
+                f"{prefix}_notes",
+                ["date", "matiere", "commentaire"],
+                "new_note",
+                eleve,
+            )
+
+            self.data[f"{prefix}_evaluations"] = grades_evaluations["evaluations"]
+            self.compare_data(
+                previous_data,
+                f"{prefix}_evaluations",
+                ["date", "matiere", "devoir"],
+                "new_evaluation",
+                eleve,
+            )
+        except Exception:
+            LOGGER.exception("Error getting grades from ecole directe")
+
+    async def _async_fetch_lessons(
+        self, client: EDApiClient, eleve: EDEleve, window: EDRefreshWindow
+    ) -> None:
+        """Fetch the timetable of a child and split it by period."""
+        prefix = eleve.get_fullname_lower()
+        try:
+            break_time = self.config_entry.options.get(
+                "lunch_break_time", DEFAULT_LUNCH_BREAK_TIME
+            )
+            lunch_break_time = parse_time_of_day(break_time)
+
+            lessons = await self._async_fetch_due(
+                "lessons",
+                f"{eleve.eleve_id}_lessons",
+                lambda: client.get_lessons(
+                    eleve,
+                    window.today.strftime("%Y-%m-%d"),
+                    window.current_week_plus_21.strftime("%Y-%m-%d"),
+                    lunch_break_time,
+                ),
+            )
+            self.data[f"{prefix}_timetable_today"] = list(
+                filter(
+                    lambda lesson: (
+                        lesson.start.astimezone(self.timezone).date() == window.today
+                    ),
+                    lessons,
+                )
+            )
+            lessons_tomorrow = list(
+                filter(
+                    lambda lesson: (
+                        lesson.start.astimezone(self.timezone).date() == window.tomorrow
+                    ),
+                    lessons,
+                )
+            )
+            self.data[f"{prefix}_timetable_tomorrow"] = lessons_tomorrow
+            self.data[f"{prefix}_timetable_next_day"] = get_next_day_list(
+                lessons,
+                lessons_tomorrow,
+                window.tomorrow,
+                "start",
+            )
+            self.data[f"{prefix}_timetable_1"] = list(
+                filter(
+                    lambda lesson: (
+                        lesson.start.astimezone(self.timezone).date() >= window.today
+                        and lesson.start.astimezone(self.timezone).date()
+                        <= window.current_week_end
+                    ),
+                    lessons,
+                )
+            )
+            self.data[f"{prefix}_timetable_2"] = list(
+                filter(
+                    lambda lesson: (
+                        lesson.start.astimezone(self.timezone).date()
+                        >= window.next_week_begin
+                        and lesson.start.astimezone(self.timezone).date()
+                        <= window.next_week_end
+                    ),
+                    lessons,
+                )
+            )
+            self.data[f"{prefix}_timetable_3"] = list(
+                filter(
+                    lambda lesson: (
+                        lesson.start.astimezone(self.timezone).date()
+                        >= window.after_next_week_begin
+                    ),
+                    lessons,
+                )
+            )
+
+        except Exception:
+            LOGGER.exception("Error getting Lessons from ecole directe")
+
+    async def _async_fetch_vie_scolaire(
+        self, client: EDApiClient, eleve: EDEleve, previous_data: dict | None
+    ) -> None:
+        """Fetch the absences, retards, sanctions and encouragements of a child."""
+        prefix = eleve.get_fullname_lower()
+        try:
+            vie_scolaire = await self._async_fetch_due(
+                "vie_scolaire",
+                f"{eleve.eleve_id}_vie_scolaire",
+                lambda: client.get_vie_scolaire(eleve),
+            )
+            for category, event_type in (
+                ("absences", "new_absence"),
+                ("retards", "new_retard"),
+                ("sanctions", "new_sanction"),
+                ("encouragements", "new_encouragement"),
+            ):
+                if category not in vie_scolaire:
+                    continue
+                self.data[f"{prefix}_{category}"] = vie_scolaire[category]
+                self.compare_data(
+                    previous_data,
+                    f"{prefix}_{category}",
+                    ["date", "type_element", "display_date"],
+                    event_type,
+                    eleve,
+                )
+        except Exception:
+            LOGGER.exception("Error getting vie scolaire from ecole directe")
+
     def compare_data(
         self,
         previous_data: dict | None,
@@ -609,6 +777,9 @@ def compare_data(
                 and data_key in previous_data
                 and data_key in self.data
             ):
+                if previous_data[data_key] is self.data[data_key]:
+                    # Parsed result reused, the payload did not change
+                    return
                 not_found_items = []
                 for item in self.data[data_key]:
                     found = False
@@ -637,7 +808,7 @@ def trigger_event(self, event_type: str, eleve: EDEleve | None, data: Any) -> No
         event_data = {
             "child_name": name,
             "type": event_type,
-            "data": data,
+            "data": data.as_attributes() if isinstance(data, EDRecord) else data,
         }
         self.hass.bus.fire(EVENT_TYPE, event_data)
 
@@ -13,11 +13,45 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
+from datetime import date, timedelta
 from typing import Any
 
 from custom_components.ecole_directe.const import LOGGER
 
 
+@dataclass(frozen=True, slots=True)
+class EDRefreshWindow:
+    """Dates used to split homeworks and lessons into sensor periods."""
+
+    today: date
+    tomorrow: date
+    current_week_begin: date
+    current_week_end: date
+    next_week_begin: date
+    next_week_end: date
+    after_next_week_begin: date
+    current_week_plus_21: date
+
+    @classmethod
+    def from_today(cls, today: date) -> EDRefreshWindow:
+        """Build the refresh window around the given day."""
+        current_week_begin = today - timedelta(days=today.weekday())
+        current_week_end = current_week_begin + timedelta(days=6)
+        next_week_begin = current_week_end + timedelta(days=1)
+        next_week_end = next_week_begin + timedelta(days=6)
+        return cls(
+            today=today,
+            tomorrow=today + timedelta(days=1),
+            current_week_begin=current_week_begin,
+            current_week_end=current_week_end,
+            next_week_begin=next_week_begin,
+            next_week_end=next_week_end,
+            after_next_week_begin=next_week_end + timedelta(days=1),
+            current_week_plus_21=current_week_begin + timedelta(days=21),
+        )
+
+
 def validate_api_response(data: Any) -> bool:
     """
     Validate the structure and content of API response data.
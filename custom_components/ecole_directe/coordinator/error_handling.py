@@ -6,23 +6,59 @@
 graceful degradation strategies.
 
 Use cases:
-- Retry logic with exponential backoff
-- Circuit breaker to prevent cascading failures
+- Retry logic with jittered exponential backoff for transient errors
+- Circuit breaker to stop calling an endpoint that keeps failing
 - Error categorization and appropriate responses
 - Graceful degradation when partial data is available
 """
 
 from __future__ import annotations
 
+import asyncio
+import random
 from datetime import timedelta
+from typing import TYPE_CHECKING, Any
 
-from custom_components.ecole_directe.const import LOGGER
+from custom_components.ecole_directe.api import EDApiClientCommunicationError
+from custom_components.ecole_directe.api.limiter import is_overload_error
+from custom_components.ecole_directe.const import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_MAX_RESET_TIMEOUT,
+    CIRCUIT_RESET_TIMEOUT,
+    LOGGER,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_ATTEMPTS,
+    RETRY_MAX_DELAY,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from datetime import datetime
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+class EDCircuitOpenError(Exception):
+    """Exception to indicate an endpoint is skipped while its circuit is open."""
+
+
+def is_transient_error(exception: BaseException) -> bool:
+    """Return True if an error may not happen again on the next attempt."""
+    return is_overload_error(exception) or isinstance(
+        exception, EDApiClientCommunicationError
+    )
 
 
 def should_retry_update(exception: Exception, attempt: int) -> bool:
     """
     Determine if an update should be retried based on the error type.
 
+    Only transient errors are retried: Ecole Directe overloaded, throttling
+    or unreachable. An error returned by an endpoint, or a payload that can
+    not be parsed, would fail the same way again.
+
     Args:
         exception: The exception that occurred during update.
         attempt: The current retry attempt number (0-indexed).
@@ -31,22 +67,21 @@ def should_retry_update(exception: Exception, attempt: int) -> bool:
         True if the update should be retried, False otherwise.
 
     Example:
-        >>> from requests.exceptions import Timeout
-        >>> should_retry_update(Timeout(), 0)
+        >>> should_retry_update(TimeoutError(), 0)
         True
         >>> should_retry_update(ValueError(), 0)
         False
 
     """
-    # Placeholder for retry logic
-    # Consider exception type, attempt count, and error patterns
-    max_retries = 3
-    return attempt < max_retries
+    return attempt < RETRY_MAX_ATTEMPTS - 1 and is_transient_error(exception)
 
 
 def calculate_backoff_delay(attempt: int) -> timedelta:
     """
-    Calculate exponential backoff delay for retry attempts.
+    Calculate a jittered exponential backoff delay for retry attempts.
+
+    The delay is drawn uniformly below the exponential backoff ("full
+    jitter"), so that the requests failing together are not retried together.
 
     Args:
         attempt: The current retry attempt number (0-indexed).
@@ -55,45 +90,171 @@ def calculate_backoff_delay(attempt: int) -> timedelta:
         The delay to wait before the next retry attempt.
 
     Example:
-        >>> calculate_backoff_delay(0)
-        timedelta(seconds=1)
-        >>> calculate_backoff_delay(2)
-        timedelta(seconds=4)
+        >>> calculate_backoff_delay(0) <= timedelta(seconds=1)
+        True
+        >>> calculate_backoff_delay(2) <= timedelta(seconds=4)
+        True
 
     """
-    base_delay = 1  # seconds
-    max_delay = 60  # seconds
+    ceiling = min(RETRY_BASE_DELAY * (2**attempt), RETRY_MAX_DELAY)
+    return timedelta(seconds=random.uniform(0, ceiling))  # noqa: S311
 
-    delay = min(base_delay * (2**attempt), max_delay)
-    return timedelta(seconds=delay)
 
+async def async_call_with_retry[T](fetch: Callable[[], Awaitable[T]]) -> T:
+    """
+    Call fetch, retrying it after a backoff delay on transient errors.
+
+    Args:
+        fetch: The request to send.
+
+    Returns:
+        The result of the first successful attempt.
+
+    Raises:
+        Exception: The error of the last attempt, or a non transient error.
 
-def handle_partial_data(data: dict, error: Exception) -> dict:
+    """
+    attempt = 0
+    while True:
+        try:
+            return await fetch()
+        except Exception as exception:
+            if not should_retry_update(exception, attempt):
+                raise
+            log_update_failure(exception, attempt, RETRY_MAX_ATTEMPTS)
+            await asyncio.sleep(calculate_backoff_delay(attempt).total_seconds())
+            attempt += 1
+
+
+class EDCircuitBreaker:
+    """
+    Circuit breaker of an endpoint.
+
+    The circuit opens after CIRCUIT_FAILURE_THRESHOLD failures in a row, and
+    the endpoint is not called anymore until its reset timeout elapsed. A
+    single probe is then let through (half-open): its success closes the
+    circuit, its failure opens it again for twice as long, up to
+    CIRCUIT_MAX_RESET_TIMEOUT.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: timedelta = CIRCUIT_RESET_TIMEOUT,
+        max_reset_timeout: timedelta = CIRCUIT_MAX_RESET_TIMEOUT,
+    ) -> None:
+        """Initialize a closed circuit."""
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.reset_timeout = reset_timeout
+        self.state = CIRCUIT_CLOSED
+        self.failures = 0
+        self.opened_until: datetime | None = None
+
+    def allow(self, now: datetime) -> bool:
+        """Return True if the endpoint can be called, turning half-open when due."""
+        if self.state == CIRCUIT_CLOSED:
+            return True
+        if (
+            self.state == CIRCUIT_OPEN
+            and self.opened_until is not None
+            and now >= self.opened_until
+        ):
+            self.state = CIRCUIT_HALF_OPEN
+            return True
+        # Open, or half-open with its probe in flight
+        return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        if self.state != CIRCUIT_CLOSED:
+            LOGGER.info("Endpoint recovered, closing its circuit")
+        self.state = CIRCUIT_CLOSED
+        self.failures = 0
+        self.reset_timeout = self.base_reset_timeout
+        self.opened_until = None
+
+    def record_failure(self, now: datetime) -> None:
+        """Count a failed call, opening the circuit if needed."""
+        self.failures += 1
+        if self.state == CIRCUIT_HALF_OPEN:
+            self.reset_timeout = min(self.reset_timeout * 2, self.max_reset_timeout)
+            self._open(now)
+        elif self.failures >= self.failure_threshold:
+            self._open(now)
+
+    def cancel_probe(self, now: datetime) -> None:
+        """Let the next cycle probe again when a probe was cancelled."""
+        if self.state == CIRCUIT_HALF_OPEN:
+            self.state = CIRCUIT_OPEN
+            self.opened_until = now
+
+    def as_diagnostics(self) -> dict[str, Any]:
+        """Return the state of the circuit, for the diagnostics."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "opened_until": None
+            if self.opened_until is None
+            else self.opened_until.isoformat(),
+        }
+
+    def _open(self, now: datetime) -> None:
+        """Stop calling the endpoint until the reset timeout elapsed."""
+        self.state = CIRCUIT_OPEN
+        self.opened_until = now + self.reset_timeout
+        LOGGER.warning(
+            "Endpoint failed %s times in a row, not calling it before %s",
+            self.failures,
+            self.opened_until.isoformat(),
+        )
+
+
+def handle_partial_data(
+    data: dict, previous_data: dict | None, errors: list[Exception]
+) -> dict:
     """
     Handle scenarios where only partial data is available due to errors.
 
-    This function can decide whether to:
-    - Use cached data
-    - Use partial data with fallback values
-    - Raise the error to make entities unavailable
+    A scope that failed without a cached result leaves its keys out of the
+    data of the cycle. They are carried forward from the previous cycle, so
+    that its entities keep their last state instead of turning unavailable.
+    With nothing fetched nor carried forward, the update fails.
 
     Args:
         data: The partial data that was successfully retrieved.
-        error: The error that prevented full data retrieval.
+        previous_data: The data of the previous cycle, None on the first one.
+        errors: The errors that prevented full data retrieval.
 
     Returns:
         The data to use for this update cycle.
 
+    Raises:
+        EDApiClientCommunicationError: If every scope failed on the first cycle.
+
     Example:
-        >>> partial = {"sensor1": 42}
-        >>> handle_partial_data(partial, Exception("sensor2 timeout"))
-        {"sensor1": 42}
+        >>> partial = {"session": client, "sensor1": 42}
+        >>> handle_partial_data(partial, {"sensor2": 7}, [TimeoutError()])
+        {"session": client, "sensor1": 42, "sensor2": 7}
 
     """
-    LOGGER.debug("Handling partial data due to: %s", error)
-
-    # Decide on strategy based on error type and available data
-    # This is a placeholder for future implementation
+    if not errors:
+        return data
+    if previous_data is None:
+        if data.keys() <= {"session"}:
+            msg = f"Every request failed: {errors[-1]}"
+            raise EDApiClientCommunicationError(msg) from errors[-1]
+        return data
+    carried = [key for key in previous_data if key not in data]
+    for key in carried:
+        data[key] = previous_data[key]
+    LOGGER.debug(
+        "Handling partial data due to %s errors, %s keys carried forward: %s",
+        len(errors),
+        len(carried),
+        errors[-1],
+    )
     return data
 
 
@@ -0,0 +1,216 @@
+"""
+Grade history for the coordinator.
+
+Ecole Directe only returns the grades of the current school year, and only the
+latest grades are kept in coordinator.data. The grades of each child are
+rather kept by school year in a store of the configuration folder, so that the
+grades of previous periods and years stay available.
+
+Use cases:
+- Syncing a school year with the payload, which stays authoritative: the
+  notes are diffed by id and fingerprint, so that only new or changed notes
+  are parsed into grades, and deleted notes are removed
+- Reading a bounded window of the history, the latest grades or the grades
+  entered between two dates, without sorting the whole history
+
+The grades of a child are kept in the order they were entered, a changed
+grade being moved to its place instead of sorting them again.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from dataclasses import fields
+from datetime import timedelta
+from itertools import chain
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.helpers.storage import Store
+
+from custom_components.ecole_directe.api import EDGrade
+from custom_components.ecole_directe.const import (
+    DOMAIN,
+    GRADE_HISTORY_SAVE_DELAY,
+    GRADE_HISTORY_STORAGE_VERSION,
+    LOGGER,
+)
+
+if TYPE_CHECKING:
+    from datetime import date
+
+    from homeassistant.core import HomeAssistant
+
+_DATE_SAISIE = attrgetter("date_saisie")
+_GRADE_FIELDS = frozenset(field.name for field in fields(EDGrade))
+
+
+class EDGradeHistory:
+    """History of the grades of the children of a config entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize an empty history, loaded from its store later."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass,
+            GRADE_HISTORY_STORAGE_VERSION,
+            f"{DOMAIN}.{entry_id}.grades",
+            private=True,
+        )
+        # Grades of each child, by school year and note id
+        self._years: dict[str, dict[str, dict[int, EDGrade]]] = {}
+        # Fingerprints of the notes of these grades
+        self._fingerprints: dict[str, dict[str, dict[int, int]]] = {}
+        # Grades of each child, in the order they were entered
+        self._grades: dict[str, list[EDGrade]] = {}
+
+    async def async_load(self) -> None:
+        """Load the history saved by the previous runs."""
+        data = await self._store.async_load() or {}
+        for eleve_id, years in data.get("eleves", {}).items():
+            if not isinstance(years, dict):
+                continue
+            for annee, grades in years.items():
+                year = self._years.setdefault(eleve_id, {}).setdefault(annee, {})
+                known = self._fingerprints.setdefault(eleve_id, {}).setdefault(
+                    annee, {}
+                )
+                for grade in grades:
+                    if "empreinte" not in grade or not _GRADE_FIELDS.issubset(grade):
+                        continue
+                    year[grade["note_id"]] = EDGrade(
+                        **{k: v for k, v in grade.items() if k in _GRADE_FIELDS}
+                    )
+                    known[grade["note_id"]] = grade["empreinte"]
+            self._grades[eleve_id] = sorted(
+                chain.from_iterable(
+                    grades.values() for grades in self._years[eleve_id].values()
+                ),
+                key=_DATE_SAISIE,
+            )
+        LOGGER.debug(
+            "Grade history loaded: %s",
+            {eleve_id: len(grades) for eleve_id, grades in self._grades.items()},
+        )
+
+    async def async_remove(self) -> None:
+        """Delete the saved history, when its entry is removed."""
+        await self._store.async_remove()
+
+    def fingerprints(self, eleve_id: str, annee: str) -> dict[int, int]:
+        """Return the fingerprints of the notes of a school year, by note id."""
+        return self._fingerprints.get(eleve_id, {}).get(annee, {})
+
+    def sync(
+        self,
+        eleve_id: str,
+        annee: str,
+        fingerprints: dict[int, int],
+        grades: list[EDGrade],
+    ) -> bool:
+        """
+        Sync a school year of a child with the notes of the payload.
+
+        Args:
+            eleve_id: The child the grades belong to.
+            annee: The school year of the payload, as asked to Ecole Directe.
+            fingerprints: The fingerprints of every note of the payload, by
+                note id. The grades of the year missing from them are removed.
+            grades: The grades of the notes new or changed since the fingerprints
+                given to the parser.
+
+        Returns:
+            Whether the grades of the year changed.
+
+        """
+        year = self._years.setdefault(eleve_id, {}).setdefault(annee, {})
+        known = self._fingerprints.setdefault(eleve_id, {}).setdefault(annee, {})
+        history = self._grades.setdefault(eleve_id, [])
+        changed = False
+        for note_id in known.keys() - fingerprints.keys():
+            _remove(history, year.pop(note_id))
+            del known[note_id]
+            changed = True
+        for grade in grades:
+            note_id = grade.note_id
+            # Already synced, when the parse of an unchanged payload is reused
+            if note_id is None or known.get(note_id) == fingerprints.get(note_id):
+                continue
+            if note_id in year:
+                _remove(history, year[note_id])
+            year[note_id] = grade
+            known[note_id] = fingerprints[note_id]
+            insort(history, grade, key=_DATE_SAISIE)
+            changed = True
+        if changed:
+            self._store.async_delay_save(self._data_to_save, GRADE_HISTORY_SAVE_DELAY)
+        return changed
+
+    def latest(self, eleve_id: str, count: int) -> list[EDGrade]:
+        """Return the last grades entered for a child, the latest first."""
+        grades = self._grades.get(eleve_id, [])
+        return grades[: -count - 1 : -1] if count > 0 else []
+
+    def window(
+        self,
+        eleve_id: str,
+        count: int,
+        since: date | None = None,
+        until: date | None = None,
+        matiere: str | None = None,
+    ) -> list[EDGrade]:
+        """
+        Return the grades of a child entered between two dates, the latest first.
+
+        Args:
+            eleve_id: The child the grades belong to.
+            count: The maximum number of grades returned.
+            since: The first day of the window, included.
+            until: The last day of the window, included.
+            matiere: The only matiere returned, if given.
+
+        Returns:
+            At most count grades, read from the end of the window.
+
+        """
+        grades = self._grades.get(eleve_id, [])
+        start = 0
+        if since is not None:
+            start = bisect_left(grades, since.isoformat(), key=_DATE_SAISIE)
+        end = len(grades)
+        if until is not None:
+            end = bisect_left(
+                grades, (until + timedelta(days=1)).isoformat(), key=_DATE_SAISIE
+            )
+        result: list[EDGrade] = []
+        for index in range(end - 1, start - 1, -1):
+            if len(result) >= count:
+                break
+            if matiere is None or grades[index].matiere == matiere:
+                result.append(grades[index])
+        return result
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the history as saved in the store."""
+        return {
+            "eleves": {
+                eleve_id: {
+                    annee: [
+                        {
+                            **grade.as_attributes(),
+                            "empreinte": self._fingerprints[eleve_id][annee][note_id],
+                        }
+                        for note_id, grade in grades.items()
+                    ]
+                    for annee, grades in years.items()
+                }
+                for eleve_id, years in self._years.items()
+            }
+        }
+
+
+def _remove(history: list[EDGrade], grade: EDGrade) -> None:
+    """Remove a grade from the sorted grades of a child."""
+    index = bisect_left(history, grade.date_saisie, key=_DATE_SAISIE)
+    while history[index] is not grade:
+        index += 1
+    del history[index]
@@ -0,0 +1,104 @@
+"""
+Fetch scheduling for the coordinator.
+
+This module decides in which order the data of a refresh cycle is fetched.
+
+Use cases:
+- Grouping children by Ecole Directe account so each account is switched to
+  at most once per cycle
+- Refreshing each module at its own cadence, carrying the last result forward
+  in the cycles where it is not due
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+from custom_components.ecole_directe.const import CADENCE_TOLERANCE
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from custom_components.ecole_directe.api.client import EDEleve
+
+
+def plan_account_batches(
+    eleves: list[EDEleve],
+    main_account_id_login: int,
+    current_account_id_login: int,
+) -> dict[int, list[EDEleve]]:
+    """
+    Group children by the account they belong to.
+
+    The account the session is currently on comes first so the cycle starts
+    without switching, and the main account is always present because the
+    family-level requests are made on it.
+
+    Args:
+        eleves: The children of the session, in any order.
+        main_account_id_login: The idLogin of the main account.
+        current_account_id_login: The idLogin the session is switched to.
+
+    Returns:
+        The children keyed by account idLogin, in the order to fetch them.
+
+    Example:
+        >>> plan_account_batches([a1, b1, a2], 1, 2)
+        {2: [b1], 1: [a1, a2]}
+
+    """
+    batches: dict[int, list[EDEleve]] = {current_account_id_login: []}
+    batches.setdefault(main_account_id_login, [])
+    for eleve in eleves:
+        account_id_login = eleve.account_id_login or main_account_id_login
+        batches.setdefault(account_id_login, []).append(eleve)
+    return {
+        account_id_login: batch
+        for account_id_login, batch in batches.items()
+        if batch or account_id_login == main_account_id_login
+    }
+
+
+class EDCadenceScheduler:
+    """
+    Refresh cadence of each module and last result fetched for each scope.
+
+    A scope is a module fetched for a given child, or for the family. A scope
+    is due once the refresh interval of its module elapsed since it was last
+    fetched successfully; until then its last result is carried forward.
+    """
+
+    def __init__(self, intervals: dict[str, timedelta]) -> None:
+        """Initialize the scheduler with the refresh interval of each module."""
+        self.intervals = intervals
+        self._results: dict[str, tuple[str, datetime, Any]] = {}
+
+    def is_due(self, module: str, scope: str, now: datetime) -> bool:
+        """Return True if the scope has to be fetched in this cycle."""
+        if scope not in self._results:
+            return True
+        fetched_at = self._results[scope][1]
+        interval = self.intervals.get(module, timedelta(0))
+        return now >= fetched_at + interval - CADENCE_TOLERANCE
+
+    def store(self, module: str, scope: str, result: Any, now: datetime) -> None:
+        """Remember the result fetched for a scope."""
+        self._results[scope] = (module, now, result)
+
+    def has_result(self, scope: str) -> bool:
+        """Return True if a result was fetched for a scope."""
+        return scope in self._results
+
+    def last(self, scope: str) -> Any:
+        """Return the last result fetched for a scope."""
+        return self._results[scope][2]
+
+    def next_due(self) -> dict[str, datetime]:
+        """Return, per module, the earliest time one of its scopes is due."""
+        next_due: dict[str, datetime] = {}
+        for module, fetched_at, _ in self._results.values():
+            due = fetched_at + self.intervals.get(module, timedelta(0))
+            if module not in next_due or due < next_due[module]:
+                next_due[module] = due
+        return next_due
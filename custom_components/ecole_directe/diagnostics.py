@@ -0,0 +1,49 @@
+"""
+Diagnostics support for ecole_directe.
+
+For more details about diagnostics:
+https://developers.home-assistant.io/docs/core/integration_diagnostics
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import EDConfigEntry
+
+TO_REDACT = {CONF_USERNAME, CONF_PASSWORD}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,
+    entry: EDConfigEntry,
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = entry.runtime_data.coordinator
+    client = entry.runtime_data.client
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": str(coordinator.update_interval),
+            "next_due": {
+                module: due.isoformat()
+                for module, due in coordinator.cadence.next_due().items()
+            },
+        },
+        "limiter": client.limiter.as_diagnostics(),
+        "circuits": {
+            scope: circuit.as_diagnostics()
+            for scope, circuit in coordinator.circuits.items()
+            if circuit.failures
+        },
+    }
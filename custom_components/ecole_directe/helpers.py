@@ -1,8 +1,21 @@
 """Helpers for ecole_directe."""
 
+import functools
+from datetime import datetime, time
+
 from unidecode import unidecode
 
 
 def get_unique_id(data: str) -> str:
     """Get unique id."""
     return unidecode(data).lower().replace(" ", "_")
+
+
+@functools.lru_cache(maxsize=8)
+def parse_time_of_day(value: str) -> time:
+    """Parse a time of day such as the lunch break time option."""
+    try:
+        return time.fromisoformat(value)
+    except ValueError:
+        # Hours without a leading zero
+        return datetime.strptime(value, "%H:%M").time()
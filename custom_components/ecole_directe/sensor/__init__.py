@@ -6,7 +6,6 @@
 
 from custom_components.ecole_directe.const import (
     DOMAIN,
-    FAKE_ON,
     LOGGER,
 )
 
@@ -14,6 +13,8 @@
 from .absences import EDAbsencesSensor
 from .child import ENTITY_DESCRIPTIONS as CHILD_DESCRIPTIONS
 from .child import EDChildSensor
+from .classes import ENTITY_DESCRIPTIONS as CLASSES_DESCRIPTIONS
+from .classes import EDClasseSensor
 from .discipline import ENTITY_DESCRIPTIONS as DISCIPLINE_DESCRIPTIONS
 from .discipline import EDDisciplineSensor
 from .encouragements import ENTITY_DESCRIPTIONS as ENCOURAGEMENTS_DESCRIPTIONS
@@ -51,6 +52,7 @@
 ENTITY_DESCRIPTIONS: tuple[SensorEntityDescription, ...] = (
     *ABSENCES_DESCRIPTIONS,
     *CHILD_DESCRIPTIONS,
+    *CLASSES_DESCRIPTIONS,
     *DISCIPLINE_DESCRIPTIONS,
     *ENCOURAGEMENTS_DESCRIPTIONS,
     *EVALUATIONS_DESCRIPTIONS,
@@ -99,6 +101,19 @@ async def async_setup_entry(
                     )
                     for entity_description in MESSAGERIE_DESCRIPTIONS
                 )
+            if coordinator.data["session"].account_type == "P":
+                session = coordinator.data["session"]
+                async_add_entities(
+                    EDClasseSensor(
+                        coordinator=config_entry.runtime_data.coordinator,
+                        entity_description=entity_description,
+                        classe=classe,
+                    )
+                    for classe in session.data["accounts"][0]["profile"].get(
+                        "classes", []
+                    )
+                    for entity_description in CLASSES_DESCRIPTIONS
+                )
             # We add the sensor regardless of modules, as it's often not listed.
             if "wallets" in coordinator.data:
                 wallets = coordinator.data["wallets"]
@@ -144,7 +159,7 @@ async def async_setup_entry(
             except Exception:
                 LOGGER.exception("Error while creating wallet sensors")
             # END: ADDED FOR WALLET SENSOR
-            if FAKE_ON or "CAHIER_DE_TEXTES" in eleve.modules:
+            if "CAHIER_DE_TEXTES" in eleve.modules:
                 try:
                     async_add_entities(
                         EDHomeworksSensor(
@@ -211,7 +226,7 @@ async def async_setup_entry(
                     )
                 except Exception:
                     LOGGER.exception("Error while creating homeworks sensors")
-            if FAKE_ON or "EDT" in eleve.modules:
+            if "EDT" in eleve.modules:
                 try:
                     async_add_entities(
                         EDLessonsSensor(
@@ -269,7 +284,7 @@ async def async_setup_entry(
                     )
                 except Exception:
                     LOGGER.exception("Error while creating lessons sensors")
-            if FAKE_ON or "NOTES" in eleve.modules:
+            if "NOTES" in eleve.modules:
                 try:
                     async_add_entities(
                         EDGradesSensor(
@@ -320,7 +335,7 @@ async def async_setup_entry(
                 except Exception:
                     LOGGER.exception("Error while creating moyennes sensors")
 
-            if FAKE_ON or "VIE_SCOLAIRE" in eleve.modules:
+            if "VIE_SCOLAIRE" in eleve.modules:
                 try:
                     async_add_entities(
                         EDAbsencesSensor(
@@ -356,7 +371,7 @@ async def async_setup_entry(
                     )
                 except Exception:
                     LOGGER.exception("Error while creating VIE_SCOLAIRE sensors")
-            if FAKE_ON or "MESSAGERIE" in eleve.modules:
+            if "MESSAGERIE" in eleve.modules:
                 try:
                     async_add_entities(
                         EDMessagerieSensor(
@@ -50,7 +50,7 @@ def extra_state_attributes(self) -> dict[str, Any]:
         if self._key in self.coordinator.data:
             absences = self.coordinator.data[self._key]
             for absence in absences:
-                attributes.append(absence)
+                attributes.append(absence.as_attributes())
         result = super().extra_state_attributes
         result.update(
             {
@@ -0,0 +1,66 @@
+"""Classes sensor for ecole_directe."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntityDescription,
+)
+
+from custom_components.ecole_directe.const import LOGGER
+from custom_components.ecole_directe.sensor.generic import EDGenericSensor, is_too_big
+
+if TYPE_CHECKING:
+    from custom_components.ecole_directe.coordinator import EDDataUpdateCoordinator
+
+ENTITY_DESCRIPTIONS = (
+    SensorEntityDescription(
+        key="classe",
+        translation_key="classe",
+        icon="mdi:google-classroom",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        has_entity_name=True,
+    ),
+)
+
+
+class EDClasseSensor(EDGenericSensor):
+    """Representation of a ED sensor for a class of a professor account."""
+
+    def __init__(
+        self,
+        coordinator: EDDataUpdateCoordinator,
+        entity_description: SensorEntityDescription,
+        classe: dict,
+    ) -> None:
+        """Initialize the ED sensor."""
+        super().__init__(
+            coordinator,
+            entity_description,
+            f"classe_{classe['id']}",
+            f"Classe {classe.get('libelle', classe['id'])}",
+            None,
+        )
+
+    @property
+    def native_value(self) -> Any:
+        """Return when the vie de la classe was last found changed."""
+        if self._key not in self.coordinator.data:
+            return None
+        return self.coordinator.data[self._key].modifie_le
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the state attributes."""
+        result = super().extra_state_attributes
+        if self._key not in self.coordinator.data:
+            return result
+        attributes = self.coordinator.data[self._key].as_attributes()
+        del attributes["modifie_le"]
+        if is_too_big(attributes):
+            attributes["rubriques"] = []
+            LOGGER.warning("[%s] Les attributs sont trop volumineux!", self._attr_name)
+        result.update(attributes)
+        return result
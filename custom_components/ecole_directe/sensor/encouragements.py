@@ -50,7 +50,7 @@ def extra_state_attributes(self) -> dict[str, Any]:
         if self._key in self.coordinator.data:
             encouragements = self.coordinator.data[self._key]
             for encouragement in encouragements:
-                attributes.append(encouragement)
+                attributes.append(encouragement.as_attributes())
         result = super().extra_state_attributes
         result.update(
             {
@@ -50,7 +50,7 @@ def extra_state_attributes(self) -> dict[str, Any]:
         if self._key in self.coordinator.data:
             evaluations = self.coordinator.data[self._key]
             for evaluation in evaluations:
-                attributes.append(evaluation)
+                attributes.append(evaluation.as_attributes())
 
         result = super().extra_state_attributes
         result.update(
@@ -6,11 +6,9 @@
 
 from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
 from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
-from homeassistant.helpers.json import (
-    json_bytes,
-)
 
 from custom_components.ecole_directe.api.client import get_unique_id
+from custom_components.ecole_directe.api.codec import json_size
 from custom_components.ecole_directe.const import DOMAIN, MAX_STATE_ATTRS_BYTES
 from custom_components.ecole_directe.entity.base import EDEntity
 
@@ -21,8 +19,7 @@
 
 def is_too_big(obj: Any) -> bool:
     """Calculate is_too_big."""
-    bytes_result = json_bytes(obj)
-    return len(bytes_result) > MAX_STATE_ATTRS_BYTES
+    return json_size(obj) > MAX_STATE_ATTRS_BYTES
 
 
 class EDGenericSensor(SensorEntity, EDEntity):
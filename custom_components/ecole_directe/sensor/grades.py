@@ -52,7 +52,7 @@ def extra_state_attributes(self) -> dict[str, Any]:
         if self._key in self.coordinator.data:
             grades = self.coordinator.data[self._key]
             for grade in grades:
-                attributes.append(grade)
+                attributes.append(grade.as_attributes())
         result = super().extra_state_attributes
         result.update({"notes": attributes})
         return result
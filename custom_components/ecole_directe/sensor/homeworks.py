@@ -78,12 +78,10 @@ def extra_state_attributes(self) -> dict[str, Any]:
         if self._key in self.coordinator.data:
             homeworks = self.coordinator.data[self._key]
             if homeworks is not None:
-                for homework in homeworks:
-                    if not homework["effectue"]:
+                for homework in sorted(homeworks, key=operator.attrgetter("date")):
+                    if not homework.effectue:
                         todo_counter += 1
-                    attributes.append(homework)
-                if attributes is not None:
-                    attributes.sort(key=operator.itemgetter("date"))
+                    attributes.append(homework.as_attributes())
         else:
             attributes.append({"Erreur": f"{self._key} n'existe pas."})
 
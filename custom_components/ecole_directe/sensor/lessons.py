@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-from datetime import datetime
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.sensor import (
@@ -10,6 +9,7 @@
 )
 
 from custom_components.ecole_directe.const import DEFAULT_LUNCH_BREAK_TIME, LOGGER
+from custom_components.ecole_directe.helpers import parse_time_of_day
 from custom_components.ecole_directe.sensor.generic import EDGenericSensor, is_too_big
 
 if TYPE_CHECKING:
@@ -80,10 +80,7 @@ def extra_state_attributes(self) -> dict[str, Any]:
         if self._key in self.coordinator.data:
             lessons = self.coordinator.data[self._key]
             canceled_counter = None
-            lunch_break_time = datetime.strptime(
-                DEFAULT_LUNCH_BREAK_TIME,
-                "%H:%M",
-            ).time()
+            lunch_break_time = parse_time_of_day(DEFAULT_LUNCH_BREAK_TIME)
 
             if lessons is not None:
                 self._start_at = None
@@ -92,35 +89,29 @@ def extra_state_attributes(self) -> dict[str, Any]:
                 self._lunch_break_end_at = None
                 self._date = None
                 canceled_counter = 0
-                for lesson in lessons:
-                    index = lessons.index(lesson)
-
+                for index, lesson in enumerate(lessons):
                     if not (
-                        lesson["start_time"] == lessons[index - 1]["start_time"]
-                        and lesson["is_annule"]
+                        lesson.start_time == lessons[index - 1].start_time
+                        and lesson.is_annule
                     ):
-                        attributes.append(lesson)
-                        self._date = lesson["start"].strftime("%Y-%m-%d")
-                    if lesson["is_annule"]:
+                        attributes.append(lesson.as_attributes())
+                        self._date = lesson.start_at[:10]
+                    if lesson.is_annule:
                         canceled_counter += 1
-                    if single_day and lesson["is_annule"] is False:
-                        start = lesson["start"].strftime("%H:%M")
+                    if single_day and lesson.is_annule is False:
+                        start = lesson.start_time
                         if self._start_at is None or start < self._start_at:
                             self._start_at = start
-                        end = lesson["end"].strftime("%H:%M")
+                        end = lesson.end_time
                         if self._end_at is None or end > self._end_at:
                             self._end_at = end
-                        if (
-                            datetime.strptime(lesson["end_time"], "%H:%M").time()
-                            < lunch_break_time
-                        ):
-                            self._lunch_break_start_at = lesson["end"]
+                        if lesson.end.time() < lunch_break_time:
+                            self._lunch_break_start_at = lesson.end
                         if (
                             self._lunch_break_end_at is None
-                            and datetime.strptime(lesson["start_time"], "%H:%M").time()
-                            >= lunch_break_time
+                            and lesson.start.time() >= lunch_break_time
                         ):
-                            self._lunch_break_end_at = lesson["start"]
+                            self._lunch_break_end_at = lesson.start
             if is_too_big(attributes):
                 LOGGER.warning(
                     "[%s] Les attributs sont trop volumineux! %s",
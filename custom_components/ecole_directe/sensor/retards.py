@@ -50,7 +50,7 @@ def extra_state_attributes(self) -> dict[str, Any]:
         if self._key in self.coordinator.data:
             retards = self.coordinator.data[self._key]
             for retard in retards:
-                attributes.append(retard)
+                attributes.append(retard.as_attributes())
         result = super().extra_state_attributes
         result.update(
             {
@@ -50,7 +50,7 @@ def extra_state_attributes(self) -> dict[str, Any]:
         if self._key in self.coordinator.data:
             sanctions = self.coordinator.data[self._key]
             for sanction in sanctions:
-                attributes.append(sanction)
+                attributes.append(sanction.as_attributes())
 
         result = super().extra_state_attributes
         result.update(
@@ -4,21 +4,38 @@
 
 from typing import TYPE_CHECKING
 
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
 from homeassistant.core import ServiceCall, SupportsResponse, callback
 
 from custom_components.ecole_directe.const import (
     DOMAIN,
+    GRADE_HISTORY_MAX_WINDOW,
     LOGGER,
 )
 from custom_components.ecole_directe.service_actions.service import (
     async_handle_devoir_effectue,
+    async_handle_grades_history,
 )
 
 if TYPE_CHECKING:
-    from homeassistant.core import HomeAssistant
+    from homeassistant.core import HomeAssistant, ServiceResponse
 
 # Service action names - only used within service_actions module
 SERVICE_DEVOIR_EFFECTUE = "devoir_effectue"
+SERVICE_GRADES_HISTORY = "grades_history"
+
+GRADES_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required("eleve_id"): cv.string,
+        vol.Optional("matiere"): cv.string,
+        vol.Optional("since"): cv.date,
+        vol.Optional("until"): cv.date,
+        vol.Optional("limit"): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=GRADE_HISTORY_MAX_WINDOW)
+        ),
+    }
+)
 
 
 async def async_setup_services(hass: HomeAssistant) -> None:
@@ -45,6 +62,14 @@ async def handle_devoir_effectue(call: ServiceCall) -> None:
         entry = entries[0]
         await async_handle_devoir_effectue(hass, entry, call)
 
+    async def handle_grades_history(call: ServiceCall) -> ServiceResponse:
+        """Handle the service action call."""
+        entries = hass.config_entries.async_loaded_entries(DOMAIN)
+        if not entries:
+            LOGGER.warning("No config entries found for %s", DOMAIN)
+            return {"notes": []}
+        return await async_handle_grades_history(hass, entries[0], call)
+
     # Register services (only once at component level)
     if not hass.services.has_service(DOMAIN, SERVICE_DEVOIR_EFFECTUE):
         hass.services.async_register(
@@ -54,5 +79,13 @@ async def handle_devoir_effectue(call: ServiceCall) -> None:
             schema=None,
             supports_response=SupportsResponse.NONE,
         )
+    if not hass.services.has_service(DOMAIN, SERVICE_GRADES_HISTORY):
+        hass.services.async_register(
+            domain=DOMAIN,
+            service=SERVICE_GRADES_HISTORY,
+            service_func=handle_grades_history,
+            schema=GRADES_HISTORY_SCHEMA,
+            supports_response=SupportsResponse.ONLY,
+        )
 
     LOGGER.debug("Services registered for %s", DOMAIN)
@@ -6,10 +6,10 @@
 
 from homeassistant.exceptions import HomeAssistantError
 
-from custom_components.ecole_directe.const import LOGGER
+from custom_components.ecole_directe.const import GRADES_TO_DISPLAY, LOGGER
 
 if TYPE_CHECKING:
-    from homeassistant.core import HomeAssistant, ServiceCall
+    from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse
 
     from custom_components.ecole_directe.data import EDConfigEntry
 
@@ -36,3 +36,25 @@ async def async_handle_devoir_effectue(
         LOGGER.exception("Error on service devoir_effectue call")
         msg = f"Failed to mark homework as done: {err}"
         raise HomeAssistantError(msg) from err
+
+
+async def async_handle_grades_history(
+    hass: HomeAssistant,
+    entry: EDConfigEntry,
+    call: ServiceCall,
+) -> ServiceResponse:
+    """Handle the service action call, returning a window of the grade history."""
+    eleve_id = str(call.data["eleve_id"])
+    grades = entry.runtime_data.coordinator.grade_history.window(
+        eleve_id,
+        call.data.get("limit", GRADES_TO_DISPLAY),
+        since=call.data.get("since"),
+        until=call.data.get("until"),
+        matiere=call.data.get("matiere"),
+    )
+    LOGGER.debug(
+        "Service grades_history called with eleve_id=%s: %s grades",
+        eleve_id,
+        len(grades),
+    )
+    return {"notes": [grade.as_attributes() for grade in grades]}
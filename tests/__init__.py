@@ -0,0 +1 @@
+"""Tests for the ecole_directe integration."""
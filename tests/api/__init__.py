@@ -0,0 +1 @@
+"""Tests for the Ecole Directe API client of ecole_directe."""
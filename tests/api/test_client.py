@@ -0,0 +1,131 @@
+"""Tests for the payload parsers of the Ecole Directe API client."""
+
+from __future__ import annotations
+
+import random
+from datetime import date, timedelta
+from typing import Any
+
+import pytest
+
+from custom_components.ecole_directe.api.client import parse_grades_evaluations
+
+TODAY = date(2026, 2, 10)
+
+
+def _note(note_id: int, date_saisie: str, note_sur: str = "20", **kwargs: Any) -> dict:
+    """Return a note of a grades payload."""
+    return {
+        "id": note_id,
+        "devoir": f"Devoir {note_id}",
+        "codeMatiere": "MATHS",
+        "libelleMatiere": "Mathématiques",
+        "date": date_saisie[:10],
+        "dateSaisie": date_saisie,
+        "valeur": "12",
+        "noteSur": note_sur,
+        "coef": "1",
+        "moyenneClasse": "11.5",
+        "minClasse": "4",
+        "maxClasse": "18",
+        "nonSignificatif": False,
+        "elementsProgramme": [],
+    } | kwargs
+
+
+def _random_notes(count: int, seed: int) -> list[dict]:
+    """Return notes entered at random times, some of them at the same time."""
+    rng = random.Random(seed)  # noqa: S311
+    start = date(2025, 9, 2)
+    return [
+        _note(
+            note_id,
+            f"{start + timedelta(days=rng.randrange(40))} 08:00:00",
+            note_sur=rng.choice(["20", "10", "0"]),
+        )
+        for note_id in range(count)
+    ]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("grades_display", [1, 5, 200])
+def test_latest_grades_match_a_full_sort(grades_display: int) -> None:
+    """The bounded heaps keep the latest notes in the order of a full sort."""
+    notes = _random_notes(100, seed=grades_display)
+
+    result = parse_grades_evaluations({"notes": notes}, grades_display, TODAY)
+
+    # The last entered of two notes of the same time comes first
+    expected = sorted(
+        (note for note in notes if note["noteSur"] != "0"),
+        key=lambda note: (note["dateSaisie"], note["id"]),
+        reverse=True,
+    )[:grades_display]
+    assert [grade.note_id for grade in result["notes"]] == [
+        note["id"] for note in expected
+    ]
+
+
+@pytest.mark.unit
+def test_no_grade_displayed() -> None:
+    """No grade is kept with grades_display at 0, the history still synced."""
+    notes = _random_notes(10, seed=0)
+
+    result = parse_grades_evaluations({"notes": notes}, 0, TODAY)
+
+    assert result["notes"] == []
+    assert len(result["notes_modifiees"]) == len(result["empreintes_notes"])
+
+
+@pytest.mark.unit
+def test_only_changed_notes_are_parsed_again() -> None:
+    """Known notes are left out of the changed grades, unless they changed."""
+    notes = [_note(note_id, f"2025-10-0{note_id} 08:00:00") for note_id in range(1, 6)]
+    first = parse_grades_evaluations({"notes": notes}, 2, TODAY)
+    assert sorted(grade.note_id for grade in first["notes_modifiees"]) == [
+        1,
+        2,
+        3,
+        4,
+        5,
+    ]
+
+    unchanged = parse_grades_evaluations(
+        {"notes": notes}, 2, TODAY, known=first["empreintes_notes"]
+    )
+    assert unchanged["notes_modifiees"] == []
+    assert unchanged["empreintes_notes"] == first["empreintes_notes"]
+
+    notes[0] = notes[0] | {"valeur": "15"}
+    notes.append(_note(6, "2025-09-30 08:00:00"))
+    changed = parse_grades_evaluations(
+        {"notes": notes}, 2, TODAY, known=first["empreintes_notes"]
+    )
+    grades = {grade.note_id: grade for grade in changed["notes_modifiees"]}
+    assert sorted(grades) == [1, 6]
+    assert grades[1].note == "15"
+
+
+@pytest.mark.unit
+def test_note_without_valeur_is_skipped() -> None:
+    """A note without valeur, as an absence, builds no grade."""
+    notes = [
+        _note(1, "2025-10-01 08:00:00"),
+        _note(2, "2025-10-02 08:00:00", valeur=None),
+    ]
+
+    result = parse_grades_evaluations({"notes": notes}, 5, TODAY)
+
+    assert [grade.note_id for grade in result["notes"]] == [1]
+    assert list(result["empreintes_notes"]) == [1]
+    assert [grade.note_id for grade in result["notes_modifiees"]] == [1]
+
+
+@pytest.mark.unit
+def test_payload_without_notes() -> None:
+    """A payload without notes has no grade to display nor to sync."""
+    result = parse_grades_evaluations({}, 5, TODAY)
+
+    assert result["notes"] == []
+    assert result["evaluations"] == []
+    assert "empreintes_notes" not in result
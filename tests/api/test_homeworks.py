@@ -0,0 +1,120 @@
+"""Tests for the incremental cahier de textes synchronisation of ecole_directe."""
+
+from __future__ import annotations
+
+import base64
+from datetime import date
+
+import pytest
+
+from custom_components.ecole_directe.api.homeworks import (
+    EDHomeworkContentCache,
+    EDHomeworkSync,
+)
+
+TODAY = date(2026, 2, 10)
+# Dates of the summary, around TODAY
+PAST = "2026-02-02"
+YESTERDAY = "2026-02-09"
+TOMORROW = "2026-02-11"
+NEXT_MONTH = "2026-03-10"
+
+
+def _summary(*dates: str, flag: bool = False) -> dict:
+    """Return a cahier de textes summary with a homework on each date."""
+    return {
+        pour_le: [{"idDevoir": index, "effectue": flag}]
+        for index, pour_le in enumerate(dates)
+    }
+
+
+def _synced(summary: dict) -> EDHomeworkSync:
+    """Return a synchronisation state after a first cycle with summary."""
+    sync = EDHomeworkSync()
+    dates, cached = sync.plan("1", decode_html=True, summary=summary, today=TODAY)
+    assert sorted(dates) == sorted(summary)
+    assert cached == {}
+    sync.update(
+        "1",
+        decode_html=True,
+        summary=summary,
+        homeworks_by_date={pour_le: [] for pour_le in dates},
+    )
+    return sync
+
+
+@pytest.mark.unit
+def test_unchanged_dates_are_reused() -> None:
+    """Only the dates close to today are fetched again with the same summary."""
+    summary = _summary(PAST, YESTERDAY, TOMORROW, NEXT_MONTH)
+    sync = _synced(summary)
+
+    dates, cached = sync.plan("1", decode_html=True, summary=summary, today=TODAY)
+
+    assert sorted(dates) == [YESTERDAY, TOMORROW]
+    assert sorted(cached) == [PAST, NEXT_MONTH]
+
+
+@pytest.mark.unit
+def test_changed_and_new_dates_are_fetched() -> None:
+    """A date whose summary changed, or a new date, is fetched again."""
+    sync = _synced(_summary(PAST, NEXT_MONTH))
+    summary = _summary(PAST, NEXT_MONTH, flag=True) | _summary("2026-04-01")
+
+    dates, cached = sync.plan("1", decode_html=True, summary=summary, today=TODAY)
+
+    assert sorted(dates) == [PAST, NEXT_MONTH, "2026-04-01"]
+    assert cached == {}
+
+
+@pytest.mark.unit
+def test_dates_without_homework_are_skipped() -> None:
+    """A date listed without any homework is neither fetched nor cached."""
+    dates, cached = EDHomeworkSync().plan(
+        "1", decode_html=True, summary={NEXT_MONTH: []}, today=TODAY
+    )
+
+    assert dates == []
+    assert cached == {}
+
+
+@pytest.mark.unit
+def test_other_decoding_is_not_reused() -> None:
+    """Homeworks decoded for another decode_html setting are fetched again."""
+    summary = _summary(PAST)
+    sync = _synced(summary)
+
+    dates, _ = sync.plan("1", decode_html=False, summary=summary, today=TODAY)
+
+    assert dates == [PAST]
+
+
+@pytest.mark.unit
+def test_dates_left_out_are_fetched_again() -> None:
+    """A date left out of the last update is fetched in the next cycle."""
+    summary = _summary(PAST, NEXT_MONTH)
+    sync = EDHomeworkSync()
+    sync.update("1", decode_html=True, summary=summary, homeworks_by_date={PAST: []})
+
+    dates, cached = sync.plan("1", decode_html=True, summary=summary, today=TODAY)
+
+    assert dates == [NEXT_MONTH]
+    assert list(cached) == [PAST]
+
+
+@pytest.mark.unit
+def test_content_cache_evicts_least_recently_used() -> None:
+    """Decoded contents are evicted, least recently used first, past the cap."""
+    cache = EDHomeworkContentCache(max_bytes=16)
+    contents = {
+        devoir_id: base64.b64encode(f"<p>Devoir {devoir_id}</p>".encode()).decode()
+        for devoir_id in range(3)
+    }
+
+    assert cache.get(0, contents[0], True) == ("Devoir 0", "Devoir 0")
+    cache.get(1, contents[1], True)
+    cache.get(0, contents[0], True)
+    cache.get(2, contents[2], True)
+
+    assert cache.size <= cache.max_bytes
+    assert [key[0] for key in cache._entries] == [0, 2]
@@ -0,0 +1,54 @@
+"""Tests for the HTML text extractor of ecole_directe."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.ecole_directe.api.html_text import html_to_text
+
+
+@pytest.mark.unit
+def test_blocks_break_lines() -> None:
+    """Blocks and line breaks become new lines, entities are decoded."""
+    text, summary = html_to_text("<p>Lire&nbsp;p. 12</p><p>Exercice 3<br>et 4</p>", 125)
+
+    assert text == "Lire p. 12\nExercice 3\net 4"
+    assert summary == text
+
+
+@pytest.mark.unit
+def test_whitespace_is_collapsed() -> None:
+    """Whitespace is collapsed, but kept between inline elements."""
+    text, _ = html_to_text("<div>  Revoir   la <b>leçon</b>\n 4 </div>", 125)
+
+    assert text == "Revoir la leçon 4"
+
+
+@pytest.mark.unit
+def test_list_items_are_bulleted() -> None:
+    """Each item of a list starts its own bulleted line."""
+    text, _ = html_to_text("<ul><li>Cahier</li><li>Compas</li></ul>", 125)
+
+    assert text == "- Cahier\n- Compas"
+
+
+@pytest.mark.unit
+def test_scripts_and_styles_are_skipped() -> None:
+    """The content of scripts and styles is not text."""
+    text, _ = html_to_text(
+        "<style>p { color: red; }</style><p>Texte</p><script>alert(1)</script>",
+        125,
+    )
+
+    assert text == "Texte"
+
+
+@pytest.mark.unit
+def test_summary_is_cut_on_a_word() -> None:
+    """A long text is summarized on a word boundary, within the length."""
+    text, summary = html_to_text("<p>" + "mot " * 50 + "</p>", 20)
+
+    assert len(summary) <= 20
+    assert summary.endswith("…")
+    assert text.startswith(summary.removesuffix("…").rstrip())
+    assert summary.removesuffix("…").split()[-1] == "mot"
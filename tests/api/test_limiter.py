@@ -0,0 +1,147 @@
+"""Tests for the adaptive concurrency limiter of ecole_directe."""
+
+from __future__ import annotations
+
+import asyncio
+
+import aiohttp
+import pytest
+from ecoledirecte_api.exceptions import EcoleDirecteException
+
+from custom_components.ecole_directe.api.limiter import (
+    EDConcurrencyLimiter,
+    is_overload_error,
+)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    ("error", "overload"),
+    [
+        (TimeoutError(), True),
+        (aiohttp.ClientConnectionError(), True),
+        (EcoleDirecteException("[429] Too Many Requests"), True),
+        (EcoleDirecteException("[403] Forbidden"), False),
+        (ValueError(), False),
+    ],
+)
+def test_overload_errors(error: Exception, overload: bool) -> None:
+    """Throttling, timeouts and connection errors mean overload."""
+    assert is_overload_error(error) is overload
+
+
+async def _noop() -> None:
+    """Answer at once."""
+
+
+async def _burst(limiter: EDConcurrencyLimiter, count: int) -> int:
+    """Send count requests at once, returning the most seen in flight."""
+    in_flight = 0
+    most_in_flight = 0
+
+    async def fetch() -> None:
+        nonlocal in_flight, most_in_flight
+        in_flight += 1
+        most_in_flight = max(most_in_flight, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+
+    await asyncio.gather(*(limiter.run(fetch) for _ in range(count)))
+    return most_in_flight
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_requests_above_the_window_wait() -> None:
+    """No more requests than the window are in flight."""
+    limiter = EDConcurrencyLimiter(initial_window=2, max_window=2)
+
+    assert await _burst(limiter, 10) == 2
+    assert limiter.in_flight == 0
+    assert limiter.queue_depth == 0
+    assert limiter.requests == 10
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_window_grows_while_full() -> None:
+    """Fast responses grow the window only while it limits the requests."""
+    limiter = EDConcurrencyLimiter(initial_window=2, max_window=4)
+
+    await limiter.run(_noop)
+    assert limiter.window == 2
+
+    await _burst(limiter, 20)
+    assert 2 < limiter.window <= 4
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_overload_shrinks_the_window_once() -> None:
+    """Requests failing together shrink the window once, down to its minimum."""
+    limiter = EDConcurrencyLimiter(initial_window=8)
+
+    async def overloaded() -> None:
+        await asyncio.sleep(0)
+        raise TimeoutError
+
+    results = await asyncio.gather(
+        *(limiter.run(overloaded) for _ in range(4)), return_exceptions=True
+    )
+    assert all(isinstance(result, TimeoutError) for result in results)
+    assert limiter.window == 4
+    assert limiter.decreases == 1
+
+    for _ in range(5):
+        with pytest.raises(TimeoutError):
+            await limiter.run(overloaded)
+    assert limiter.window == limiter.min_window
+    assert limiter.limit == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_other_errors_keep_the_window() -> None:
+    """An error returned by an endpoint is no overload."""
+    limiter = EDConcurrencyLimiter(initial_window=4)
+
+    async def failing() -> None:
+        msg = "Not found"
+        raise ValueError(msg)
+
+    with pytest.raises(ValueError, match="Not found"):
+        await limiter.run(failing)
+    assert limiter.window == 4
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_slow_response_shrinks_the_window() -> None:
+    """A response slower than slow_response is overload as well."""
+    limiter = EDConcurrencyLimiter(initial_window=4, slow_response=-1)
+
+    await limiter.run(_noop)
+
+    assert limiter.window == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_cancelled_waiter_frees_its_place() -> None:
+    """A request cancelled while waiting leaves the queue."""
+    limiter = EDConcurrencyLimiter(initial_window=1, max_window=1)
+    release = asyncio.Event()
+    first = asyncio.create_task(limiter.run(release.wait))
+    second = asyncio.create_task(limiter.run(_noop))
+    await asyncio.sleep(0)
+    assert limiter.queue_depth == 1
+
+    second.cancel()
+    await asyncio.sleep(0)
+    release.set()
+    await first
+
+    assert second.cancelled()
+    assert limiter.in_flight == 0
+    assert limiter.queue_depth == 0
@@ -0,0 +1,124 @@
+"""Tests for the incremental messagerie synchronisation of ecole_directe."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.ecole_directe.api.messagerie import (
+    EDMailboxMirrors,
+    EDMessagerieSync,
+    EDNotifiedMessages,
+    mailbox_counts,
+)
+from custom_components.ecole_directe.const import (
+    MESSAGES_FIRST_PAGE_SIZE,
+    MESSAGES_MIRROR_MAX_SKIPS,
+    MESSAGES_NOTIFIED_MAX,
+    MESSAGES_PAGE_SIZE,
+)
+
+
+def _messages(*ids: int) -> list[dict]:
+    """Return received messages, the most recent first."""
+    return [
+        {"id": message_id, "subject": f"Message {message_id}"} for message_id in ids
+    ]
+
+
+@pytest.mark.unit
+def test_first_sync_notifies_nothing() -> None:
+    """The first sync of a mailbox only sets its cursor."""
+    sync = EDMessagerieSync()
+    assert sync.page_size("famille") == MESSAGES_FIRST_PAGE_SIZE
+
+    assert sync.update("famille", _messages(12, 10, 7)) == []
+
+    cursor = sync.cursor("famille")
+    assert cursor is not None
+    assert cursor.highest_id == 12
+    assert sync.page_size("famille") == MESSAGES_PAGE_SIZE
+
+
+@pytest.mark.unit
+def test_messages_newer_than_the_cursor() -> None:
+    """Only the messages above the cursor are new, the cursor moving past them."""
+    sync = EDMessagerieSync()
+    sync.update("famille", _messages(12, 10))
+
+    new_messages = sync.update("famille", _messages(15, 14, 12, 10))
+
+    assert [message["id"] for message in new_messages] == [15, 14]
+    assert sync.update("famille", _messages(15, 14, 12)) == []
+
+
+@pytest.mark.unit
+def test_mailboxes_have_their_own_cursor() -> None:
+    """The cursor of a child mailbox does not move the family one."""
+    sync = EDMessagerieSync()
+    sync.update("famille", _messages(20))
+
+    assert sync.update("1", _messages(5)) == []
+    assert [message["id"] for message in sync.update("1", _messages(6, 5))] == [6]
+
+
+@pytest.mark.unit
+def test_next_page_only_while_every_message_is_new() -> None:
+    """A further page is read only while the whole page is above the cursor."""
+    sync = EDMessagerieSync()
+    full_page = _messages(*range(100 + MESSAGES_PAGE_SIZE, 100, -1))
+    assert not sync.needs_next_page("famille", full_page)
+
+    sync.update("famille", _messages(100))
+
+    assert sync.needs_next_page("famille", full_page)
+    assert not sync.needs_next_page("famille", full_page[:-1])
+    assert not sync.needs_next_page("famille", [*full_page[:-1], {"id": 100}])
+
+
+@pytest.mark.unit
+def test_message_notified_once() -> None:
+    """A message found in several mailboxes is claimed once."""
+    notified = EDNotifiedMessages()
+
+    assert notified.claim({"id": 42})
+    assert not notified.claim({"id": "42"})
+    assert notified.claim({"id": 43})
+
+
+@pytest.mark.unit
+def test_notified_messages_are_bounded() -> None:
+    """The oldest IDs are forgotten past MESSAGES_NOTIFIED_MAX."""
+    notified = EDNotifiedMessages()
+    for message_id in range(MESSAGES_NOTIFIED_MAX + 1):
+        notified.claim({"id": message_id})
+
+    assert notified.claim({"id": 0})
+    assert not notified.claim({"id": MESSAGES_NOTIFIED_MAX})
+
+
+@pytest.mark.unit
+def test_child_mailbox_mirroring_the_family_one() -> None:
+    """A child mailbox like the family one is skipped for a few cycles."""
+    mirrors = EDMailboxMirrors()
+    fingerprint, counts = mailbox_counts(
+        {
+            "pagination": {"messagesRecusCount": 3},
+            "messages": {"received": _messages(9)},
+        }
+    )
+    mirrors.set_family(fingerprint, counts)
+    mirrors.set_child("1", fingerprint)
+
+    for _ in range(MESSAGES_MIRROR_MAX_SKIPS):
+        assert mirrors.mirrored("1") == counts
+    assert mirrors.mirrored("1") is None
+
+
+@pytest.mark.unit
+def test_child_mailbox_differing_from_the_family_one() -> None:
+    """A child mailbox unlike the family one is always read."""
+    mirrors = EDMailboxMirrors()
+    mirrors.set_family(*mailbox_counts({"pagination": {"messagesRecusCount": 3}}))
+    mirrors.set_child("1", mailbox_counts({"pagination": {"messagesRecusCount": 1}})[0])
+
+    assert mirrors.mirrored("1") is None
@@ -0,0 +1,18 @@
+"""Shared fixtures for the ecole_directe tests."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pytest
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Register the markers of the test categories."""
+    config.addinivalue_line(
+        "markers", "unit: fast, isolated test without Home Assistant instance"
+    )
+    config.addinivalue_line(
+        "markers", "integration: test with a coordinator or Home Assistant instance"
+    )
@@ -0,0 +1 @@
+"""Tests for the coordinator of ecole_directe."""
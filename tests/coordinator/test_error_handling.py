@@ -0,0 +1,208 @@
+"""Tests for the error handling of the ecole_directe coordinator."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from custom_components.ecole_directe.api import EDApiClientCommunicationError
+from custom_components.ecole_directe.const import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_MAX_RESET_TIMEOUT,
+    CIRCUIT_RESET_TIMEOUT,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_ATTEMPTS,
+    RETRY_MAX_DELAY,
+)
+from custom_components.ecole_directe.coordinator import error_handling
+from custom_components.ecole_directe.coordinator.error_handling import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    EDCircuitBreaker,
+    async_call_with_retry,
+    calculate_backoff_delay,
+    handle_partial_data,
+    should_retry_update,
+)
+
+NOW = datetime(2026, 2, 10, 8, tzinfo=UTC)
+
+
+def _opened() -> EDCircuitBreaker:
+    """Return a circuit opened at NOW."""
+    breaker = EDCircuitBreaker()
+    for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+        assert breaker.allow(NOW)
+        breaker.record_failure(NOW)
+    return breaker
+
+
+@pytest.mark.unit
+def test_circuit_opens_after_failures_in_a_row() -> None:
+    """The circuit opens after CIRCUIT_FAILURE_THRESHOLD failures in a row."""
+    breaker = EDCircuitBreaker()
+    for _ in range(CIRCUIT_FAILURE_THRESHOLD - 1):
+        breaker.record_failure(NOW)
+    breaker.record_success()
+    breaker.record_failure(NOW)
+    assert breaker.state == CIRCUIT_CLOSED
+
+    breaker = _opened()
+
+    assert breaker.state == CIRCUIT_OPEN
+    assert breaker.opened_until == NOW + CIRCUIT_RESET_TIMEOUT
+    assert not breaker.allow(NOW + CIRCUIT_RESET_TIMEOUT - timedelta(seconds=1))
+
+
+@pytest.mark.unit
+def test_circuit_lets_a_single_probe_through() -> None:
+    """Once the reset timeout elapsed, one probe is let through."""
+    breaker = _opened()
+    later = NOW + CIRCUIT_RESET_TIMEOUT
+
+    assert breaker.allow(later)
+    assert breaker.state == CIRCUIT_HALF_OPEN
+    assert not breaker.allow(later)
+
+    breaker.record_success()
+    assert breaker.state == CIRCUIT_CLOSED
+    assert breaker.allow(later)
+
+
+@pytest.mark.unit
+def test_failed_probe_doubles_the_reset_timeout() -> None:
+    """A failed probe opens the circuit for twice as long, up to a maximum."""
+    breaker = _opened()
+    now = NOW + CIRCUIT_RESET_TIMEOUT
+    timeouts = []
+    while breaker.reset_timeout < CIRCUIT_MAX_RESET_TIMEOUT:
+        assert breaker.allow(now)
+        breaker.record_failure(now)
+        assert breaker.opened_until is not None
+        timeouts.append(breaker.opened_until - now)
+        now = breaker.opened_until
+
+    assert timeouts[:2] == [CIRCUIT_RESET_TIMEOUT * 2, CIRCUIT_RESET_TIMEOUT * 4]
+    assert timeouts[-1] == CIRCUIT_MAX_RESET_TIMEOUT
+
+    breaker.record_success()
+    assert breaker.reset_timeout == CIRCUIT_RESET_TIMEOUT
+
+
+@pytest.mark.unit
+def test_cancelled_probe_is_probed_again() -> None:
+    """A cancelled probe lets the next cycle probe at once."""
+    breaker = _opened()
+    later = NOW + CIRCUIT_RESET_TIMEOUT
+    assert breaker.allow(later)
+
+    breaker.cancel_probe(later)
+
+    assert breaker.state == CIRCUIT_OPEN
+    assert breaker.allow(later)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    ("error", "attempt", "retry"),
+    [
+        (TimeoutError(), 0, True),
+        (EDApiClientCommunicationError("unreachable"), 0, True),
+        (TimeoutError(), RETRY_MAX_ATTEMPTS - 1, False),
+        (ValueError(), 0, False),
+    ],
+)
+def test_only_transient_errors_are_retried(
+    error: Exception, attempt: int, retry: bool
+) -> None:
+    """Transient errors are retried, up to RETRY_MAX_ATTEMPTS attempts."""
+    assert should_retry_update(error, attempt) is retry
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("attempt", range(6))
+def test_backoff_delay_is_bounded(attempt: int) -> None:
+    """The jittered delay stays below the exponential backoff and its cap."""
+    delay = calculate_backoff_delay(attempt)
+
+    assert (
+        timedelta(0)
+        <= delay
+        <= timedelta(seconds=min(RETRY_BASE_DELAY * 2**attempt, RETRY_MAX_DELAY))
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried() -> None:
+    """A request failing once with a transient error succeeds on its retry."""
+    fetch = AsyncMock(side_effect=[TimeoutError(), "data"])
+
+    with patch.object(error_handling.asyncio, "sleep", AsyncMock()) as sleep:
+        assert await async_call_with_retry(fetch) == "data"
+
+    assert fetch.await_count == 2
+    sleep.assert_awaited_once()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_retries_are_bounded() -> None:
+    """The error of the last attempt is raised once the attempts are used up."""
+    fetch = AsyncMock(side_effect=TimeoutError())
+
+    with (
+        patch.object(error_handling.asyncio, "sleep", AsyncMock()),
+        pytest.raises(TimeoutError),
+    ):
+        await async_call_with_retry(fetch)
+
+    assert fetch.await_count == RETRY_MAX_ATTEMPTS
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_other_errors_are_not_retried() -> None:
+    """An error that would happen again is raised at once."""
+    fetch = AsyncMock(side_effect=ValueError("Not found"))
+
+    with pytest.raises(ValueError, match="Not found"):
+        await async_call_with_retry(fetch)
+
+    assert fetch.await_count == 1
+
+
+@pytest.mark.unit
+def test_partial_data_without_errors() -> None:
+    """The data of a cycle without errors is kept as it is."""
+    data = {"session": "client", "1_notes": []}
+
+    assert handle_partial_data(data, {"1_devoirs": []}, []) is data
+    assert "1_devoirs" not in data
+
+
+@pytest.mark.unit
+def test_failed_keys_are_carried_forward() -> None:
+    """The keys of failed scopes keep their value of the previous cycle."""
+    data = {"session": "client", "1_notes": ["new"]}
+    previous = {"session": "client", "1_notes": ["old"], "1_devoirs": ["old"]}
+
+    result = handle_partial_data(data, previous, [TimeoutError()])
+
+    assert result == {"session": "client", "1_notes": ["new"], "1_devoirs": ["old"]}
+
+
+@pytest.mark.unit
+def test_first_cycle_without_data_fails() -> None:
+    """The first cycle fails if every scope failed."""
+    error = TimeoutError()
+
+    with pytest.raises(EDApiClientCommunicationError) as exc_info:
+        handle_partial_data({"session": "client"}, None, [error])
+    assert exc_info.value.__cause__ is error
+
+    data = {"session": "client", "1_notes": []}
+    assert handle_partial_data(data, None, [error]) is data
@@ -0,0 +1,170 @@
+"""Tests for the grade history of the ecole_directe coordinator."""
+
+from __future__ import annotations
+
+import dataclasses
+from datetime import date
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.ecole_directe.api import EDGrade
+from custom_components.ecole_directe.coordinator import grade_history
+from custom_components.ecole_directe.coordinator.grade_history import EDGradeHistory
+
+ANNEE = "2025-2026"
+
+
+class FakeStore:
+    """Store kept in memory, saving at once."""
+
+    def __init__(self) -> None:
+        """Initialize an empty store."""
+        self.data: dict[str, Any] | None = None
+
+    async def async_load(self) -> dict[str, Any] | None:
+        """Return the data saved last."""
+        return self.data
+
+    def async_delay_save(self, data_func: Any, _delay: float) -> None:
+        """Save the data at once."""
+        self.data = data_func()
+
+
+@pytest.fixture
+def store(monkeypatch: pytest.MonkeyPatch) -> FakeStore:
+    """Return the store of the grade histories created by the test."""
+    fake_store = FakeStore()
+    monkeypatch.setattr(grade_history, "Store", lambda *_args, **_kwargs: fake_store)
+    return fake_store
+
+
+@pytest.fixture
+def history(store: FakeStore) -> EDGradeHistory:
+    """Return an empty grade history, saved in memory."""
+    return EDGradeHistory(MagicMock(), "entry_id")
+
+
+def _grade(note_id: int, date_saisie: str, matiere: str = "MATHS") -> EDGrade:
+    """Return a grade entered at date_saisie."""
+    return EDGrade(
+        note_id=note_id,
+        date=date_saisie[:10],
+        matiere=matiere,
+        commentaire=f"Devoir {note_id}",
+        note="12",
+        sur="20",
+        note_sur="12/20",
+        coefficient="1",
+        moyenne_classe="11,5",
+        max="18",
+        min="4",
+        non_significatif=False,
+        date_saisie=date_saisie,
+        elements_programme=[],
+    )
+
+
+def _sync(history: EDGradeHistory, *grades: EDGrade) -> bool:
+    """Sync the year with the given grades, fingerprinted by their note."""
+    return history.sync(
+        "1",
+        ANNEE,
+        {grade.note_id: hash(grade.note) for grade in grades if grade.note_id},
+        list(grades),
+    )
+
+
+@pytest.mark.unit
+def test_sync_keeps_the_grades_sorted(history: EDGradeHistory) -> None:
+    """Grades are kept in the order they were entered, whatever the payload."""
+    grades = [
+        _grade(3, "2025-10-03 08:00:00"),
+        _grade(1, "2025-10-01 08:00:00"),
+        _grade(2, "2025-10-02 08:00:00"),
+    ]
+
+    assert _sync(history, *grades)
+
+    assert [grade.note_id for grade in history.latest("1", 5)] == [3, 2, 1]
+    assert [grade.note_id for grade in history.latest("1", 2)] == [3, 2]
+    assert history.latest("1", 0) == []
+    assert history.latest("2", 5) == []
+
+
+@pytest.mark.unit
+def test_sync_of_unchanged_notes(history: EDGradeHistory, store: FakeStore) -> None:
+    """Syncing the same notes again changes nothing, nor saves."""
+    grades = [_grade(1, "2025-10-01 08:00:00"), _grade(2, "2025-10-02 08:00:00")]
+    _sync(history, *grades)
+    assert store.data is not None
+    store.data = None
+
+    assert not _sync(history, *grades)
+    assert store.data is None
+
+
+@pytest.mark.unit
+def test_sync_updates_and_removes_notes(history: EDGradeHistory) -> None:
+    """Changed notes are moved to their place, notes gone are removed."""
+    _sync(
+        history,
+        _grade(1, "2025-10-01 08:00:00"),
+        _grade(2, "2025-10-02 08:00:00"),
+        _grade(3, "2025-10-03 08:00:00"),
+    )
+    corrected = dataclasses.replace(_grade(1, "2025-10-04 08:00:00"), note="15")
+
+    # Only the changed note is parsed again, note 2 was deleted
+    assert history.sync(
+        "1",
+        ANNEE,
+        {1: hash("15"), 3: hash("12")},
+        [corrected],
+    )
+
+    assert history.latest("1", 5) == [corrected, _grade(3, "2025-10-03 08:00:00")]
+    assert history.fingerprints("1", ANNEE) == {1: hash("15"), 3: hash("12")}
+
+
+@pytest.mark.unit
+def test_window_between_dates(history: EDGradeHistory) -> None:
+    """A window reads the grades entered between two dates, the latest first."""
+    _sync(
+        history,
+        *(
+            _grade(day, f"2025-10-{day:02} 08:00:00", "MATHS" if day % 2 else "FRANC")
+            for day in range(1, 11)
+        ),
+    )
+
+    def note_ids(**kwargs: Any) -> list[int | None]:
+        return [grade.note_id for grade in history.window("1", **kwargs)]
+
+    assert note_ids(count=3) == [10, 9, 8]
+    assert note_ids(count=10, since=date(2025, 10, 8)) == [10, 9, 8]
+    assert note_ids(count=10, until=date(2025, 10, 2)) == [2, 1]
+    assert note_ids(count=10, since=date(2025, 10, 3), until=date(2025, 10, 5)) == [
+        5,
+        4,
+        3,
+    ]
+    assert note_ids(count=2, matiere="MATHS") == [9, 7]
+    assert note_ids(count=10, since=date(2025, 11, 1)) == []
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_history_is_reloaded(history: EDGradeHistory) -> None:
+    """The saved history is loaded back with its fingerprints."""
+    _sync(history, _grade(1, "2025-10-01 08:00:00"), _grade(2, "2025-10-02 08:00:00"))
+    reloaded = EDGradeHistory(MagicMock(), "entry_id")
+
+    await reloaded.async_load()
+
+    assert reloaded.latest("1", 5) == history.latest("1", 5)
+    assert reloaded.fingerprints("1", ANNEE) == history.fingerprints("1", ANNEE)
+    assert not _sync(
+        reloaded, _grade(1, "2025-10-01 08:00:00"), _grade(2, "2025-10-02 08:00:00")
+    )
@@ -0,0 +1,90 @@
+"""Tests for the fetch scheduling of the ecole_directe coordinator."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from custom_components.ecole_directe.api.client import EDEleve
+from custom_components.ecole_directe.const import CADENCE_TOLERANCE
+from custom_components.ecole_directe.coordinator.scheduling import (
+    EDCadenceScheduler,
+    plan_account_batches,
+)
+
+NOW = datetime(2026, 2, 10, 8, tzinfo=UTC)
+
+
+def _eleve(eleve_id: str, account_id_login: int | None) -> EDEleve:
+    """Return a child of the given account."""
+    return EDEleve([], eleve_id=eleve_id, account_id_login=account_id_login)
+
+
+@pytest.mark.unit
+def test_current_account_comes_first() -> None:
+    """Children are grouped by account, the current account first."""
+    a1, b1, a2 = _eleve("a1", 1), _eleve("b1", 2), _eleve("a2", 1)
+
+    batches = plan_account_batches([a1, b1, a2], 1, 2)
+
+    assert list(batches) == [2, 1]
+    assert batches == {2: [b1], 1: [a1, a2]}
+
+
+@pytest.mark.unit
+def test_main_account_is_always_planned() -> None:
+    """The main account is kept for the family requests, even without children."""
+    b1 = _eleve("b1", 2)
+
+    assert plan_account_batches([b1], 1, 2) == {2: [b1], 1: []}
+
+
+@pytest.mark.unit
+def test_empty_current_account_is_left_out() -> None:
+    """Children without account belong to the main one, others are left out."""
+    a1 = _eleve("a1", None)
+
+    assert plan_account_batches([a1], 1, 3) == {1: [a1]}
+
+
+@pytest.mark.unit
+def test_scope_due_once_its_interval_elapsed() -> None:
+    """A scope is due when never fetched, then once its interval elapsed."""
+    scheduler = EDCadenceScheduler({"notes": timedelta(hours=1)})
+    assert scheduler.is_due("notes", "1_notes", NOW)
+    assert not scheduler.has_result("1_notes")
+
+    scheduler.store("notes", "1_notes", ["result"], NOW)
+
+    assert scheduler.has_result("1_notes")
+    assert scheduler.last("1_notes") == ["result"]
+    assert not scheduler.is_due("notes", "1_notes", NOW + timedelta(minutes=30))
+    assert scheduler.is_due(
+        "notes", "1_notes", NOW + timedelta(hours=1) - CADENCE_TOLERANCE
+    )
+
+
+@pytest.mark.unit
+def test_module_without_interval_is_always_due() -> None:
+    """A module without interval is fetched in every cycle."""
+    scheduler = EDCadenceScheduler({})
+    scheduler.store("devoirs", "1_devoirs", [], NOW)
+
+    assert scheduler.is_due("devoirs", "1_devoirs", NOW)
+
+
+@pytest.mark.unit
+def test_next_due_per_module() -> None:
+    """The earliest due time of the scopes of each module is reported."""
+    scheduler = EDCadenceScheduler(
+        {"notes": timedelta(hours=1), "messagerie": timedelta(minutes=15)}
+    )
+    scheduler.store("notes", "1_notes", [], NOW)
+    scheduler.store("notes", "2_notes", [], NOW - timedelta(minutes=10))
+    scheduler.store("messagerie", "messagerie", {}, NOW)
+
+    assert scheduler.next_due() == {
+        "notes": NOW + timedelta(minutes=50),
+        "messagerie": NOW + timedelta(minutes=15),
+    }